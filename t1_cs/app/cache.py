@@ -0,0 +1,172 @@
+import os
+import threading
+from collections import OrderedDict
+from app.cache_backends import CacheBackend, get_backend
+
+# Reference data (profiles, resource types, buildings) changes rarely, so shared entries live for minutes
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+REFERENCE_CACHE_SIZE = int(os.getenv("REFERENCE_CACHE_SIZE", "256"))
+# With the default per-process backend an invalidate() only reaches the worker (or Lambda
+# instance) that made the write; the others keep serving their copy, so there entries live
+# at most this many seconds. 0 keeps the full TTL, which is only safe with a single process
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", "10"))
+# Total size of the serialized list responses kept in memory
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+_caches = {}
+
+
+class TTLCache:
+    """
+    Cache whose entries expire `ttl` seconds after being stored.
+
+    Entries live in a CacheBackend: a private in-process LRU of `maxsize`
+    entries by default, or the shared Redis store with CACHE_BACKEND=redis,
+    so that an invalidate() in one worker is seen by all of them. A private
+    backend caps `ttl` at `local_ttl`, which is how long another worker's
+    write can go unseen here. Every key includes the cache's generation
+    counter; invalidate() bumps it and old entries are never read again.
+    Values must be serializable by `cache_backends.dumps` and safe to share
+    between requests (pydantic models, not ORM objects bound to a session).
+    Hit/miss counters are kept per process for `cache_stats()`.
+    """
+
+    def __init__(self, name: str, maxsize: int = REFERENCE_CACHE_SIZE, ttl: float = REFERENCE_CACHE_TTL, backend: CacheBackend = None, local_ttl: float = LOCAL_CACHE_TTL):
+        self.name = name
+        self.backend = backend or get_backend(maxsize)
+        self.ttl = ttl if self.backend.shared or not local_ttl else min(ttl, local_ttl)
+        self.hits = 0
+        self.misses = 0
+        self._generation_key = f"cache:{name}:generation"
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def _generation(self):
+        counters = self.backend.counters([self._generation_key])
+        return counters[0] if counters else None
+
+    def _key(self, key, generation):
+        return f"cache:{self.name}:{generation}:{key!r}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        generation = self._generation()
+        value = None if generation is None else self.backend.get(self._key(key, generation))
+        self._count(value is not None)
+        return default if value is None else value
+
+    def set(self, key, value):
+        generation = self._generation()
+        if generation is not None:
+            self.backend.set(self._key(key, generation), value, self.ttl)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` and storing its result on a miss."""
+        generation = self._generation()
+        value = None if generation is None else self.backend.get(self._key(key, generation))
+        self._count(value is not None)
+        if value is None:
+            value = loader()
+            # Stored under the generation read before loading, so a load that
+            # raced with invalidate() lands where nobody will read it
+            if generation is not None:
+                self.backend.set(self._key(key, generation), value, self.ttl)
+        return value
+
+    def discard(self, key):
+        generation = self._generation()
+        if generation is not None:
+            self.backend.delete(self._key(key, generation))
+
+    def invalidate(self):
+        self.backend.incr(self._generation_key)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses, bounded by the total size of their bodies.
+
+    Entries are keyed by route and query string and remember the table
+    versions they were rendered from; a lookup with newer versions drops the
+    entry and counts an invalidation. Bodies larger than the whole budget
+    are not stored.
+    """
+
+    def __init__(self, name: str, max_bytes: int = RESPONSE_CACHE_BYTES):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key, versions):
+        """Return (body, headers) stored for `key` at exactly these versions, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, versions, body: bytes, headers: dict):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (versions, body, headers)
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes -= len(self._entries.pop(key)[1])
+
+    def invalidate(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+def clear_caches():
+    """Invalidate every cache, e.g. when the database behind them is replaced."""
+    for cache in _caches.values():
+        cache.invalidate()
+
+
+def cache_stats():
+    """Hit/miss counters of every cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
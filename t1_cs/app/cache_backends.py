@@ -0,0 +1,293 @@
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import urlparse
+from pydantic import BaseModel
+
+logger = logging.getLogger("cache")
+
+# "memory" keeps caches inside each process; "redis" shares them between workers and Lambda instances
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.5"))
+
+
+class CacheBackend(ABC):
+    """
+    Key/value store behind the caches and the table version counters.
+
+    `get`/`set`/`delete` hold the values the caches store (see `dumps`); `incr`,
+    `init_counter` and `counters` hold integers. Backends never raise on
+    connection problems: reads behave as misses and `counters` returns None
+    so callers can skip caching.
+    """
+
+    # Whether every worker and Lambda instance sees the same data
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str):
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: float = None):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def init_counter(self, key: str, value: int):
+        """Set the counter to `value` unless it already exists."""
+
+    @abstractmethod
+    def counters(self, keys: list[str]):
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def init_counter(self, key, value):
+        with self._lock:
+            self._counters.setdefault(key, value)
+
+    def counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+
+def dumps(value) -> bytes:
+    """
+    Serialize a cache value as JSON.
+
+    Values are JSON scalars, lists, keyset Pages and pydantic models from
+    app.schemas, tagged with their type so `loads` can rebuild them. Unlike
+    pickle, reading an entry back never runs code chosen by whoever wrote it.
+    """
+    return json.dumps(_encode(value), separators=(",", ":")).encode()
+
+
+def loads(data: bytes):
+    return _decode(json.loads(data))
+
+
+def _encode(value):
+    # Imported here: the repositories stay out of a lazy cold start
+    from app.repositories.pagination import Page
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, BaseModel):
+        model = type(value)
+        return {"model": f"{model.__module__}:{model.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, Page):
+        return {"page": [_encode(item) for item in value], "next_cursor": value.next_cursor}
+    if isinstance(value, (list, tuple)):
+        return {"list": [_encode(item) for item in value]}
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode(data):
+    from app.repositories.pagination import Page
+
+    if not isinstance(data, dict):
+        return data
+    if "model" in data:
+        return _schema(data["model"]).model_validate(data["data"])
+    if "page" in data:
+        return Page([_decode(item) for item in data["page"]], data["next_cursor"])
+    return [_decode(item) for item in data["list"]]
+
+
+def _schema(name: str):
+    # Only response schemas are ever rebuilt, whatever the entry names
+    module, _, qualname = name.partition(":")
+    if not module.startswith("app.schemas."):
+        raise ValueError(f"Refusing to load {name} from the cache")
+    model = getattr(importlib.import_module(module), qualname, None)
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        raise ValueError(f"{name} is not a schema")
+    return model
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Minimal Redis client speaking RESP over one socket, guarded by a lock.
+
+    Only the handful of commands the caches need are used, so no client
+    library is required. Values are stored as JSON (see `dumps`); counters are
+    native Redis integers.
+    """
+
+    shared = True
+
+    def __init__(self, url: str = REDIS_URL, timeout: float = REDIS_TIMEOUT):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", self.db)
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def _send(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis closed the connection")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise RedisError(f"Unexpected reply {line!r}")
+
+    def execute(self, *args):
+        """Run one command, reconnecting once if the connection went away."""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._send(*args)
+                except (OSError, ConnectionError) as e:
+                    self._close()
+                    if attempt:
+                        raise ConnectionError(f"Redis unavailable at {self.host}:{self.port}: {e}")
+
+    def _safe(self, default, *args):
+        try:
+            return self.execute(*args)
+        except (ConnectionError, RedisError) as e:
+            logger.warning("Cache command %s failed: %s", args[0], e)
+            return default
+
+    def get(self, key):
+        data = self._safe(None, "GET", key)
+        if data is None:
+            return None
+        try:
+            return loads(data)
+        except (ValueError, KeyError, TypeError, ImportError) as e:
+            # Entries written by another version of the app behave as misses
+            logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+
+    def set(self, key, value, ttl=None):
+        args = ["SET", key, dumps(value)]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        self._safe(None, *args)
+
+    def delete(self, key):
+        self._safe(None, "DEL", key)
+
+    def incr(self, key):
+        return self._safe(None, "INCR", key)
+
+    def init_counter(self, key, value):
+        self._safe(None, "SET", key, int(value), "NX")
+
+    def counters(self, keys):
+        if not keys:
+            return []
+        values = self._safe(None, "MGET", *keys)
+        return None if values is None else [int(value) if value is not None else 0 for value in values]
+
+
+_shared = None
+
+
+def get_backend(maxsize: int = 1024) -> CacheBackend:
+    """Backend for a new cache: the shared Redis client, or a private in-memory LRU of `maxsize` entries."""
+    global _shared
+    if CACHE_BACKEND == "redis":
+        if _shared is None:
+            _shared = RedisBackend()
+        return _shared
+    return MemoryBackend(maxsize)
@@ -0,0 +1,83 @@
+import logging
+import os
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+
+logger = logging.getLogger("database")
+
+# A pooled connection is pinged on checkout only after sitting idle this long (or after an error)
+DB_IDLE_PING_SECONDS = float(os.getenv("DB_IDLE_PING_SECONDS", "30"))
+
+LAST_USED = "health_last_used"
+SUSPECT = "health_suspect"
+FRESH = "health_fresh"
+
+
+class ConnectionHealth:
+    """
+    Validates pooled connections only when they may have gone stale.
+
+    Replaces `pool_pre_ping`, which pings on every checkout. Each pooled
+    connection records when it was last checked in; on checkout it is pinged
+    only if it has been idle longer than `idle_seconds` or if the last
+    statement on it failed. A failed ping raises DisconnectionError, which
+    makes the pool discard the connection and hand out a fresh one.
+    """
+
+    def __init__(self, idle_seconds: float = DB_IDLE_PING_SECONDS):
+        self.idle_seconds = idle_seconds
+        self.pings = 0
+        self.pings_avoided = 0
+        self.ping_failures = 0
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """Install the pool and error listeners on `engine` (a sync Engine, or an AsyncEngine's sync_engine)."""
+        dialect = engine.dialect
+
+        @event.listens_for(engine, "connect")
+        def connect(dbapi_connection, connection_record):
+            # Just opened, so the first checkout needs no ping
+            connection_record.info[FRESH] = True
+            connection_record.info[LAST_USED] = time.monotonic()
+
+        @event.listens_for(engine, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self.validate(dialect, dbapi_connection, connection_record.info)
+
+        @event.listens_for(engine, "checkin")
+        def checkin(dbapi_connection, connection_record):
+            connection_record.info[LAST_USED] = time.monotonic()
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            # Disconnects already invalidate the connection; anything else gets a ping on next checkout
+            if context.connection is not None and not context.is_disconnect and not context.connection.invalidated:
+                context.connection.info[SUSPECT] = True
+
+    def validate(self, dialect, dbapi_connection, info):
+        idle = time.monotonic() - info.get(LAST_USED, 0)
+        if info.pop(FRESH, False) or (idle <= self.idle_seconds and not info.get(SUSPECT)):
+            self._count("pings_avoided")
+            return
+        self._count("pings")
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            self._count("ping_failures")
+            logger.warning("Pooled connection failed its health check after %.1fs idle: %s", idle, e)
+            raise DisconnectionError(str(e)) from e
+        info.pop(SUSPECT, None)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        with self._lock:
+            return {"pings": self.pings, "pings_avoided": self.pings_avoided, "ping_failures": self.ping_failures}
+
+
+connection_health = ConnectionHealth()
@@ -1,10 +1,14 @@
 import os
 import time
 import logging
-from sqlalchemy import create_engine, event, text
+import threading
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import OperationalError, DatabaseError
+from app.connection_health import connection_health
+from app.metrics import db_retries, db_retry_failures
+from app.instrumentation import SQL_INSTRUMENTATION, InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
 # Configure logging
 logger = logging.getLogger("database")
@@ -34,112 +38,226 @@ else:
 MAX_RETRIES = 5  # Increased from 3
 RETRY_DELAY = 1  # seconds
 
-# Configure SQLAlchemy engine based on database type
-if TESTING:
-    # SQLite doesn't need connection pooling or SSL
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}  # Needed for SQLite
-    )
-    logger.info("SQLite engine created for testing")
-else:
-    # Log database connection info (without password)
-    logger.info(f"Database configuration: Host={DB_HOST}, User={DB_USER}, Database={DB_NAME}")
-    
-    # Configure MySQL engine with connection pooling optimized for serverless
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,  # Verify connections before using them
-        pool_recycle=300,    # Recycle connections after 5 minutes (reduced from 1 hour)
-        pool_size=5,         # Limit pool size for Lambda environment
-        max_overflow=10,     # Allow up to 10 connections beyond pool_size
-        connect_args={
-            "connect_timeout": 20,  # 20 second connection timeout (increased from 10)
-            "read_timeout": 30,     # 30 second read timeout
-            "write_timeout": 30,    # 30 second write timeout
-            "ssl": {"ssl_mode": "REQUIRED"}  # Enable SSL for secure connections
-        }
-    )
-    logger.info("MySQL engine created with connection pooling")
+def create_db_engine():
+    """Create the engine for DATABASE_URL, with the pool settings for the current environment."""
+    if TESTING:
+        # SQLite doesn't need connection pooling or SSL
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=InstrumentedQueuePool if SQL_INSTRUMENTATION else None,
+            connect_args={"check_same_thread": False}  # Needed for SQLite
+        )
+        logger.info("SQLite engine created for testing")
+    else:
+        # Log database connection info (without password)
+        logger.info(f"Database configuration: Host={DB_HOST}, User={DB_USER}, Database={DB_NAME}")
+
+        # Configure MySQL engine with connection pooling optimized for serverless
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=InstrumentedQueuePool if SQL_INSTRUMENTATION else None,
+            pool_recycle=300,    # Recycle connections after 5 minutes (reduced from 1 hour)
+            pool_size=5,         # Limit pool size for Lambda environment
+            max_overflow=10,     # Allow up to 10 connections beyond pool_size
+            connect_args={
+                "connect_timeout": 20,  # 20 second connection timeout (increased from 10)
+                "read_timeout": 30,     # 30 second read timeout
+                "write_timeout": 30,    # 30 second write timeout
+                "ssl": {"ssl_mode": "REQUIRED"}  # Enable SSL for secure connections
+            }
+        )
+        logger.info("MySQL engine created with connection pooling")
+
+    # Add event listeners for connection debugging
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        logger.info("Database connection established")
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        logger.debug("Database connection checked out from pool")
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        logger.debug("Database connection returned to pool")
+
+    # Validate pooled connections only after they sat idle or hit an error
+    connection_health.attach(engine)
+    if SQL_INSTRUMENTATION:
+        instrument_engine(engine)
+    return engine
+
+
+def create_async_db_engine():
+    """Create the async engine behind AsyncSessionLocal."""
+    import ssl
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    poolclass = InstrumentedAsyncQueuePool if SQL_INSTRUMENTATION else None
+    if TESTING:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=poolclass)
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=poolclass,
+            pool_recycle=300,
+            pool_size=5,
+            max_overflow=10,
+            connect_args={"connect_timeout": 20, "ssl": ssl.create_default_context()},  # aiomysql wants an SSLContext
+        )
+    connection_health.attach(async_engine.sync_engine)
+    if SQL_INSTRUMENTATION:
+        instrument_engine(async_engine.sync_engine)
+    logger.info(f"Async engine created ({async_engine.dialect.driver})")
+    return async_engine
+
 
-# Log when the engine is created
-logger.info("SQLAlchemy engine created with connection pooling")
+# Engines are created on first use rather than at import, so a cold start only
+# pays for the driver and the pool once a request actually needs the database
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _lazy_engine(name, factory):
+    engine = _engines.get(name)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(name)
+            if engine is None:
+                engine = _engines[name] = factory()
+    return engine
+
+
+def get_engine():
+    """The application's engine, created on the first call."""
+    return _lazy_engine("sync", create_db_engine)
+
+
+def get_async_engine():
+    """The async engine used when ASYNC_DB is set, created on the first call."""
+    return _lazy_engine("async", create_async_db_engine)
+
+
+def created_engines():
+    """The engines created so far, keyed by "sync" / "async"."""
+    return dict(_engines)
+
+
+def __getattr__(name):
+    # `from app.database import engine` keeps working, at the cost of creating the engine
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine() if ASYNC_DB else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession(Session):
+    """
+    Session that binds to the application's engine the first time it needs a connection.
+
+    Nothing is checked out until a statement runs, so requests that never
+    touch the database (validation errors, cached responses) never wait for
+    it. That first checkout goes through connect_with_retry.
+    """
 
-# Add event listeners for connection debugging
-@event.listens_for(engine, "connect")
-def connect(dbapi_connection, connection_record):
-    logger.info("Database connection established")
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kw)
 
-@event.listens_for(engine, "checkout")
-def checkout(dbapi_connection, connection_record, connection_proxy):
-    logger.debug("Database connection checked out from pool")
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        transaction = self.get_transaction()
+        if transaction is not None and engine in transaction._connections:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        return connect_with_retry(
+            lambda: super(LazySession, self)._connection_for_bind(engine, execution_options, **kw),
+            reset=self.rollback,
+        )
 
-@event.listens_for(engine, "checkin")
-def checkin(dbapi_connection, connection_record):
-    logger.debug("Database connection returned to pool")
 
-# Create sessionmaker with engine
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class LazyAsyncSession(Session):
+    """Sync half of an AsyncSession, bound to the async engine on first use."""
+
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            self.bind = get_async_engine().sync_engine
+        return super().get_bind(mapper, **kw)
+
+
+# Objects stay loaded after commit by default: responses are built from the
+# instances the request just wrote, and the repositories refresh what they return
+DB_EXPIRE_ON_COMMIT = os.getenv("DB_EXPIRE_ON_COMMIT", "false").lower() == "true"
+
+# Create sessionmaker; sessions bind to the engine lazily
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False, expire_on_commit=DB_EXPIRE_ON_COMMIT)
+
+# Serve read routes through an AsyncSession on the event loop instead of the threadpool
+ASYNC_DB = os.getenv("ASYNC_DB", "false").lower() == "true"
+
+AsyncSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    if TESTING:
+        ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+    else:
+        ASYNC_DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:3306/{DB_NAME}"
+    AsyncSessionLocal = async_sessionmaker(sync_session_class=LazyAsyncSession, autoflush=False, expire_on_commit=False)
 
 # Create declarative base
 Base = declarative_base()
 
-def get_db_with_retry():
+def connect_with_retry(connect, reset):
     """
-    Get a database session with retry logic for connection issues.
-    
+    Run `connect` (a connection checkout) with retries for connection issues.
+
+    OperationalError and DatabaseError are retried MAX_RETRIES times with
+    exponential backoff, calling `reset` before each new attempt. The pool's
+    ConnectionHealth listeners decide whether a pooled connection needs a ping
+    first, so a connection that was just used costs no extra round trip.
+
     Returns:
-        SQLAlchemy session
-    
+        Whatever `connect` returns
+
     Raises:
         Exception: If all connection attempts fail
     """
     # For SQLite, we don't need retry logic
     if TESTING:
-        db = SessionLocal()
         try:
-            # Test the connection with a simple query
-            logger.info("Testing SQLite database connection...")
-            result = db.execute(text("SELECT 1")).scalar()
-            logger.info(f"SQLite database connection successful. Test query result: {result}")
-            return db
+            return connect()
         except Exception as e:
             logger.error(f"Error connecting to SQLite database: {str(e)}")
-            if db:
-                db.close()
             raise
-    
+
     # For MySQL, use retry logic
     last_exception = None
-    db = None
-    
+
     for attempt in range(MAX_RETRIES):
         try:
-            # Close any existing connection that might be in a bad state
-            if db:
+            if attempt:
+                # Drop whatever the failed attempt left behind
                 try:
-                    db.close()
+                    reset()
                 except Exception as close_error:
                     logger.warning(f"Error closing database connection: {str(close_error)}")
-                db = None
-            
-            # Create a new session
-            db = SessionLocal()
-            
-            # Test the connection with a simple query
-            logger.info(f"Testing MySQL connection (attempt {attempt+1})...")
-            result = db.execute(text("SELECT 1")).scalar()
-            logger.info(f"MySQL connection successful (attempt {attempt+1}). Test query result: {result}")
-            return db
-            
+
+            # Check out a connection; stale ones are pinged and replaced by the pool
+            connection = connect()
+            if attempt:
+                logger.info(f"MySQL connection successful (attempt {attempt+1})")
+            return connection
+
         except (OperationalError, DatabaseError) as e:
             last_exception = e
-            
+            db_retries.inc()
+
             # Calculate wait time with exponential backoff and some jitter
             base_wait_time = RETRY_DELAY * (2 ** attempt)  # Exponential backoff
             jitter = base_wait_time * 0.2 * (0.5 - time.time() % 0.5)  # Add up to 20% jitter
             wait_time = base_wait_time + jitter
-            
+
             logger.warning(
                 f"MySQL connection failed (attempt {attempt+1}/{MAX_RETRIES}): {str(e)}. "
                 f"Host: {DB_HOST}, Database: {DB_NAME}. "
@@ -149,16 +267,12 @@ def get_db_with_retry():
         except Exception as e:
             # Handle unexpected exceptions
             logger.error(f"Unexpected error connecting to MySQL: {str(e)}")
-            if db:
-                try:
-                    db.close()
-                except:
-                    pass
             raise
-    
+
     # If we get here, all retries failed
+    db_retry_failures.inc()
     logger.error(f"All MySQL connection retries ({MAX_RETRIES}) failed. Last error: {str(last_exception)}")
-    
+
     # Include more diagnostic information in the exception
     error_message = (
         f"Failed to connect to MySQL after {MAX_RETRIES} attempts. "
@@ -168,15 +282,33 @@ def get_db_with_retry():
     )
     raise OperationalError(error_message, None, last_exception)
 
+
+def get_db_with_retry():
+    """
+    Get a database session that has already checked out its connection.
+
+    Request sessions connect lazily instead (see LazySession); this is for
+    callers that want connection failures to surface right away.
+    """
+    db = SessionLocal()
+    try:
+        db.connection()
+        return db
+    except Exception:
+        db.close()
+        raise
+
 def init_db():
     """
     Initialize the database schema.
-    Creates all tables defined in the models.
+    Creates all tables defined in the models and upgrades existing ones.
     """
     try:
         logger.info("Initializing database schema...")
         from app import models
-        Base.metadata.create_all(bind=engine)
+        from app.schema_upgrade import upgrade_schema
+        Base.metadata.create_all(bind=get_engine())
+        upgrade_schema(get_engine())
         logger.info("Database schema initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database schema: {str(e)}")
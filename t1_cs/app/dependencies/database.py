@@ -0,0 +1,45 @@
+from typing import Union
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.database import ASYNC_DB, AsyncSessionLocal, SessionLocal
+
+# Session handed to read routes: an AsyncSession when ASYNC_DB is set, a Session otherwise
+ReadSession = Union[AsyncSession, Session]
+
+
+def get_db():
+    """
+    The request's database session.
+
+    Every route and dependency asks for this one provider, and FastAPI
+    resolves it once per request, so the permission check, the service call
+    and the response all share a single session and identity map. The
+    session connects (with retries) only when a statement first runs.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_read_db = get_async_read_db if ASYNC_DB else get_db
+
+
+async def run_db(db: ReadSession, fn, *args, **kwargs):
+    """
+    Run a sync service call `fn(session, *args)` from an async route.
+
+    With an AsyncSession the call runs through `run_sync`, so the repositories
+    are reused unchanged while the driver I/O happens on the event loop. With a
+    plain Session it falls back to the threadpool, as a sync route would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,35 @@
+import hashlib
+from fastapi import HTTPException, Request, Response
+from app.repositories.loader_plan import response_tables
+from app.versions import get_versions
+
+
+def etag(model, schema, *extra_tables):
+    """
+    Build a dependency that gives a GET route a strong ETag and answers
+    `If-None-Match` with 304.
+
+    The tag hashes the URL and the versions of every table the response is
+    built from (derived from `model` and its response `schema`, plus
+    `extra_tables` for tables that are only filtered on). A match is answered
+    before the route runs, so no query or serialization happens. Without
+    reachable version counters the route just runs untagged.
+    """
+    tables = tuple(sorted(response_tables(model, schema) | set(extra_tables)))
+
+    def check_etag(request: Request, response: Response):
+        versions = get_versions(tables)
+        if versions is None:
+            return
+        query = sorted(request.query_params.multi_items())
+        state = f"{request.url.path}|{query}|{versions}"
+        tag = f'"{hashlib.sha1(state.encode()).hexdigest()}"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+            if tag in candidates or "*" in candidates:
+                raise HTTPException(status_code=304, headers={"ETag": tag})
+        response.headers["ETag"] = tag
+
+    return check_etag
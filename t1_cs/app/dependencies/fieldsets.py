@@ -0,0 +1,25 @@
+from typing import Optional
+from fastapi import Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class SparseFields:
+    """
+    `?fields=a,b,c` query parameter for list and detail routes.
+
+    When fields are requested the route answers with plain rows rendered by
+    `render()`, bypassing the nested response model. Headers already set on
+    the request's response (e.g. pagination cursors) are carried over.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        fields: Optional[str] = Query(None, description="Comma-separated list of columns to return"),
+    ):
+        self.response = response
+        self.fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+    def render(self, content):
+        return JSONResponse(content=jsonable_encoder(content), headers=dict(self.response.headers))
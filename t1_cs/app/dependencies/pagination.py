@@ -0,0 +1,35 @@
+import os
+from typing import Optional
+from fastapi import Query, Request, Response
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+
+class Pagination:
+    """
+    Keyset pagination parameters for list routes.
+
+    `limit` is capped at MAX_PAGE_SIZE by validation; `after` is the cursor
+    (last id of the previous page). Use `page()` on the result to advertise
+    the next cursor through the `Link` and `X-Next-Cursor` headers.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return"),
+        after: Optional[int] = Query(None, ge=0, description="Return items with id greater than this cursor"),
+    ):
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.after = after
+
+    def page(self, page):
+        if page.next_cursor is not None:
+            next_url = self.request.url.include_query_params(limit=self.limit, after=page.next_cursor)
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+            self.response.headers["X-Next-Cursor"] = str(page.next_cursor)
+        return page
@@ -1,23 +1,82 @@
 # -*- coding: utf-8 -*-
 
-from fastapi import Depends, HTTPException
+import os
+from fastapi import Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.schemas.user import UserResponse
+from app.models.user import User
+from app.models.profile import Profile
+from app.cache import TTLCache
+from app.dependencies.database import get_db, run_db
+
+# Role of each requesting user, so authorization does not query the database on every write
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", "60"))
+_roles = TTLCache("roles", maxsize=4096, ttl=ROLE_CACHE_TTL)
+
+FORBIDDEN = {
+    "admin": "Apenas administradores podem acessar",
+    "professor": "Apenas professores podem acessar",
+    "coordinator": "Apenas coordenadores podem acessar",
+}
 
 
 def require_admin(user: UserResponse):
     if user.profile.name.lower() != "admin":
-        raise HTTPException(status_code=403, detail="Apenas administradores podem acessar")
+        raise HTTPException(status_code=403, detail=FORBIDDEN["admin"])
     return user
 
 def require_professor(user: UserResponse):
     if user.profile.name.lower() != "professor":
-        raise HTTPException(status_code=403, detail="Apenas professores podem acessar")
+        raise HTTPException(status_code=403, detail=FORBIDDEN["professor"])
     return user
 
 def require_coordinator(user: UserResponse):
-    print(user.profile.name.lower())
     if user.profile.name.lower() != "coordinator":
-        raise HTTPException(status_code=403, detail="Apenas coordenadores podem acessar")
+        raise HTTPException(status_code=403, detail=FORBIDDEN["coordinator"])
     return user
+
+
+def load_role(db: Session, user_id: int):
+    """Load the user's profile name (lowercased) with a single join and cache it."""
+    name = db.query(Profile.name).join(User, User.profile_id == Profile.id).filter(User.id == user_id).scalar()
+    if name is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    _roles.set(user_id, name.lower())
+    return name.lower()
+
+
+def invalidate_roles(user_id: int = None):
+    """Forget the cached role of one user, or of every user when profiles change."""
+    if user_id is None:
+        _roles.invalidate()
+    else:
+        _roles.discard(user_id)
+
+
+def require_role(role: str, param: str = "user_id"):
+    """
+    Build a dependency that lets the request through only if the user whose id
+    is in the `param` path parameter has the given role.
+
+    The role comes from a short-lived cache, so on the hot path no query is
+    issued; on a miss it is loaded through the request's own session, the
+    same one the route then uses.
+    """
+    async def check_role(request: Request, db: Session = Depends(get_db)):
+        try:
+            user_id = int(request.path_params[param])
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid {param}")
+        user_role = _roles.get(user_id)
+        if user_role is None:
+            user_role = await run_db(db, load_role, user_id)
+        if user_role != role:
+            raise HTTPException(status_code=403, detail=FORBIDDEN[role])
+        return user_id
+
+    return check_role
+
+
+admin_required = require_role("admin")
+professor_required = require_role("professor")
+coordinator_required = require_role("coordinator")
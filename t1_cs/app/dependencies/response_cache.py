@@ -0,0 +1,60 @@
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.cache import ResponseCache
+from app.repositories.loader_plan import response_tables
+from app.versions import get_versions
+
+_responses = ResponseCache("responses")
+
+# Headers that describe the stored body rather than this particular exchange
+_CACHED_HEADERS = ("link", "x-next-cursor")
+
+
+class CachedList:
+    """
+    Per-request handle on the response cache for one list route.
+
+    `hit()` returns a ready Response when the route's query was already
+    rendered at the current table versions. Otherwise the route builds its
+    result as usual and passes it to `render()` (or a finished response to
+    `keep()`), which stores the JSON bytes for the next request.
+    """
+
+    def __init__(self, request: Request, response: Response, adapter: TypeAdapter, tables):
+        self.response = response
+        self.key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        # Read before the route queries, so a concurrent write can only make the entry stale
+        versions = get_versions(tables)
+        self.versions = tuple(versions) if versions is not None else None
+        self.adapter = adapter
+
+    def hit(self):
+        if self.versions is None:
+            return None
+        cached = _responses.get(self.key, self.versions)
+        if cached is None:
+            return None
+        body, headers = cached
+        return Response(content=body, media_type="application/json", headers={**headers, **self.response.headers})
+
+    def render(self, rows):
+        body = self.adapter.dump_json(self.adapter.validate_python(rows, from_attributes=True))
+        return self.keep(Response(content=body, media_type="application/json", headers=dict(self.response.headers)))
+
+    def keep(self, response: Response):
+        if self.versions is None:
+            return response
+        headers = {name: value for name, value in response.headers.items() if name in _CACHED_HEADERS}
+        _responses.set(self.key, self.versions, bytes(response.body), headers)
+        return response
+
+
+def cached_list(model, schema):
+    """Build a dependency giving a list route of `schema` items its CachedList handle."""
+    tables = tuple(sorted(response_tables(model, schema)))
+    adapter = TypeAdapter(list[schema])
+
+    def dependency(request: Request, response: Response):
+        return CachedList(request, response, adapter, tables)
+
+    return dependency
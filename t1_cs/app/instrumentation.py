@@ -0,0 +1,140 @@
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.metrics import pool_checkouts, pool_wait_seconds
+
+logger = logging.getLogger("app")
+
+# Warn when one request runs the same statement shape more than this many times
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+
+# Placeholder lists of expanding IN clauses, e.g. "(?, ?, ?)" or "(%s, %s)"
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,)*\s*(?:\?|%s|%\(\w+\)s)\s*\)")
+
+
+class RequestStats:
+    """SQL statements, their total time and the pool wait of one request."""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.shapes = Counter()
+
+
+_current = ContextVar("request_sql_stats", default=None)
+
+
+def current_stats():
+    """Stats of the request being served, or None outside of one."""
+    return _current.get()
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with placeholder lists collapsed, so IN clauses of any length count as one shape."""
+    return _PLACEHOLDER_LIST.sub("(?)", statement)
+
+
+def instrument_engine(engine):
+    """Count and time every statement `engine` runs (a sync Engine, or an AsyncEngine's sync_engine)."""
+
+    # The start time lives on the statement's execution context, so a failed
+    # statement leaves nothing behind on the connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        stats = _current.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+            stats.shapes[statement_shape(statement)] += 1
+
+
+class _TimedCheckout:
+    # Time spent waiting for a pooled connection, including opening a new one
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            pool_checkouts.inc()
+            pool_wait_seconds.inc(waited)
+            stats = _current.get()
+            if stats is not None:
+                stats.pool_wait += waited
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that adds checkout wait to the current request's stats and the pool metrics."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that adds checkout wait to the current request's stats and the pool metrics."""
+
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    return (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries", '
+        f"db-pool;dur={stats.pool_wait * 1000:.2f}, "
+        f"app;dur={total * 1000:.2f}"
+    )
+
+
+def route_name(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "name", None) or scope.get("path", "")
+
+
+class SQLTimingMiddleware:
+    """
+    ASGI middleware that collects the SQL stats of each request.
+
+    The totals go out in a Server-Timing header, and statement shapes run
+    more than `threshold` times are logged as likely N+1 queries with the
+    name of the route that ran them.
+    """
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, time.perf_counter() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self.report(scope, stats)
+
+    def report(self, scope, stats: RequestStats):
+        for shape, count in stats.shapes.items():
+            if count > self.threshold:
+                logger.warning(
+                    "Possible N+1 in %s %s (route %s): statement ran %d times: %s",
+                    scope.get("method"), scope.get("path"), route_name(scope), count, shape,
+                )
@@ -0,0 +1,95 @@
+import importlib
+import logging
+import pkgutil
+import threading
+
+logger = logging.getLogger("app")
+
+# Every router of the API as (prefix, module, class); the prefix must match the router's own
+ROUTERS = {
+    "reservation": ("/reservations", "app.routers.reservation", "ReservationRouter"),
+    "resource": ("/resources", "app.routers.resource", "ResourceRouter"),
+    "lesson": ("/lessons", "app.routers.lesson", "LessonRouter"),
+    "class_router": ("/classes", "app.routers.class_router", "ClassRouter"),
+    "room": ("/rooms", "app.routers.room", "RoomRouter"),
+    "discipline": ("/disciplines", "app.routers.discipline", "DisciplineRouter"),
+    "curriculum": ("/curriculums", "app.routers.curriculum", "CurriculumRouter"),
+    "evaluation": ("/evaluations", "app.routers.evaluation", "EvaluationRouter"),
+    "resource_type": ("/resource-types", "app.routers.resource_type", "ResourceTypeRouter"),
+    "user": ("/users", "app.routers.user", "UserRouter"),
+    "profile": ("/profiles", "app.routers.profile", "ProfileRouter"),
+    "building": ("/buildings", "app.routers.building", "BuildingRouter"),
+}
+
+
+def import_models():
+    """
+    Import every module under app.models.
+
+    Relationships refer to other models by name, so the mappers can only be
+    configured once all of them are imported; a single lazily loaded router
+    does not import them all by itself.
+    """
+    models = importlib.import_module("app.models")
+    for module in pkgutil.iter_modules(models.__path__, "app.models."):
+        importlib.import_module(module.name)
+
+
+class RouterRegistry:
+    """
+    Imports the API routers and includes them in the app, each at most once.
+
+    `load_all()` gives the eager behaviour. With lazy loading, the
+    LazyRouterMiddleware calls `load_for_path()` so a router (and its
+    services, repositories and schemas) is only imported when the first
+    request under its prefix arrives.
+    """
+
+    def __init__(self, app, routers: dict = ROUTERS):
+        self.app = app
+        self.routers = routers
+        self.loaded = {}
+        self._by_prefix = {prefix: name for name, (prefix, _, _) in routers.items()}
+        self._lock = threading.Lock()
+
+    def load(self, name):
+        """Import router `name`, include its routes and return the router object."""
+        router = self.loaded.get(name)
+        if router is not None:
+            return router
+        with self._lock:
+            if name not in self.loaded:
+                if not self.loaded:
+                    import_models()
+                prefix, module, cls = self.routers[name]
+                router = getattr(importlib.import_module(module), cls)()
+                self.app.include_router(router.router)
+                self.loaded[name] = router
+                logger.info("Loaded router %s", name)
+        return self.loaded[name]
+
+    def load_all(self):
+        for name in self.routers:
+            self.load(name)
+
+    def owner(self, path: str):
+        """Name of the router serving `path`, or None."""
+        return self._by_prefix.get("/" + path.split("/", 2)[1]) if path.startswith("/") else None
+
+    def load_for_path(self, path: str):
+        name = self.owner(path)
+        if name is not None and name not in self.loaded:
+            self.load(name)
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that includes the router owning a request's path before routing it."""
+
+    def __init__(self, app, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.registry.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
@@ -1,27 +1,24 @@
-from app.database import SessionLocal, init_db, get_db_with_retry
+from app.database import init_db
+from app.dependencies.database import get_db
+from app.connection_health import connection_health
 from sqlalchemy import text
 from fastapi import FastAPI, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from sqlalchemy.orm import Session
-from app.routers.reservation import ReservationRouter
-from app.routers.profile import ProfileRouter
-from app.routers.user import UserRouter
-from app.routers.building import BuildingRouter
-from app.routers.resource_type import ResourceTypeRouter
-from app.routers.evaluation import EvaluationRouter
-from app.routers.curriculum import CurriculumRouter
-from app.routers.discipline import DisciplineRouter
-from app.routers.room import RoomRouter
-from app.routers.class_router import ClassRouter
-from app.routers.lesson import LessonRouter
-from app.routers.resource import ResourceRouter
-from app.script import populate_profiles_and_user, populate_all
+from app.lazy_routers import RouterRegistry, LazyRouterMiddleware
+from app.instrumentation import SQL_INSTRUMENTATION, SQLTimingMiddleware
+from app import metrics
+from app.openapi import load_openapi_bytes
+from app import versions  # noqa: F401 - table version listeners must see every commit, even before a router loads
+import json
 import logging
 import os
+import sys
+from functools import lru_cache
 import time
 import traceback
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, DatabaseError
-import pymysql
 from fastapi.middleware.cors import CORSMiddleware  # Import necessário para CORS
 
 # Configure logging
@@ -40,15 +37,18 @@ api_stage = os.environ.get("API_STAGE", "Prod")
 # Configure FastAPI app with appropriate OpenAPI URL
 if is_lambda:
     openapi_url = f"/{api_stage}/openapi.json"
+    server_url = f"/{api_stage}"
     logger.info(f"Running in Lambda environment. Setting openapi_url to: {openapi_url}")
-    app = FastAPI(openapi_url=openapi_url)
-
-    @app.get("/openapi.json")
-    async def get_openapi_schema():
-        return app.openapi()
 else:
+    openapi_url = "/openapi.json"
+    server_url = ""
     logger.info("Running in local environment. Using default OpenAPI URL.")
-    app = FastAPI()
+
+# Import each router on the first request under its prefix instead of at startup (cold starts)
+LAZY_ROUTERS = os.environ.get("LAZY_ROUTERS", "false").lower() == "true"
+
+# The schema and docs routes are registered below so the schema is served from pre-encoded bytes
+app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
 
 # Enhanced CORS Middleware configuration
 app.add_middleware(
@@ -64,49 +64,43 @@ app.add_middleware(
     # Allow browsers to cache preflight results longer
     max_age=86400,  # 24 hours
     # Expose these headers to the browser
-    expose_headers=["Content-Type", "X-Requested-With", "Authorization"]
+    expose_headers=["Content-Type", "X-Requested-With", "Authorization", "Link", "X-Next-Cursor", "ETag", "Server-Timing"]
 )
 
 # Configure OpenAPI schema com o servidor correto
-def custom_openapi():
-    from fastapi.openapi.utils import get_openapi
+@lru_cache(maxsize=None)
+def openapi_bytes():
+    return load_openapi_bytes(app, server_url, before_build=routers.load_all)
 
+def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
-
-    openapi_schema = get_openapi(
-        title="FastAPI Application",
-        version="1.0.0",
-        description="API for resource management system",
-        routes=app.routes,
-    )
-
-    if is_lambda:
-        openapi_schema["servers"] = [{"url": f"/{api_stage}"}]
-        logger.info(f"Setting OpenAPI server URL to: /{api_stage}")
-    else:
-        openapi_schema["servers"] = [{"url": ""}]
-        logger.info("Using default server URL for local development")
-
-    app.openapi_schema = openapi_schema
+    app.openapi_schema = json.loads(openapi_bytes())
     return app.openapi_schema
 
 app.openapi = custom_openapi
 
-# Database dependency with retry logic
-def get_db():
-    db = None
-    try:
-        db = get_db_with_retry()
-        yield db
-    except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
-        if db:
-            db.close()
-        raise
-    finally:
-        if db:
-            db.close()
+async def get_openapi_schema():
+    return Response(content=openapi_bytes(), media_type="application/json")
+
+# Behind API Gateway the stage prefix is stripped before the app sees the path
+for path in dict.fromkeys(["/openapi.json", openapi_url]):
+    app.add_api_route(path, get_openapi_schema, include_in_schema=False)
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html():
+    return get_swagger_ui_html(openapi_url=openapi_url, title="FastAPI Application - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html():
+    return get_redoc_html(openapi_url=openapi_url, title="FastAPI Application - ReDoc")
+
+def is_database_error(e: Exception) -> bool:
+    if isinstance(e, (SQLAlchemyError, OperationalError, DatabaseError)):
+        return True
+    # pymysql is only imported once the engine connects, so don't import it just to check
+    pymysql = sys.modules.get("pymysql")
+    return pymysql is not None and isinstance(e, pymysql.Error)
 
 # Middleware para lidar com erros de banco de dados
 @app.middleware("http")
@@ -114,22 +108,31 @@ async def db_session_middleware(request: Request, call_next):
     try:
         response = await call_next(request)
         return response
-    except (SQLAlchemyError, OperationalError, DatabaseError, pymysql.Error) as e:
+    except Exception as e:
+        if not is_database_error(e):
+            logger.error(f"Request failed: {str(e)}\n{traceback.format_exc()}")
+            return JSONResponse(
+                status_code=500,
+                content={"detail": "Internal server error", "message": str(e)},
+            )
         logger.error(f"Database error in request: {str(e)}\n{traceback.format_exc()}")
         return JSONResponse(
             status_code=500,
             content={"detail": "Database error", "message": str(e)},
         )
-    except Exception as e:
-        logger.error(f"Request failed: {str(e)}\n{traceback.format_exc()}")
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal server error", "message": str(e)},
-        )
+
+# Count and time the SQL of each request (Server-Timing header, N+1 warnings)
+if SQL_INSTRUMENTATION:
+    app.add_middleware(SQLTimingMiddleware)
+
+# Latency and status of every request, served at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Endpoint admin para inicializar banco de dados
 @app.post("/admin/init-db")
 def initialize_database(db: Session = Depends(get_db)):
+    from app.script import populate_profiles_and_user, populate_all
+
     try:
         init_db()
         populate_profiles_and_user(db)
@@ -154,12 +157,17 @@ def health_check():
             content={"status": "healthy"}
         )
 
+# Métricas no formato texto do Prometheus
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Checagem de status do banco
 @app.get("/db-status")
 def db_status(db: Session = Depends(get_db)):
     try:
         result = db.execute(text("SELECT 1")).scalar()
-        return {"status": "connected", "result": result}
+        return {"status": "connected", "result": result, "health": connection_health.stats()}
     except Exception as e:
         logger.error(f"Database status check failed: {str(e)}")
         return JSONResponse(
@@ -168,41 +176,12 @@ def db_status(db: Session = Depends(get_db)):
         )
 
 # Routers incluídos
-reservation = ReservationRouter()
-app.include_router(reservation.router)
-
-resource = ResourceRouter()
-app.include_router(resource.router)
-
-lesson = LessonRouter()
-app.include_router(lesson.router)
-
-class_router = ClassRouter()
-app.include_router(class_router.router)
-
-room = RoomRouter()
-app.include_router(room.router)
-
-discipline = DisciplineRouter()
-app.include_router(discipline.router)
-
-curriculum = CurriculumRouter()
-app.include_router(curriculum.router)
-
-evaluation = EvaluationRouter()
-app.include_router(evaluation.router)
-
-resource_type = ResourceTypeRouter()
-app.include_router(resource_type.router)
-
-user = UserRouter()
-app.include_router(user.router)
-
-profile = ProfileRouter()
-app.include_router(profile.router)
-
-building = BuildingRouter()
-app.include_router(building.router)
+routers = RouterRegistry(app)
+if LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware, registry=routers)
+    logger.info("Routers will be loaded on first use")
+else:
+    routers.load_all()
 
 # Root endpoint
 @app.get("/")
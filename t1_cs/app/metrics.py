@@ -0,0 +1,150 @@
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic counter that may be incremented from the threadpool."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class RouteMetrics:
+    """
+    Latency histogram and status counts of one route.
+
+    Only updated from the event loop by MetricsMiddleware, so no locking is needed.
+    """
+
+    __slots__ = ("buckets", "sum", "count", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.statuses = {}
+
+    def observe(self, seconds: float, status: int):
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+# Keyed by (method, route path template); unmatched paths share one entry to bound cardinality
+routes = {}
+db_retries = Counter()
+db_retry_failures = Counter()
+pool_checkouts = Counter()
+pool_wait_seconds = Counter()
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records the latency and status of every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            key = (scope["method"], route.path if route is not None else "unmatched")
+            metrics = routes.get(key)
+            if metrics is None:
+                metrics = routes[key] = RouteMetrics()
+            metrics.observe(time.perf_counter() - started, status)
+
+
+def _labels(**labels):
+    return ",".join('%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in labels.items())
+
+
+def _family(lines, name, kind, help_text):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    from app.cache import cache_stats
+    from app.connection_health import connection_health
+    from app.database import created_engines
+
+    lines = []
+    snapshot = sorted(routes.items())
+
+    _family(lines, "http_request_duration_seconds", "histogram", "Request latency by route.")
+    for (method, path), metrics in snapshot:
+        labels = _labels(method=method, route=path)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), metrics.buckets):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.sum:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+    _family(lines, "http_responses_total", "counter", "Responses by route and status code.")
+    for (method, path), metrics in snapshot:
+        for status, count in sorted(metrics.statuses.items()):
+            lines.append(f"http_responses_total{{{_labels(method=method, route=path, status=status)}}} {count}")
+
+    pools = []
+    for name, engine in sorted(created_engines().items()):
+        pool = engine.sync_engine.pool if hasattr(engine, "sync_engine") else engine.pool
+        if hasattr(pool, "checkedout"):
+            pools.append((_labels(engine=name), pool))
+    for metric, help_text, read in (
+        ("db_pool_size", "Configured size of the connection pool.", lambda pool: pool.size()),
+        ("db_pool_checked_out", "Connections currently checked out of the pool.", lambda pool: pool.checkedout()),
+        ("db_pool_overflow", "Connections open beyond the pool size.", lambda pool: max(pool.overflow(), 0)),
+    ):
+        _family(lines, metric, "gauge", help_text)
+        lines.extend(f"{metric}{{{labels}}} {read(pool)}" for labels, pool in pools)
+
+    _family(lines, "db_pool_checkouts_total", "counter", "Connections handed out by the pool.")
+    lines.append(f"db_pool_checkouts_total {pool_checkouts.value}")
+    _family(lines, "db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for pooled connections.")
+    lines.append(f"db_pool_checkout_wait_seconds_total {pool_wait_seconds.value:.6f}")
+
+    _family(lines, "db_connection_retries_total", "counter", "Failed connection attempts retried by get_db_with_retry.")
+    lines.append(f"db_connection_retries_total {db_retries.value}")
+    _family(lines, "db_connection_failures_total", "counter", "Sessions get_db_with_retry gave up on.")
+    lines.append(f"db_connection_failures_total {db_retry_failures.value}")
+
+    health = connection_health.stats()
+    _family(lines, "db_health_pings_total", "counter", "Pooled connections pinged on checkout, by outcome.")
+    lines.append(f'db_health_pings_total{{outcome="pinged"}} {health["pings"]}')
+    lines.append(f'db_health_pings_total{{outcome="avoided"}} {health["pings_avoided"]}')
+    lines.append(f'db_health_pings_total{{outcome="failed"}} {health["ping_failures"]}')
+
+    caches = sorted(cache_stats().items())
+    _family(lines, "cache_hits_total", "counter", "Cache hits by cache.")
+    lines.extend(f"cache_hits_total{{{_labels(cache=name)}}} {stats['hits']}" for name, stats in caches)
+    _family(lines, "cache_misses_total", "counter", "Cache misses by cache.")
+    lines.extend(f"cache_misses_total{{{_labels(cache=name)}}} {stats['misses']}" for name, stats in caches)
+
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,8 @@
+from typing import Optional
 from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
+from app.models.class_schedule import ClassSchedule, parse_schedule
 
 class Class(Base):
     __tablename__ = "classes"
@@ -17,4 +19,19 @@ class Class(Base):
     discipline = relationship("Discipline", back_populates="classes")
     professor = relationship("User", back_populates="classes_taught")
     evaluations = relationship("Evaluation", back_populates="class_instance")
-    lessons = relationship("Lesson", back_populates="class_instance")
\ No newline at end of file
+    lessons = relationship("Lesson", back_populates="class_instance")
+    schedules = relationship("ClassSchedule", back_populates="class_instance", cascade="all, delete-orphan")
+
+    @validates("schedule")
+    def _sync_schedules(self, key, schedule):
+        # Keeps the structured weekly recurrence in step with the schedule text
+        if schedule is not None:
+            self.rebuild_schedules(schedule)
+        return schedule
+
+    def rebuild_schedules(self, schedule: Optional[str] = None):
+        """Replace the weekly slots with those parsed from `schedule` (default: the current text); raises ValueError."""
+        self.schedules = [
+            ClassSchedule(weekday=weekday, start_time=start, end_time=end)
+            for weekday, start, end in parse_schedule(schedule if schedule is not None else self.schedule)
+        ]
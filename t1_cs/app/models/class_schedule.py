@@ -0,0 +1,70 @@
+import re
+from datetime import time
+from sqlalchemy import Column, Integer, Time, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+# Day names accepted in Class.schedule, mapped to date.weekday()
+WEEKDAYS = {
+    "mon": 0, "monday": 0, "seg": 0,
+    "tue": 1, "tuesday": 1, "ter": 1,
+    "wed": 2, "wednesday": 2, "qua": 2,
+    "thu": 3, "thursday": 3, "qui": 3,
+    "fri": 4, "friday": 4, "sex": 4,
+    "sat": 5, "saturday": 5, "sab": 5, "sáb": 5,
+    "sun": 6, "sunday": 6, "dom": 6,
+}
+
+_SLOT = re.compile(r"^(?P<days>[^\s\d]+)\s+(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2})$")
+
+
+def _parse_time(value: str):
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def parse_schedule(schedule: str):
+    """
+    Parse a schedule such as "Mon-Wed 10:00-12:00" into (weekday, start, end) slots.
+
+    Each day in the day list (separated by "-" or "/") meets at the given
+    time, so "Mon-Wed" is Monday and Wednesday. Several groups can be joined
+    with ";" or ",", e.g. "Mon 08:00-10:00; Thu 14:00-16:00".
+    Raises ValueError for anything that cannot be parsed.
+    """
+    slots = []
+    for group in re.split(r"[;,]", schedule):
+        match = _SLOT.match(group.strip())
+        if not match:
+            raise ValueError(f"Invalid schedule '{group.strip()}', expected e.g. 'Mon-Wed 10:00-12:00'")
+        try:
+            start, end = _parse_time(match["start"]), _parse_time(match["end"])
+        except ValueError:
+            raise ValueError(f"Invalid time in schedule '{group.strip()}'")
+        if start >= end:
+            raise ValueError(f"Schedule '{group.strip()}' must start before it ends")
+        for day in re.split(r"[-/]", match["days"]):
+            weekday = WEEKDAYS.get(day.lower())
+            if weekday is None:
+                raise ValueError(f"Unknown weekday '{day}' in schedule")
+            if (weekday, start, end) not in slots:
+                slots.append((weekday, start, end))
+    return slots
+
+
+class ClassSchedule(Base):
+    __tablename__ = "class_schedules"
+    __table_args__ = (
+        Index("ix_class_schedules_weekday_start_time", "weekday", "start_time"),
+        Index("ix_class_schedules_class_id", "class_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # 0 is Monday, matching date.weekday()
+    weekday = Column(Integer, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
+    # Relationships
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=False)
+    class_instance = relationship("Class", back_populates="schedules")
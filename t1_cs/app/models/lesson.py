@@ -1,12 +1,20 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        Index("ix_lessons_room_id_date", "room_id", "date"),
+        Index("ix_lessons_class_id_date", "class_id", "date"),
+        Index("ix_lessons_date", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, nullable=False)
+    # Time slot of the lesson; a lesson without one occupies the whole day
+    start_time = Column(Time, nullable=True)
+    end_time = Column(Time, nullable=True)
     attendance = Column(String(255), nullable=True)  
 
     # Relationships
@@ -1,13 +1,22 @@
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, Date, Time, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Overlap checks seek on (resource_id, date) and range-scan the slots of that day
+        Index("ix_reservations_resource_id_date_slot", "resource_id", "date", "start_time", "end_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     observation = Column(String(255), nullable=True)
 
+    # Time slot copied from the lesson when the reservation is made
+    date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
     # Relationships
     lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
     resource_id = Column(Integer, ForeignKey("resources.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -10,10 +10,16 @@ class ResourceStatus(str, enum.Enum):
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_resource_type_id_status", "resource_type_id", "status"),
+        Index("ix_resources_status", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(255), nullable=False)
     status = Column(Enum(ResourceStatus), default=ResourceStatus.available, nullable=False)
+    # Bumped by every reservation made for this resource (optimistic locking)
+    version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationships
     resource_type_id = Column(Integer, ForeignKey("resource_types.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -12,6 +12,10 @@ room_resource_association = Table(
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_building_id_capacity", "building_id", "capacity"),
+        Index("ix_rooms_capacity", "capacity"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     room_number = Column(Integer, nullable=False)
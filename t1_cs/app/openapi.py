@@ -0,0 +1,49 @@
+import json
+import logging
+import os
+from fastapi.openapi.utils import get_openapi
+
+logger = logging.getLogger("app")
+
+# Written at build time by build_openapi.py; the schema without its "servers" entry
+OPENAPI_ARTIFACT = os.getenv("OPENAPI_ARTIFACT", os.path.join(os.path.dirname(__file__), "openapi.json"))
+
+
+def build_openapi_schema(app):
+    """The app's OpenAPI schema, without the stage-specific "servers" entry."""
+    return get_openapi(
+        title="FastAPI Application",
+        version="1.0.0",
+        description="API for resource management system",
+        routes=app.routes,
+    )
+
+
+def encode_schema(schema: dict) -> bytes:
+    return json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def with_servers(body: bytes, server_url: str) -> bytes:
+    """Prepend the "servers" entry to an encoded schema without decoding it."""
+    servers = encode_schema({"servers": [{"url": server_url}]})
+    return servers[:-1] + b"," + body[1:]
+
+
+def load_openapi_bytes(app, server_url: str, before_build=None) -> bytes:
+    """
+    Encoded OpenAPI schema for this deployment.
+
+    Reads the build-time artifact when there is one; otherwise (local runs,
+    tests) the schema is built from the routes once, as FastAPI would, after
+    calling `before_build()` so that every route is registered.
+    """
+    try:
+        with open(OPENAPI_ARTIFACT, "rb") as f:
+            body = f.read()
+        logger.info(f"Serving OpenAPI schema from {OPENAPI_ARTIFACT}")
+    except FileNotFoundError:
+        logger.info("No OpenAPI artifact found, building the schema from the routes")
+        if before_build is not None:
+            before_build()
+        body = encode_schema(build_openapi_schema(app))
+    return with_servers(body, server_url)
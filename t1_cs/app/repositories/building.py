@@ -1,16 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.building import Building
-from app.schemas.building import BuildingCreate, BuildingUpdate
+from app.schemas.building import BuildingCreate, BuildingUpdate, BuildingResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 
 class BuildingRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Building).all()
+    def _query(self, db: Session):
+        return db.query(Building).options(*build_loader_plan(Building, BuildingResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Building.id, limit, after)
 
     def get_by_id(self, db: Session, building_id: int):
-        return db.query(Building).filter(Building.id == building_id).first()
+        return self._query(db).filter(Building.id == building_id).first()
 
     def create(self, db: Session, building: BuildingCreate):
         db_building = Building(**building.dict())
@@ -29,7 +34,7 @@ class BuildingRepository:
 
         db.commit()
         db.refresh(db_building)
-        db_building
+        return db_building
 
     def delete(self, db: Session, building_id: int):
         db_building = self.get_by_id(db, building_id)
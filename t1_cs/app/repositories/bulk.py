@@ -0,0 +1,95 @@
+import os
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.schemas.bulk import BulkItemResult, BulkResult
+
+# Largest payload accepted by the bulk create endpoints
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "5000"))
+
+# Rows per multi-row INSERT on dialects without RETURNING
+BULK_INSERT_CHUNK = 1000
+
+
+def bulk_insert(db: Session, model, rows: list[dict]):
+    """
+    Insert `rows` with a single executemany and return their ids in input order.
+
+    Dialects that support RETURNING with executemany (SQLite, MariaDB,
+    PostgreSQL) get one batched statement. MySQL has no RETURNING, so the
+    rows go in as multi-row INSERTs of BULK_INSERT_CHUNK rows whose ids are
+    derived from the statement's lastrowid (see _insert_chunk). Everything
+    stays in the caller's transaction.
+    """
+    if not rows:
+        return []
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(db.scalars(statement, rows))
+
+    ids = []
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        ids.extend(_insert_chunk(db, model, rows[start:start + BULK_INSERT_CHUNK]))
+    return ids
+
+
+def _insert_chunk(db: Session, model, rows: list[dict]):
+    """
+    Insert `rows` with one multi-row INSERT and return their ids.
+
+    A statement with a known row count normally gets consecutive
+    auto-increment ids, starting at the lastrowid MySQL reports (SQLite
+    reports the last one instead). With innodb_autoinc_lock_mode=2 a
+    concurrent insert into the same table can interleave, so the rows at
+    those ids are read back and compared; on a mismatch the chunk is undone
+    and inserted row by row through the unit of work.
+    """
+    savepoint = db.begin_nested()
+    lastrowid = db.execute(insert(model).values(rows)).lastrowid
+    first = lastrowid if db.get_bind().dialect.name == "mysql" else lastrowid - len(rows) + 1
+    ids = list(range(first, first + len(rows)))
+
+    columns = sorted(rows[0])
+    stored = db.execute(
+        select(model.id, *(getattr(model, column) for column in columns)).where(model.id.between(ids[0], ids[-1])).order_by(model.id)
+    ).all()
+    if [row[0] for row in stored] == ids and all(
+        tuple(found[1:]) == tuple(row.get(column) for column in columns) for found, row in zip(stored, rows)
+    ):
+        savepoint.commit()
+        return ids
+
+    savepoint.rollback()
+    objects = [model(**row) for row in rows]
+    db.add_all(objects)
+    db.flush()
+    return [obj.id for obj in objects]
+
+
+def missing_references(db: Session, items, references):
+    """
+    Check the foreign keys of a whole payload with one query per referenced table.
+
+    `references` maps an item attribute to the primary key column it points
+    at. Returns {item index: error message} for items that reference rows
+    that do not exist.
+    """
+    errors = {}
+    for attribute, column in references.items():
+        wanted = {getattr(item, attribute) for item in items}
+        existing = set(db.scalars(select(column).where(column.in_(wanted))))
+        for index, item in enumerate(items):
+            value = getattr(item, attribute)
+            if value not in existing and index not in errors:
+                errors[index] = f"{attribute} {value} does not exist"
+    return errors
+
+
+def bulk_results(total: int, errors: dict, created: dict):
+    """Combine per-item errors and {index: new id} into a BulkResult in payload order."""
+    items = [
+        BulkItemResult(index=index, error=errors[index]) if index in errors
+        else BulkItemResult(index=index, id=created[index])
+        for index in range(total)
+    ]
+    return BulkResult(created=len(created), failed=len(errors), items=items)
@@ -1,16 +1,28 @@
 from sqlalchemy.orm import Session
 from app.models.class_model import Class
-from app.schemas.class_schema import ClassCreate, ClassUpdate
+from app.schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.fieldsets import fetch_fields, fetch_fields_by_id
 
 class ClassRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Class).all()
+    def _query(self, db: Session):
+        return db.query(Class).options(*build_loader_plan(Class, ClassResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Class.id, limit, after)
 
     def get_by_id(self, db: Session, class_id: int):
-        return db.query(Class).filter(Class.id == class_id).first()
+        return self._query(db).filter(Class.id == class_id).first()
+
+    def get_fields(self, db: Session, fields: list[str], limit: int = None, after: int = None):
+        return fetch_fields(db, Class, fields, limit, after)
+
+    def get_fields_by_id(self, db: Session, class_id: int, fields: list[str]):
+        return fetch_fields_by_id(db, Class, class_id, fields)
 
     def create(self, db: Session, class_data: ClassCreate):
         db_class = Class(
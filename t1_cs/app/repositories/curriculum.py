@@ -1,18 +1,23 @@
 from sqlalchemy.orm import Session
 from app.models.curriculum import Curriculum
 from app.models.discipline import Discipline
-from app.schemas.curriculum import CurriculumCreate, CurriculumUpdate
+from app.schemas.curriculum import CurriculumCreate, CurriculumUpdate, CurriculumResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 from fastapi import HTTPException
 
 class CurriculumRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Curriculum).all()
+    def _query(self, db: Session):
+        return db.query(Curriculum).options(*build_loader_plan(Curriculum, CurriculumResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Curriculum.id, limit, after)
 
     def get_by_id(self, db: Session, curriculum_id: int):
-        return db.query(Curriculum).filter(Curriculum.id == curriculum_id).first()
+        return self._query(db).filter(Curriculum.id == curriculum_id).first()
 
     def create(self, db: Session, curriculum: CurriculumCreate):
         # Create new Curriculum
@@ -1,16 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.discipline import Discipline
-from app.schemas.discipline import DisciplineCreate, DisciplineUpdate
+from app.schemas.discipline import DisciplineCreate, DisciplineUpdate, DisciplineResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 
 class DisciplineRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Discipline).all()
+    def _query(self, db: Session):
+        return db.query(Discipline).options(*build_loader_plan(Discipline, DisciplineResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Discipline.id, limit, after)
 
     def get_by_id(self, db: Session, discipline_id: int):
-        return db.query(Discipline).filter(Discipline.id == discipline_id).first()
+        return self._query(db).filter(Discipline.id == discipline_id).first()
 
     def create(self, db: Session, discipline: DisciplineCreate):
         db_discipline = Discipline(**discipline.dict())
@@ -1,16 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.evaluation import Evaluation
-from app.schemas.evaluation import EvaluationCreate, EvaluationUpdate
+from app.schemas.evaluation import EvaluationCreate, EvaluationUpdate, EvaluationResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 
 class EvaluationRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Evaluation).all()
+    def _query(self, db: Session):
+        return db.query(Evaluation).options(*build_loader_plan(Evaluation, EvaluationResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Evaluation.id, limit, after)
 
     def get_by_id(self, db: Session, evaluation_id: int):
-        return db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
+        return self._query(db).filter(Evaluation.id == evaluation_id).first()
 
     def create(self, db: Session, evaluation: EvaluationCreate):
         db_evaluation = Evaluation(
@@ -0,0 +1,37 @@
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+from app.repositories.pagination import paginate
+
+
+def select_fields(model, fields):
+    """
+    Compile a sparse fieldset into a Core select() of just those columns.
+
+    `id` is always included, since it is the pagination cursor. Raises
+    ValueError for names that are not columns of the model (relationships
+    cannot be requested this way).
+    """
+    columns = inspect(model).columns
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    names = ["id"] + [field for field in dict.fromkeys(fields) if field != "id"]
+    return select(*(columns[name] for name in names))
+
+
+def _fetch_dicts(db: Session):
+    return lambda statement: [dict(row) for row in db.execute(statement).mappings()]
+
+
+def fetch_fields(db: Session, model, fields, limit=None, after=None, criteria=()):
+    """Return a page of plain dicts holding only the requested columns."""
+    statement = select_fields(model, fields).where(*criteria)
+    return paginate(statement, inspect(model).columns["id"], limit, after, fetch=_fetch_dicts(db))
+
+
+def fetch_fields_by_id(db: Session, model, object_id: int, fields):
+    """Return the requested columns of one row as a dict, or None if it does not exist."""
+    statement = select_fields(model, fields).where(inspect(model).columns["id"] == object_id)
+    rows = _fetch_dicts(db)(statement)
+    return rows[0] if rows else None
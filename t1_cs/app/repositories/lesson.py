@@ -1,21 +1,56 @@
+from datetime import timedelta
+from sqlalchemy import inspect, or_
 from sqlalchemy.orm import Session
 from app.models.lesson import Lesson
-from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.models.class_model import Class
+from app.models.room import Room
+from app.models.discipline import Discipline
+from app.schemas.lesson import LessonCreate, LessonUpdate, LessonResponse, LessonFilter, LessonMaterialize, LessonMaterializeResult
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.fieldsets import fetch_fields, fetch_fields_by_id
+from app.repositories.reservation import lesson_time_slot
+from app.repositories.bulk import bulk_insert, bulk_results, missing_references
 
 class LessonRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Lesson).all()
+    def _query(self, db: Session):
+        return db.query(Lesson).options(*build_loader_plan(Lesson, LessonResponse))
+
+    def _criteria(self, filters: LessonFilter = None):
+        criteria = []
+        if filters is None:
+            return criteria
+        if filters.date_from is not None:
+            criteria.append(Lesson.date >= filters.date_from)
+        if filters.date_to is not None:
+            criteria.append(Lesson.date <= filters.date_to)
+        if filters.room_id is not None:
+            criteria.append(Lesson.room_id == filters.room_id)
+        if filters.class_id is not None:
+            criteria.append(Lesson.class_id == filters.class_id)
+        return criteria
+
+    def get_all(self, db: Session, limit: int = None, after: int = None, filters: LessonFilter = None):
+        return paginate(self._query(db).filter(*self._criteria(filters)), Lesson.id, limit, after)
 
     def get_by_id(self, db: Session, lesson_id: int):
-        return db.query(Lesson).filter(Lesson.id == lesson_id).first()
+        return self._query(db).filter(Lesson.id == lesson_id).first()
+
+    def get_fields(self, db: Session, fields: list[str], limit: int = None, after: int = None, filters: LessonFilter = None):
+        return fetch_fields(db, Lesson, fields, limit, after, self._criteria(filters))
+
+    def get_fields_by_id(self, db: Session, lesson_id: int, fields: list[str]):
+        return fetch_fields_by_id(db, Lesson, lesson_id, fields)
 
     def create(self, db: Session, lesson: LessonCreate):
         db_lesson = Lesson(
             date=lesson.date,
             attendance=lesson.attendance,
+            start_time=lesson.start_time,
+            end_time=lesson.end_time,
             class_id=lesson.class_id,
             room_id=lesson.room_id,
             discipline_id=lesson.discipline_id,
@@ -25,14 +60,81 @@ class LessonRepository:
         db.refresh(db_lesson)
         return db_lesson
 
-    def update(self, db: Session, lesson_id: int, lesson_update: LessonUpdate):
+    def create_bulk(self, db: Session, lessons: list[LessonCreate]):
+        errors = missing_references(db, lessons, {"class_id": Class.id, "room_id": Room.id, "discipline_id": Discipline.id})
+        valid = [index for index in range(len(lessons)) if index not in errors]
+        ids = bulk_insert(db, Lesson, [lessons[index].dict() for index in valid])
+        db.commit()
+        return bulk_results(len(lessons), errors, dict(zip(valid, ids)))
+
+    def materialize(self, db: Session, class_obj: Class, request: LessonMaterialize):
+        """Insert one lesson per weekly slot of the class between the two dates, in a single executemany."""
+        holidays = set(request.holidays)
+        existing = set(
+            db.query(Lesson.date, Lesson.start_time).filter(
+                Lesson.class_id == class_obj.id,
+                Lesson.date >= request.start_date,
+                Lesson.date <= request.end_date,
+            )
+        )
+        rows = []
+        skipped_holidays = skipped_existing = 0
+        day = request.start_date
+        while day <= request.end_date:
+            for slot in class_obj.schedules:
+                if slot.weekday != day.weekday():
+                    continue
+                if day in holidays:
+                    skipped_holidays += 1
+                elif (day, slot.start_time) in existing:
+                    skipped_existing += 1
+                else:
+                    rows.append({
+                        "date": day,
+                        "start_time": slot.start_time,
+                        "end_time": slot.end_time,
+                        "class_id": class_obj.id,
+                        "room_id": request.room_id,
+                        "discipline_id": class_obj.discipline_id,
+                    })
+            day += timedelta(days=1)
+
+        bulk_insert(db, Lesson, rows)
+        db.commit()
+        return LessonMaterializeResult(created=len(rows), skipped_holidays=skipped_holidays, skipped_existing=skipped_existing)
+
+    def apply_update(self, db: Session, lesson_id: int, lesson_update: LessonUpdate):
+        """Load the lesson and apply `lesson_update` to it without committing; None if it does not exist."""
         db_lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
         if db_lesson:
             for key, value in lesson_update.dict(exclude_unset=True).items():
                 setattr(db_lesson, key, value)
-            db.commit()
-            db.refresh(db_lesson)
-        return db_lesson 
+        return db_lesson
+
+    def is_moved(self, lesson: Lesson):
+        """Whether the pending changes give the lesson another room, date or time slot."""
+        attrs = inspect(lesson).attrs
+        return any(attrs[name].history.has_changes() for name in ("room_id", "date", "start_time", "end_time"))
+
+    def has_room_conflict(self, db: Session, lesson: Lesson):
+        """Whether another lesson in the lesson's room overlaps its time slot; untimed lessons take the whole day."""
+        day, start_time, end_time = lesson_time_slot(lesson)
+        conflict = db.query(Lesson.id).filter(
+            Lesson.room_id == lesson.room_id,
+            Lesson.date == day,
+            Lesson.id != lesson.id,
+            or_(
+                Lesson.start_time.is_(None),
+                Lesson.end_time.is_(None),
+                (Lesson.start_time < end_time) & (Lesson.end_time > start_time),
+            ),
+        ).first()
+        return conflict is not None
+
+    def save(self, db: Session, db_lesson: Lesson):
+        db.commit()
+        db.refresh(db_lesson)
+        return db_lesson
 
     def delete(self, db: Session, lesson_id: int):
         db_lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
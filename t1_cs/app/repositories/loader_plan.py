@@ -0,0 +1,72 @@
+import typing
+from functools import lru_cache
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def _nested_schema(annotation):
+    # Unwraps list[X], List[X] and Optional[X] down to the pydantic model, if any
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        schema = _nested_schema(arg)
+        if schema is not None:
+            return schema
+    return None
+
+
+@lru_cache(maxsize=None)
+def build_loader_plan(model, schema):
+    """
+    Build the eager-loading options needed to serialize `model` as `schema`.
+
+    Walks the fields of the response schema and, for each one backed by a
+    relationship on the model, adds a loader for it (joinedload for
+    many-to-one, selectinload for collections) and recurses into the nested
+    response schema. The resulting plan loads the whole response graph in a
+    fixed number of queries, independent of the number of rows.
+
+    Plans are built once per (model, schema) pair and reused afterwards.
+    """
+    mapper = inspect(model)
+    options = []
+    for name, field in schema.model_fields.items():
+        relationship = mapper.relationships.get(name)
+        if relationship is None:
+            continue
+
+        attribute = getattr(model, name)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+
+        nested = _nested_schema(field.annotation)
+        if nested is not None:
+            nested_options = build_loader_plan(relationship.mapper.class_, nested)
+            if nested_options:
+                loader = loader.options(*nested_options)
+        options.append(loader)
+    return tuple(options)
+
+
+@lru_cache(maxsize=None)
+def response_tables(model, schema):
+    """
+    Names of the tables whose rows can appear when `model` is serialized as `schema`.
+
+    Follows the same relationships as build_loader_plan, including the
+    association tables of many-to-many relationships.
+    """
+    mapper = inspect(model)
+    tables = {mapper.local_table.name}
+    for name, field in schema.model_fields.items():
+        relationship = mapper.relationships.get(name)
+        if relationship is None:
+            continue
+        if relationship.secondary is not None:
+            tables.add(relationship.secondary.name)
+        nested = _nested_schema(field.annotation)
+        if nested is not None:
+            tables |= response_tables(relationship.mapper.class_, nested)
+        else:
+            tables.add(relationship.mapper.local_table.name)
+    return frozenset(tables)
@@ -0,0 +1,44 @@
+class Page(list):
+    """
+    One page of a keyset-paginated listing.
+
+    Behaves like the plain list of rows it wraps; `next_cursor` is the id to
+    pass as `after` to fetch the following page, or None on the last page.
+    """
+
+    def __init__(self, rows=(), next_cursor=None):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+
+def _row_id(row, key):
+    return row[key] if isinstance(row, dict) else getattr(row, key)
+
+
+def paginate(query, id_column, limit=None, after=None, fetch=None):
+    """
+    Apply keyset pagination on `id_column` to a query.
+
+    Rows are ordered by id and filtered with `id > after`, so every page is an
+    index range scan no matter how deep the client has paged. One extra row is
+    fetched to tell whether a next page exists. Without a limit the whole
+    (ordered) result is returned as a single page.
+
+    `query` may be an ORM Query or a Core select(); for the latter pass a
+    `fetch` callable that executes the statement and returns its rows.
+    """
+    if fetch is None:
+        fetch = lambda statement: statement.all()
+
+    if after is not None:
+        query = query.filter(id_column > after)
+    query = query.order_by(id_column)
+
+    if limit is None:
+        return Page(fetch(query))
+
+    rows = fetch(query.limit(limit + 1))
+    if len(rows) <= limit:
+        return Page(rows)
+    rows = rows[:limit]
+    return Page(rows, next_cursor=_row_id(rows[-1], id_column.key))
@@ -1,16 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.profile import Profile
-from app.schemas.profile import ProfileCreate
+from app.schemas.profile import ProfileCreate, ProfileResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 
 class ProfileRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Profile).all()
+    def _query(self, db: Session):
+        return db.query(Profile).options(*build_loader_plan(Profile, ProfileResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Profile.id, limit, after)
 
     def get_by_id(self, db: Session, profile_id: int):
-        return db.query(Profile).filter(Profile.id == profile_id).first()
+        return self._query(db).filter(Profile.id == profile_id).first()
 
     def create(self, db: Session, profile_data: ProfileCreate):
         db_profile = Profile(**profile_data.dict())
@@ -1,30 +1,115 @@
+from datetime import time
 from sqlalchemy.orm import Session
+from app.models.lesson import Lesson
 from app.models.reservation import Reservation
-from app.schemas.reservation import ReservationCreate
+from app.models.resource import Resource
+from app.schemas.reservation import ReservationCreate, ReservationResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.bulk import bulk_insert
+
+DAY_START = time(0, 0)
+DAY_END = time(23, 59, 59)
+
+
+def lesson_time_slot(lesson: Lesson):
+    """Return the (date, start_time, end_time) a lesson occupies; untimed lessons take the whole day."""
+    if lesson.start_time is None or lesson.end_time is None:
+        return lesson.date, DAY_START, DAY_END
+    return lesson.date, lesson.start_time, lesson.end_time
+
 
 class ReservationRepository:
     def __init__(self):
         pass
 
-    def create(self, db: Session, reservation: ReservationCreate):
+    def _query(self, db: Session):
+        return db.query(Reservation).options(*build_loader_plan(Reservation, ReservationResponse))
+
+    def create(self, db: Session, reservation: ReservationCreate, lesson: Lesson):
+        day, start_time, end_time = lesson_time_slot(lesson)
         db_reservation = Reservation(
             lesson_id=reservation.lesson_id,
             resource_id=reservation.resource_id,
             observation=reservation.observation,
+            date=day,
+            start_time=start_time,
+            end_time=end_time,
         )
         db.add(db_reservation)
         db.commit()
         db.refresh(db_reservation)
         return db_reservation
 
-    def get_all(self, db: Session):
-        return db.query(Reservation).all()
+    def create_bulk(self, db: Session, reservations: list[ReservationCreate], lessons: list[Lesson]):
+        rows = []
+        for reservation, lesson in zip(reservations, lessons):
+            day, start_time, end_time = lesson_time_slot(lesson)
+            rows.append({
+                "lesson_id": reservation.lesson_id,
+                "resource_id": reservation.resource_id,
+                "observation": reservation.observation,
+                "date": day,
+                "start_time": start_time,
+                "end_time": end_time,
+            })
+        return bulk_insert(db, Reservation, rows)
+
+    def get_booked_slots(self, db: Session, resource_ids, days):
+        """Return {(resource_id, date): [(start_time, end_time), ...]} for the given resources and days."""
+        booked = {}
+        rows = db.query(Reservation.resource_id, Reservation.date, Reservation.start_time, Reservation.end_time).filter(
+            Reservation.resource_id.in_(set(resource_ids)),
+            Reservation.date.in_(set(days)),
+        )
+        for resource_id, day, start_time, end_time in rows:
+            booked.setdefault((resource_id, day), []).append((start_time, end_time))
+        return booked
+
+    def has_conflict(self, db: Session, resource_id: int, day, start_time, end_time):
+        # Two slots overlap when each one starts before the other ends
+        conflict = db.query(Reservation.id).filter(
+            Reservation.resource_id == resource_id,
+            Reservation.date == day,
+            Reservation.start_time < end_time,
+            Reservation.end_time > start_time,
+        ).first()
+        return conflict is not None
+
+    def has_lesson_conflict(self, db: Session, lesson: Lesson):
+        """Whether a resource reserved for the lesson is reserved by another lesson overlapping its time slot."""
+        day, start_time, end_time = lesson_time_slot(lesson)
+        reserved = db.query(Reservation.resource_id).filter(Reservation.lesson_id == lesson.id)
+        conflict = db.query(Reservation.id).filter(
+            Reservation.resource_id.in_(reserved.scalar_subquery()),
+            Reservation.lesson_id != lesson.id,
+            Reservation.date == day,
+            Reservation.start_time < end_time,
+            Reservation.end_time > start_time,
+        ).first()
+        return conflict is not None
+
+    def get_reserved_resource_versions(self, db: Session, lesson_id: int):
+        """[(resource_id, version), ...] of the resources reserved for the lesson, in id order."""
+        return db.query(Resource.id, Resource.version).join(Reservation, Reservation.resource_id == Resource.id).filter(
+            Reservation.lesson_id == lesson_id,
+        ).distinct().order_by(Resource.id).all()
+
+    def reschedule_lesson(self, db: Session, lesson: Lesson):
+        day, start_time, end_time = lesson_time_slot(lesson)
+        db.query(Reservation).filter(Reservation.lesson_id == lesson.id).update(
+            {"date": day, "start_time": start_time, "end_time": end_time},
+            synchronize_session=False,
+        )
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), Reservation.id, limit, after)
 
     def get_by_id(self, db: Session, reservation_id: int):
-        return db.query(Reservation).filter(Reservation.id == reservation_id).first()
+        return self._query(db).filter(Reservation.id == reservation_id).first()
 
     def delete(self, db: Session, reservation_id: int):
-        db_reservation = self.get_by_id(db, reservation_id)
+        db_reservation = db.query(Reservation).filter(Reservation.id == reservation_id).first()
         if db_reservation:
             db.delete(db_reservation)
             db.commit()
@@ -1,16 +1,53 @@
 from sqlalchemy.orm import Session
 from app.models.resource import Resource
-from app.schemas.resource import ResourceCreate, ResourceUpdate
+from app.models.resource_type import ResourceType
+from app.schemas.resource import ResourceCreate, ResourceUpdate, ResourceResponse, ResourceFilter
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.fieldsets import fetch_fields, fetch_fields_by_id
+from app.repositories.bulk import bulk_insert, bulk_results, missing_references
 
 class ResourceRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Resource).all()
+    def _query(self, db: Session):
+        return db.query(Resource).options(*build_loader_plan(Resource, ResourceResponse))
+
+    def _criteria(self, filters: ResourceFilter = None):
+        criteria = []
+        if filters is None:
+            return criteria
+        if filters.status is not None:
+            criteria.append(Resource.status == filters.status)
+        if filters.resource_type_id is not None:
+            criteria.append(Resource.resource_type_id == filters.resource_type_id)
+        return criteria
+
+    def get_all(self, db: Session, limit: int = None, after: int = None, filters: ResourceFilter = None):
+        return paginate(self._query(db).filter(*self._criteria(filters)), Resource.id, limit, after)
 
     def get_by_id(self, db: Session, resource_id: int):
-        return db.query(Resource).filter(Resource.id == resource_id).first()
+        return self._query(db).filter(Resource.id == resource_id).first()
+
+    def get_fields(self, db: Session, fields: list[str], limit: int = None, after: int = None, filters: ResourceFilter = None):
+        return fetch_fields(db, Resource, fields, limit, after, self._criteria(filters))
+
+    def get_fields_by_id(self, db: Session, resource_id: int, fields: list[str]):
+        return fetch_fields_by_id(db, Resource, resource_id, fields)
+
+    def claim(self, db: Session, resource_id: int, expected_version: int):
+        """
+        Bump the resource version if it still matches `expected_version`.
+
+        Returns False when another transaction changed the resource since it
+        was read. The UPDATE also locks the row until the caller commits.
+        """
+        updated = db.query(Resource).filter(
+            Resource.id == resource_id,
+            Resource.version == expected_version,
+        ).update({Resource.version: Resource.version + 1}, synchronize_session=False)
+        return updated == 1
 
     def create(self, db: Session, resource: ResourceCreate):
         db_resource = Resource(**resource.dict())
@@ -19,6 +56,13 @@ class ResourceRepository:
         db.refresh(db_resource)
         return db_resource
 
+    def create_bulk(self, db: Session, resources: list[ResourceCreate]):
+        errors = missing_references(db, resources, {"resource_type_id": ResourceType.id})
+        valid = [index for index in range(len(resources)) if index not in errors]
+        ids = bulk_insert(db, Resource, [resources[index].dict() for index in valid])
+        db.commit()
+        return bulk_results(len(resources), errors, dict(zip(valid, ids)))
+
     def delete(self, db: Session, resource_id: int):
         db_resource = db.query(Resource).filter(Resource.id == resource_id).first()
         if db_resource:
@@ -1,16 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.resource_type import ResourceType
-from app.schemas.resource_type import ResourceTypeCreate, ResourceTypeUpdate
+from app.schemas.resource_type import ResourceTypeCreate, ResourceTypeUpdate, ResourceTypeResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
 
 class ResourceTypeRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(ResourceType).all()
+    def _query(self, db: Session):
+        return db.query(ResourceType).options(*build_loader_plan(ResourceType, ResourceTypeResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), ResourceType.id, limit, after)
 
     def get_by_id(self, db: Session, resource_type_id: int):
-        return db.query(ResourceType).filter(ResourceType.id == resource_type_id).first()
+        return self._query(db).filter(ResourceType.id == resource_type_id).first()
 
     def create(self, db: Session, resource_type: ResourceTypeCreate):
         db_resource_type = ResourceType(**resource_type.dict())
@@ -1,18 +1,63 @@
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from app.models.room import Room
+from app.models.room import Room, room_resource_association
 from app.models.resource import Resource
-from app.schemas.room import RoomCreate, RoomUpdate
+from app.models.lesson import Lesson
+from app.models.building import Building
+from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse, RoomFilter, RoomAvailabilityFilter
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.fieldsets import fetch_fields, fetch_fields_by_id
+from app.repositories.bulk import bulk_insert, bulk_results, missing_references
 
 
 class RoomRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(Room).all()
+    def _query(self, db: Session):
+        return db.query(Room).options(*build_loader_plan(Room, RoomResponse))
+
+    def _criteria(self, filters: RoomFilter = None):
+        criteria = []
+        if filters is None:
+            return criteria
+        if filters.building_id is not None:
+            criteria.append(Room.building_id == filters.building_id)
+        if filters.min_capacity is not None:
+            criteria.append(Room.capacity >= filters.min_capacity)
+        return criteria
+
+    def get_all(self, db: Session, limit: int = None, after: int = None, filters: RoomFilter = None):
+        return paginate(self._query(db).filter(*self._criteria(filters)), Room.id, limit, after)
+
+    def get_available(self, db: Session, filters: RoomAvailabilityFilter, limit: int = None, after: int = None):
+        # Anti-join against the day's lessons, served by ix_lessons_room_id_date
+        booked = select(Lesson.id).where(Lesson.room_id == Room.id, Lesson.date == filters.date).exists()
+        query = self._query(db).filter(~booked, *self._criteria(filters))
+
+        if filters.resource_type_id is not None:
+            equipped = (
+                select(room_resource_association.c.resource_id)
+                .join(Resource, Resource.id == room_resource_association.c.resource_id)
+                .where(
+                    room_resource_association.c.room_id == Room.id,
+                    Resource.resource_type_id == filters.resource_type_id,
+                )
+                .exists()
+            )
+            query = query.filter(equipped)
+
+        return paginate(query, Room.id, limit, after)
 
     def get_by_id(self, db: Session, room_id: int):
-        return db.query(Room).filter(Room.id == room_id).first()
+        return self._query(db).filter(Room.id == room_id).first()
+
+    def get_fields(self, db: Session, fields: list[str], limit: int = None, after: int = None, filters: RoomFilter = None):
+        return fetch_fields(db, Room, fields, limit, after, self._criteria(filters))
+
+    def get_fields_by_id(self, db: Session, room_id: int, fields: list[str]):
+        return fetch_fields_by_id(db, Room, room_id, fields)
 
     def create(self, db: Session, room: RoomCreate):
         db_room = Room(
@@ -31,6 +76,27 @@ class RoomRepository:
         db.refresh(db_room)
         return db_room
 
+    def create_bulk(self, db: Session, rooms: list[RoomCreate]):
+        errors = missing_references(db, rooms, {"building_id": Building.id})
+        wanted = {resource_id for room in rooms for resource_id in room.resource_ids}
+        existing = set(db.scalars(select(Resource.id).where(Resource.id.in_(wanted))))
+        for index, room in enumerate(rooms):
+            missing = [resource_id for resource_id in room.resource_ids if resource_id not in existing]
+            if missing and index not in errors:
+                errors[index] = f"resource_ids {missing} do not exist"
+
+        valid = [index for index in range(len(rooms)) if index not in errors]
+        ids = bulk_insert(db, Room, [rooms[index].dict(exclude={"resource_ids"}) for index in valid])
+        links = [
+            {"room_id": room_id, "resource_id": resource_id}
+            for index, room_id in zip(valid, ids)
+            for resource_id in set(rooms[index].resource_ids)
+        ]
+        if links:
+            db.execute(insert(room_resource_association), links)
+        db.commit()
+        return bulk_results(len(rooms), errors, dict(zip(valid, ids)))
+
     def update(self, db: Session, room_id: int, room_update: RoomUpdate):
         db_room = self.get_by_id(db, room_id)
         if not db_room:
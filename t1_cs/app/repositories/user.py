@@ -1,17 +1,29 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.profile import Profile
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.repositories.loader_plan import build_loader_plan
+from app.repositories.pagination import paginate
+from app.repositories.fieldsets import fetch_fields, fetch_fields_by_id
 
 class UserRepository:
     def __init__(self):
         pass
 
-    def get_all(self, db: Session):
-        return db.query(User).all()
+    def _query(self, db: Session):
+        return db.query(User).options(*build_loader_plan(User, UserResponse))
+
+    def get_all(self, db: Session, limit: int = None, after: int = None):
+        return paginate(self._query(db), User.id, limit, after)
 
     def get_by_id(self, db: Session, user_id: int):
-        return db.query(User).filter(User.id == user_id).first()
+        return self._query(db).filter(User.id == user_id).first()
+
+    def get_fields(self, db: Session, fields: list[str], limit: int = None, after: int = None):
+        return fetch_fields(db, User, fields, limit, after)
+
+    def get_fields_by_id(self, db: Session, user_id: int, fields: list[str]):
+        return fetch_fields_by_id(db, User, user_id, fields)
 
     def create(self, db: Session, user: UserCreate):
         profile = db.query(Profile).get(user.profile_id)
@@ -1,17 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.class_service import ClassService
+from app.models.class_model import Class
 from app.schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
-from app.dependencies.permissions import require_coordinator
-from app.services.user import UserService
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.schemas.lesson import LessonMaterialize, LessonMaterializeResult
+from app.dependencies.permissions import coordinator_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.response_cache import CachedList, cached_list
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
+from app.dependencies.fieldsets import SparseFields
 
 class ClassRouter:
     def __init__(self):
@@ -20,37 +18,31 @@ class ClassRouter:
         self.service = ClassService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[ClassResponse])
-        def get_classes(db: Session = Depends(get_db)):
-            return self.service.get_all_classes(db)
+        @self.router.get("/", response_model=list[ClassResponse], dependencies=[Depends(etag(Class, ClassResponse))])
+        async def get_classes(pagination: Pagination = Depends(), sparse: SparseFields = Depends(), cache: CachedList = Depends(cached_list(Class, ClassResponse)), db: ReadSession = Depends(get_read_db)):
+            cached = cache.hit()
+            if cached is not None:
+                return cached
+            classes = pagination.page(await run_db(db, self.service.get_all_classes, pagination.limit, pagination.after, sparse.fields))
+            return cache.keep(sparse.render(classes)) if sparse.fields else cache.render(classes)
 
-        @self.router.get("/{class_id}", response_model=ClassResponse)
-        def get_class_by_id(class_id: int, db: Session = Depends(get_db)):
-            return self.service.get_class_by_id(db, class_id)
+        @self.router.get("/{class_id}", response_model=ClassResponse, dependencies=[Depends(etag(Class, ClassResponse))])
+        async def get_class_by_id(class_id: int, sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            class_obj = await run_db(db, self.service.get_class_by_id, class_id, sparse.fields)
+            return sparse.render(class_obj) if sparse.fields else class_obj
 
-        @self.router.post("/{user_id}", response_model=ClassResponse)
+        @self.router.post("/{user_id}", response_model=ClassResponse, dependencies=[Depends(coordinator_required)])
         def create_class(user_id: int, class_data: ClassCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.create_class(db, class_data)
 
-        @self.router.put("/{class_id}/{user_id}", response_model=ClassResponse, dependencies=[Depends(require_coordinator)])
+        @self.router.post("/{class_id}/lessons/materialize/{user_id}", response_model=LessonMaterializeResult, dependencies=[Depends(coordinator_required)])
+        def materialize_lessons(class_id: int, user_id: int, request: LessonMaterialize, db: Session = Depends(get_db)):
+            return self.service.materialize_lessons(db, class_id, request)
+
+        @self.router.put("/{class_id}/{user_id}", response_model=ClassResponse, dependencies=[Depends(coordinator_required)])
         def update_class(class_id: int, user_id: int, class_update: ClassUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.update_class(db, class_id, class_update)
 
-        @self.router.delete("/{class_id}/{user_id}", dependencies=[Depends(require_coordinator)])
+        @self.router.delete("/{class_id}/{user_id}", dependencies=[Depends(coordinator_required)])
         def delete_class(class_id: int, user_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.delete_class(class_id, user_id, db)
@@ -1,19 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.curriculum import CurriculumService
+from app.models.curriculum import Curriculum
 from app.schemas.curriculum import CurriculumCreate, CurriculumResponse, CurriculumUpdate
-from app.dependencies.permissions import require_coordinator
-from app.services.user import UserService
+from app.dependencies.permissions import coordinator_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.response_cache import CachedList, cached_list
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 class CurriculumRouter:
     def __init__(self):
         self.router = APIRouter(prefix="/curriculums", tags=["Curriculums"])
@@ -21,38 +17,26 @@ class CurriculumRouter:
         self.service = CurriculumService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[CurriculumResponse])
-        def get_curriculums(db: Session = Depends(get_db)):
-            return self.service.get_all_curriculums(db)
-
-        @self.router.get("/{curriculum_id}", response_model=CurriculumResponse)
-        def get_curriculum(curriculum_id: int, db: Session = Depends(get_db)):
-            curriculum = self.service.get_curriculum_by_id(db, curriculum_id)
+        @self.router.get("/", response_model=list[CurriculumResponse], dependencies=[Depends(etag(Curriculum, CurriculumResponse))])
+        async def get_curriculums(pagination: Pagination = Depends(), cache: CachedList = Depends(cached_list(Curriculum, CurriculumResponse)), db: ReadSession = Depends(get_read_db)):
+            cached = cache.hit()
+            if cached is not None:
+                return cached
+            return cache.render(pagination.page(await run_db(db, self.service.get_all_curriculums, pagination.limit, pagination.after)))
+
+        @self.router.get("/{curriculum_id}", response_model=CurriculumResponse, dependencies=[Depends(etag(Curriculum, CurriculumResponse))])
+        async def get_curriculum(curriculum_id: int, db: ReadSession = Depends(get_read_db)):
+            curriculum = await run_db(db, self.service.get_curriculum_by_id, curriculum_id)
             return curriculum
 
-        @self.router.post("/{user_id}", response_model=CurriculumResponse)
+        @self.router.post("/{user_id}", response_model=CurriculumResponse, dependencies=[Depends(coordinator_required)])
         def create_curriculum(user_id: int, curriculum: CurriculumCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.create_curriculum(db, curriculum)
 
-        @self.router.put("/{curriculum_id}/{user_id}", response_model=CurriculumResponse)
+        @self.router.put("/{curriculum_id}/{user_id}", response_model=CurriculumResponse, dependencies=[Depends(coordinator_required)])
         def update_curriculum(user_id: int, curriculum_id: int, curriculum_update: CurriculumUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.update_curriculum(db, curriculum_id, curriculum_update)
 
-        @self.router.delete("/{curriculum_id}/{user_id}")
+        @self.router.delete("/{curriculum_id}/{user_id}", dependencies=[Depends(coordinator_required)])
         def delete_curriculum(user_id: int, curriculum_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.delete_curriculum(db, curriculum_id)
@@ -1,17 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.discipline import DisciplineService
+from app.models.discipline import Discipline
 from app.schemas.discipline import DisciplineCreate, DisciplineUpdate, DisciplineResponse
-from app.services.user import UserService
-from app.dependencies.permissions import require_coordinator
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.dependencies.permissions import coordinator_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.response_cache import CachedList, cached_list
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
 
 class DisciplineRouter:
     def __init__(self):
@@ -20,37 +16,25 @@ class DisciplineRouter:
         self.service = DisciplineService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[DisciplineResponse])
-        def get_disciplines(db: Session = Depends(get_db)):
-            return self.service.get_all_disciplines(db)
+        @self.router.get("/", response_model=list[DisciplineResponse], dependencies=[Depends(etag(Discipline, DisciplineResponse))])
+        async def get_disciplines(pagination: Pagination = Depends(), cache: CachedList = Depends(cached_list(Discipline, DisciplineResponse)), db: ReadSession = Depends(get_read_db)):
+            cached = cache.hit()
+            if cached is not None:
+                return cached
+            return cache.render(pagination.page(await run_db(db, self.service.get_all_disciplines, pagination.limit, pagination.after)))
 
-        @self.router.get("/{discipline_id}", response_model=DisciplineResponse)
-        def get_discipline(discipline_id: int, db: Session = Depends(get_db)):
-            return self.service.get_discipline_by_id(db, discipline_id)
+        @self.router.get("/{discipline_id}", response_model=DisciplineResponse, dependencies=[Depends(etag(Discipline, DisciplineResponse))])
+        async def get_discipline(discipline_id: int, db: ReadSession = Depends(get_read_db)):
+            return await run_db(db, self.service.get_discipline_by_id, discipline_id)
 
-        @self.router.post("/{user_id}", response_model=DisciplineResponse)
+        @self.router.post("/{user_id}", response_model=DisciplineResponse, dependencies=[Depends(coordinator_required)])
         def create_discipline(user_id: int, discipline: DisciplineCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.create_discipline(db, discipline)
 
-        @self.router.put("/{discipline_id}/{user_id}", response_model=DisciplineResponse)
+        @self.router.put("/{discipline_id}/{user_id}", response_model=DisciplineResponse, dependencies=[Depends(coordinator_required)])
         def update_discipline(discipline_id: int, user_id: int, discipline_update: DisciplineUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.update_discipline(db, discipline_id, discipline_update)
 
-        @self.router.delete("/{discipline_id}/{user_id}")
+        @self.router.delete("/{discipline_id}/{user_id}", dependencies=[Depends(coordinator_required)])
         def delete_discipline(discipline_id: int, user_id:int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_coordinator(user)
             return self.service.delete_discipline(db, discipline_id)
@@ -1,17 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.lesson import LessonService
-from app.schemas.lesson import LessonCreate, LessonResponse, LessonUpdate
-from app.dependencies.permissions import require_professor
-from app.services.user import UserService
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.models.lesson import Lesson
+from app.schemas.lesson import LessonCreate, LessonResponse, LessonUpdate, LessonFilter
+from app.dependencies.permissions import professor_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
+from app.dependencies.fieldsets import SparseFields
+from app.schemas.bulk import BulkResult
+from app.repositories.bulk import MAX_BULK_ITEMS
 
 class LessonRouter:
     def __init__(self):
@@ -20,37 +18,28 @@ class LessonRouter:
         self.service = LessonService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[LessonResponse])
-        def get_lessons(db: Session = Depends(get_db)):
-            return self.service.get_all_lessons(db)
+        @self.router.get("/", response_model=list[LessonResponse], dependencies=[Depends(etag(Lesson, LessonResponse))])
+        async def get_lessons(filters: LessonFilter = Depends(), pagination: Pagination = Depends(), sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            lessons = pagination.page(await run_db(db, self.service.get_all_lessons, pagination.limit, pagination.after, sparse.fields, filters))
+            return sparse.render(lessons) if sparse.fields else lessons
+
+        @self.router.get("/{lesson_id}", response_model=LessonResponse, dependencies=[Depends(etag(Lesson, LessonResponse))])
+        async def get_lesson(lesson_id: int, sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            lesson = await run_db(db, self.service.get_lesson_by_id, lesson_id, sparse.fields)
+            return sparse.render(lesson) if sparse.fields else lesson
 
-        @self.router.get("/{lesson_id}", response_model=LessonResponse)
-        def get_lesson(lesson_id: int, db: Session = Depends(get_db)):
-            return self.service.get_lesson_by_id(db, lesson_id)
+        @self.router.post("/bulk/{user_id}", response_model=BulkResult, dependencies=[Depends(professor_required)])
+        def create_lessons_bulk(user_id: int, lessons: list[LessonCreate] = Body(..., max_length=MAX_BULK_ITEMS), db: Session = Depends(get_db)):
+            return self.service.create_lessons_bulk(db, lessons)
 
-        @self.router.post("/{user_id}", response_model=LessonResponse)
+        @self.router.post("/{user_id}", response_model=LessonResponse, dependencies=[Depends(professor_required)])
         def create_lesson(user_id: int, lesson: LessonCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_professor(user)
             return self.service.create_lesson(db, lesson)
         
-        @self.router.put("/{lesson_id}/{user_id}", response_model=LessonResponse)
+        @self.router.put("/{lesson_id}/{user_id}", response_model=LessonResponse, dependencies=[Depends(professor_required)])
         def update_lesson(lesson_id: int, user_id: int, lesson:LessonUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_professor(user)
             return self.service.update_lesson(db, lesson_id, lesson)
 
-        @self.router.delete("/{lesson_id}/{user_id}")
+        @self.router.delete("/{lesson_id}/{user_id}", dependencies=[Depends(professor_required)])
         def delete_lesson(lesson_id: int, user_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_professor(user)
             return self.service.delete_lesson(db, lesson_id)
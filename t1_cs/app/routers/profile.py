@@ -1,17 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.profile import ProfileService
+from app.models.profile import Profile
 from app.schemas.profile import ProfileCreate, ProfileResponse
-from app.dependencies.permissions import require_admin
-from app.services.user import UserService
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.dependencies.permissions import admin_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
 
 
 class ProfileRouter:
@@ -21,37 +16,22 @@ class ProfileRouter:
         self.service = ProfileService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[ProfileResponse])
-        def get_profiles(db: Session = Depends(get_db)):
-            return self.service.get_all_profiles(db)
+        @self.router.get("/", response_model=list[ProfileResponse], dependencies=[Depends(etag(Profile, ProfileResponse))])
+        async def get_profiles(pagination: Pagination = Depends(), db: ReadSession = Depends(get_read_db)):
+            return pagination.page(await run_db(db, self.service.get_all_profiles, pagination.limit, pagination.after))
 
-        @self.router.get("/{profile_id}", response_model=ProfileResponse)
-        def get_profile(profile_id: int, db: Session = Depends(get_db)):
-            return self.service.get_profile_by_id(db, profile_id)
+        @self.router.get("/{profile_id}", response_model=ProfileResponse, dependencies=[Depends(etag(Profile, ProfileResponse))])
+        async def get_profile(profile_id: int, db: ReadSession = Depends(get_read_db)):
+            return await run_db(db, self.service.get_profile_by_id, profile_id)
 
-        @self.router.post("/{user_id}", response_model=ProfileResponse)
+        @self.router.post("/{user_id}", response_model=ProfileResponse, dependencies=[Depends(admin_required)])
         def create_profile(user_id: int, profile: ProfileCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.create_profile(db, profile)
 
-        @self.router.put("/{profile_id}/{user_id}", response_model=ProfileResponse)
+        @self.router.put("/{profile_id}/{user_id}", response_model=ProfileResponse, dependencies=[Depends(admin_required)])
         def update_profile(profile_id: int, user_id: int,  profile_update: ProfileCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.update_profile(db, profile_id, profile_update)
 
-        @self.router.delete("/{profile_id}/{user_id}", status_code=204)
+        @self.router.delete("/{profile_id}/{user_id}", status_code=204, dependencies=[Depends(admin_required)])
         def delete_profile(profile_id: int, user_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.delete_profile(db, profile_id)
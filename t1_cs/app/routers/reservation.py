@@ -1,17 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.reservation import ReservationService
+from app.models.reservation import Reservation
 from app.schemas.reservation import ReservationCreate,  ReservationResponse
-from app.services.user import UserService
-from app.dependencies.permissions import require_professor
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.dependencies.permissions import professor_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
+from app.schemas.bulk import BulkResult
+from app.repositories.bulk import MAX_BULK_ITEMS
 
 class ReservationRouter:
     def __init__(self):
@@ -20,29 +17,23 @@ class ReservationRouter:
         self.service = ReservationService()
 
     def add_routes(self):
-        @self.router.post("/make_reservation/{user_id}", response_model=ReservationResponse)
+        @self.router.post("/make_reservation/{user_id}", response_model=ReservationResponse, dependencies=[Depends(professor_required)])
         def make_reservation(user_id: int, reservation: ReservationCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_professor(user)
             return self.service.make_reservation(db, reservation)
         
-        @self.router.delete("/cancel_reservation/{reservation_id}/{user_id}", response_model=dict)
+        @self.router.post("/bulk/{user_id}", response_model=BulkResult, dependencies=[Depends(professor_required)])
+        def make_reservations_bulk(user_id: int, reservations: list[ReservationCreate] = Body(..., max_length=MAX_BULK_ITEMS), db: Session = Depends(get_db)):
+            return self.service.make_reservations_bulk(db, reservations)
+
+        @self.router.delete("/cancel_reservation/{reservation_id}/{user_id}", response_model=dict, dependencies=[Depends(professor_required)])
         def cancel_reservation(user_id: int, reservation_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_professor(user)
             return self.service.cancel_reservation(db, reservation_id)
 
-        @self.router.get("/", response_model=list[ReservationResponse])
-        def get_all_reservations(db: Session = Depends(get_db)):
-            return self.service.get_all_reservations(db)
+        @self.router.get("/", response_model=list[ReservationResponse], dependencies=[Depends(etag(Reservation, ReservationResponse))])
+        async def get_all_reservations(pagination: Pagination = Depends(), db: ReadSession = Depends(get_read_db)):
+            return pagination.page(await run_db(db, self.service.get_all_reservations, pagination.limit, pagination.after))
 
-        @self.router.get("/{reservation_id}", response_model=ReservationResponse)
-        def get_reservation(reservation_id: int, db: Session = Depends(get_db)):
-            return self.service.get_reservation_by_id(db, reservation_id)
+        @self.router.get("/{reservation_id}", response_model=ReservationResponse, dependencies=[Depends(etag(Reservation, ReservationResponse))])
+        async def get_reservation(reservation_id: int, db: ReadSession = Depends(get_read_db)):
+            return await run_db(db, self.service.get_reservation_by_id, reservation_id)
 
@@ -1,17 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.resource import ResourceService
-from app.schemas.resource import ResourceCreate, ResourceResponse, ResourceUpdate
-from app.dependencies.permissions import require_admin
-from app.services.user import UserService
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.models.resource import Resource
+from app.schemas.resource import ResourceCreate, ResourceResponse, ResourceUpdate, ResourceFilter
+from app.dependencies.permissions import admin_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
+from app.dependencies.fieldsets import SparseFields
+from app.schemas.bulk import BulkResult
+from app.repositories.bulk import MAX_BULK_ITEMS
 
 class ResourceRouter:
     def __init__(self):
@@ -20,40 +18,28 @@ class ResourceRouter:
         self.service = ResourceService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[ResourceResponse])
-        def get_resources(db: Session = Depends(get_db)):
-            return self.service.get_all_resources(db)
+        @self.router.get("/", response_model=list[ResourceResponse], dependencies=[Depends(etag(Resource, ResourceResponse))])
+        async def get_resources(filters: ResourceFilter = Depends(), pagination: Pagination = Depends(), sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            resources = pagination.page(await run_db(db, self.service.get_all_resources, pagination.limit, pagination.after, sparse.fields, filters))
+            return sparse.render(resources) if sparse.fields else resources
+
+        @self.router.get("/{resource_id}", response_model=ResourceResponse, dependencies=[Depends(etag(Resource, ResourceResponse))])
+        async def get_resource_by_id(resource_id: int, sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            resource = await run_db(db, self.service.get_resource_by_id, resource_id, sparse.fields)
+            return sparse.render(resource) if sparse.fields else resource
 
-        @self.router.get("/{resource_id}", response_model=ResourceResponse)
-        def get_resource_by_id(resource_id: int, db: Session = Depends(get_db)):
-            resource = self.service.get_resource_by_id(db, resource_id)
-            if not resource:
-                raise HTTPException(status_code=404, detail="Resource not found")
-            return resource
+        @self.router.post("/bulk/{user_id}", response_model=BulkResult, dependencies=[Depends(admin_required)])
+        def create_resources_bulk(user_id: int, resources: list[ResourceCreate] = Body(..., max_length=MAX_BULK_ITEMS), db: Session = Depends(get_db)):
+            return self.service.create_resources_bulk(db, resources)
 
-        @self.router.post("/{user_id}", response_model=ResourceResponse)
+        @self.router.post("/{user_id}", response_model=ResourceResponse, dependencies=[Depends(admin_required)])
         def create_resource(user_id: int, resource: ResourceCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.create_resource(db, resource)
 
-        @self.router.put("/{resource_id}/{user_id}", response_model=ResourceResponse)
-        def update_resource(resource_id: int, user_id: int, resource: ResourceUpdate, db: Session = Depends(get_db), user = Depends(require_admin)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
+        @self.router.put("/{resource_id}/{user_id}", response_model=ResourceResponse, dependencies=[Depends(admin_required)])
+        def update_resource(resource_id: int, user_id: int, resource: ResourceUpdate, db: Session = Depends(get_db)):
             return self.service.update_resource(db, resource_id, resource)
 
-        @self.router.delete("/{resource_id}/{user_id}", response_model=dict)
-        def delete_resource(resource_id: int, user_id: int, db: Session = Depends(get_db), user = Depends(require_admin)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
+        @self.router.delete("/{resource_id}/{user_id}", response_model=dict, dependencies=[Depends(admin_required)])
+        def delete_resource(resource_id: int, user_id: int, db: Session = Depends(get_db)):
             return self.service.delete_resource(db, resource_id)
@@ -1,19 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.resource_type import ResourceTypeService
+from app.models.resource_type import ResourceType
 from app.schemas.resource_type import ResourceTypeCreate, ResourceTypeResponse, ResourceTypeUpdate
-from app.dependencies.permissions import require_admin
-from app.services.user import UserService
+from app.dependencies.permissions import admin_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
 
 # Função para obter a sessão do banco de dados
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 class ResourceTypeRouter:
     def __init__(self):
         self.router = APIRouter(prefix="/resource-types", tags=["Resource Types"])
@@ -21,38 +16,23 @@ class ResourceTypeRouter:
         self.service = ResourceTypeService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[ResourceTypeResponse])
-        def get_resource_types(db: Session = Depends(get_db)):
-            return self.service.get_all_resource_types(db)
+        @self.router.get("/", response_model=list[ResourceTypeResponse], dependencies=[Depends(etag(ResourceType, ResourceTypeResponse))])
+        async def get_resource_types(pagination: Pagination = Depends(), db: ReadSession = Depends(get_read_db)):
+            return pagination.page(await run_db(db, self.service.get_all_resource_types, pagination.limit, pagination.after))
 
-        @self.router.get("/{resource_type_id}", response_model=ResourceTypeResponse)
-        def get_resource_type(resource_type_id: int, db: Session = Depends(get_db)):
-            return self.service.get_resource_type_by_id(db, resource_type_id)
+        @self.router.get("/{resource_type_id}", response_model=ResourceTypeResponse, dependencies=[Depends(etag(ResourceType, ResourceTypeResponse))])
+        async def get_resource_type(resource_type_id: int, db: ReadSession = Depends(get_read_db)):
+            return await run_db(db, self.service.get_resource_type_by_id, resource_type_id)
 
-        @self.router.post("/{user_id}", response_model=ResourceTypeResponse)
+        @self.router.post("/{user_id}", response_model=ResourceTypeResponse, dependencies=[Depends(admin_required)])
         def create_resource_type(user_id: int, resource_type: ResourceTypeCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.create_resource_type(db, resource_type)
 
-        @self.router.put("/{resource_type_id}/{user_id}", response_model=ResourceTypeResponse)
+        @self.router.put("/{resource_type_id}/{user_id}", response_model=ResourceTypeResponse, dependencies=[Depends(admin_required)])
         def update_resource_type(user_id: int, resource_type_id: int, resource_type_update: ResourceTypeUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.update_resource_type(db, resource_type_id, resource_type_update)
 
-        @self.router.delete("/{resource_type_id}/{user_id}")
+        @self.router.delete("/{resource_type_id}/{user_id}", dependencies=[Depends(admin_required)])
         def delete_resource_type(resource_type_id: int, user_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.delete_resource_type(db, resource_type_id)
 
@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.services.room import RoomService
-from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse
-from app.dependencies.permissions import require_admin
-from app.services.user import UserService
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.models.room import Room
+from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse, RoomFilter, RoomAvailabilityFilter
+from app.dependencies.permissions import admin_required
+from app.dependencies.pagination import Pagination
+from app.dependencies.etag import etag
+from app.dependencies.response_cache import CachedList, cached_list
+from app.dependencies.database import ReadSession, get_db, get_read_db, run_db
+from app.dependencies.fieldsets import SparseFields
+from app.schemas.bulk import BulkResult
+from app.repositories.bulk import MAX_BULK_ITEMS
 
 class RoomRouter:
     def __init__(self):
@@ -20,37 +19,36 @@ class RoomRouter:
         self.service = RoomService()
 
     def add_routes(self):
-        @self.router.get("/", response_model=list[RoomResponse])
-        def get_rooms(db: Session = Depends(get_db)):
-            return self.service.get_all_rooms(db)
+        @self.router.get("/", response_model=list[RoomResponse], dependencies=[Depends(etag(Room, RoomResponse))])
+        async def get_rooms(filters: RoomFilter = Depends(), pagination: Pagination = Depends(), sparse: SparseFields = Depends(), cache: CachedList = Depends(cached_list(Room, RoomResponse)), db: ReadSession = Depends(get_read_db)):
+            cached = cache.hit()
+            if cached is not None:
+                return cached
+            rooms = pagination.page(await run_db(db, self.service.get_all_rooms, pagination.limit, pagination.after, sparse.fields, filters))
+            return cache.keep(sparse.render(rooms)) if sparse.fields else cache.render(rooms)
+
+        # Declared before /{room_id} so "available" is not parsed as an id
+        @self.router.get("/available", response_model=list[RoomResponse], dependencies=[Depends(etag(Room, RoomResponse, "lessons"))])
+        async def get_available_rooms(filters: RoomAvailabilityFilter = Depends(), pagination: Pagination = Depends(), db: ReadSession = Depends(get_read_db)):
+            return pagination.page(await run_db(db, self.service.get_available_rooms, filters, pagination.limit, pagination.after))
+
+        @self.router.get("/{room_id}", response_model=RoomResponse, dependencies=[Depends(etag(Room, RoomResponse))])
+        async def get_room_by_id(room_id: int, sparse: SparseFields = Depends(), db: ReadSession = Depends(get_read_db)):
+            room = await run_db(db, self.service.get_room_by_id, room_id, sparse.fields)
+            return sparse.render(room) if sparse.fields else room
 
-        @self.router.get("/{room_id}", response_model=RoomResponse)
-        def get_room_by_id(room_id: int, db: Session = Depends(get_db)):
-            return self.service.get_room_by_id(db, room_id)
+        @self.router.post("/bulk/{user_id}", response_model=BulkResult, dependencies=[Depends(admin_required)])
+        def create_rooms_bulk(user_id: int, rooms: list[RoomCreate] = Body(..., max_length=MAX_BULK_ITEMS), db: Session = Depends(get_db)):
+            return self.service.create_rooms_bulk(db, rooms)
 
-        @self.router.post("/{user_id}", response_model=RoomResponse)
+        @self.router.post("/{user_id}", response_model=RoomResponse, dependencies=[Depends(admin_required)])
         def create_room(user_id: int, room: RoomCreate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.create_room(db, room)
 
-        @self.router.put("/{room_id}/{user_id}", response_model=RoomResponse)
+        @self.router.put("/{room_id}/{user_id}", response_model=RoomResponse, dependencies=[Depends(admin_required)])
         def update_room(user_id: int, room_id: int, room_update: RoomUpdate, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.update_room(db, room_id, room_update)
 
-        @self.router.delete("/{room_id}/{user_id}")
+        @self.router.delete("/{room_id}/{user_id}", dependencies=[Depends(admin_required)])
         def delete_room(user_id: int, room_id: int, db: Session = Depends(get_db)):
-            user_service = UserService()
-            user = user_service.get_user_by_id(db, user_id)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            require_admin(user)
             return self.service.delete_room(db, room_id)
@@ -0,0 +1,87 @@
+import logging
+from sqlalchemy import func, inspect, select, update
+from app.database import Base
+from app.models.lesson import Lesson
+from app.models.reservation import Reservation
+from app.models.resource import Resource
+from app.repositories.reservation import DAY_END, DAY_START
+
+logger = logging.getLogger("database")
+
+
+def upgrade_schema(engine):
+    """
+    Bring tables created by an older version of the models up to date.
+
+    `create_all` only creates missing tables, so columns and indexes added
+    to existing tables are added here. Every step checks the live schema first, which
+    makes running it again a no-op.
+    """
+    with engine.begin() as connection:
+        columns = {
+            table: {column["name"] for column in inspect(connection).get_columns(table)}
+            for table in inspect(connection).get_table_names()
+        }
+
+        lessons = Lesson.__table__
+        for column in (lessons.c.start_time, lessons.c.end_time):
+            if column.name not in columns[lessons.name]:
+                _add_column(connection, column)
+
+        # Existing resources start at version 0 of the optimistic lock
+        version = Resource.__table__.c.version
+        if version.name not in columns[version.table.name]:
+            _add_column(connection, version)
+
+        reservations = Reservation.__table__
+        slot = (reservations.c.date, reservations.c.start_time, reservations.c.end_time)
+        missing = [column for column in slot if column.name not in columns[reservations.name]]
+        if missing:
+            for column in missing:
+                _add_column(connection, column, nullable=True)
+            # Existing reservations take the slot of their lesson, the whole day for untimed lessons
+            def lesson(column):
+                return select(column).where(lessons.c.id == reservations.c.lesson_id).scalar_subquery()
+
+            connection.execute(
+                update(reservations).values(
+                    date=lesson(lessons.c.date),
+                    start_time=func.coalesce(lesson(lessons.c.start_time), DAY_START),
+                    end_time=func.coalesce(lesson(lessons.c.end_time), DAY_END),
+                )
+            )
+            for column in missing:
+                _set_not_null(connection, column)
+
+        # Indexes declared on tables that already existed, e.g. the composite filter indexes
+        for table in Base.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                index.create(connection, checkfirst=True)
+
+
+def _add_column(connection, column, nullable=None):
+    """ALTER TABLE ... ADD COLUMN for `column` of the models; `nullable` overrides the model's."""
+    dialect = connection.dialect
+    preparer = dialect.identifier_preparer
+    sql = f"ALTER TABLE {preparer.format_table(column.table)} ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+    if column.server_default is not None:
+        sql += f" DEFAULT {column.server_default.arg}"
+    if not (column.nullable if nullable is None else nullable):
+        sql += " NOT NULL"
+    logger.info(f"Upgrading schema: {sql}")
+    connection.exec_driver_sql(sql)
+
+
+def _set_not_null(connection, column):
+    dialect = connection.dialect
+    preparer = dialect.identifier_preparer
+    table, name = preparer.format_table(column.table), preparer.format_column(column)
+    if dialect.name == "sqlite":
+        # SQLite can't change the nullability of a column in place; the app never writes NULL there
+        return
+    if dialect.name == "mysql":
+        sql = f"ALTER TABLE {table} MODIFY {name} {column.type.compile(dialect=dialect)} NOT NULL"
+    else:
+        sql = f"ALTER TABLE {table} ALTER COLUMN {name} SET NOT NULL"
+    logger.info(f"Upgrading schema: {sql}")
+    connection.exec_driver_sql(sql)
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    items: list[BulkItemResult]
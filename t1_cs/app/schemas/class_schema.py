@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
+from app.models.class_schedule import parse_schedule
 from app.schemas.discipline import DisciplineResponse
 from app.schemas.user import UserResponse
 from app.schemas.evaluation import EvaluationResponse
@@ -13,6 +14,12 @@ class ClassCreate(ClassBase):
     discipline_id: int
     professor_id: int
 
+    @field_validator("schedule")
+    @classmethod
+    def check_schedule(cls, schedule):
+        parse_schedule(schedule)
+        return schedule
+
 class ClassUpdate(BaseModel):
     semester: Optional[str] = None
     schedule: Optional[str] = None
@@ -20,6 +27,15 @@ class ClassUpdate(BaseModel):
     discipline_id: Optional[int] = None
     professor_id: Optional[int] = None
 
+    @field_validator("schedule")
+    @classmethod
+    def check_schedule(cls, schedule):
+        # Leaving the field out keeps the schedule; null would clear a required column
+        if schedule is None:
+            raise ValueError("schedule cannot be null")
+        parse_schedule(schedule)
+        return schedule
+
 class ClassResponse(ClassBase):
     id: int
     discipline: DisciplineResponse
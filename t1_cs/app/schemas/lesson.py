@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import date
+from pydantic import BaseModel, ConfigDict, model_validator
+from datetime import date, time
 from typing import Optional
 from app.schemas.class_schema import ClassResponse
 from app.schemas.room import RoomResponse
@@ -8,6 +8,16 @@ from app.schemas.discipline import DisciplineResponse
 class LessonBase(BaseModel):
     date: date
     attendance: Optional[str] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+
+    @model_validator(mode="after")
+    def check_time_slot(self):
+        if (self.start_time is None) != (self.end_time is None):
+            raise ValueError("start_time and end_time must be given together")
+        if self.start_time is not None and self.start_time >= self.end_time:
+            raise ValueError("start_time must be before end_time")
+        return self
 
 class LessonCreate(LessonBase):
     class_id: int
@@ -23,4 +33,29 @@ class LessonResponse(LessonBase):
     room: RoomResponse
     discipline: DisciplineResponse
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class LessonFilter(BaseModel):
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    room_id: Optional[int] = None
+    class_id: Optional[int] = None
+
+class LessonMaterialize(BaseModel):
+    start_date: date
+    end_date: date
+    room_id: int
+    holidays: list[date] = []
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        if (self.end_date - self.start_date).days > 366:
+            raise ValueError("date range must not exceed one year")
+        return self
+
+class LessonMaterializeResult(BaseModel):
+    created: int
+    skipped_holidays: int
+    skipped_existing: int
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
+from datetime import date, time
 from app.schemas.lesson import LessonResponse
 from app.schemas.resource import ResourceResponse
 
@@ -12,6 +13,9 @@ class ReservationCreate(ReservationBase):
 
 class ReservationResponse(ReservationBase):
     id: int
+    date: date
+    start_time: time
+    end_time: time
     lesson: LessonResponse
     resource: ResourceResponse
 
@@ -28,3 +28,7 @@ class ResourceUpdate(BaseModel):
     status: Optional[ResourceStatus] = None 
 
     model_config = ConfigDict(from_attributes=True)
+
+class ResourceFilter(BaseModel):
+    status: Optional[ResourceStatus] = None
+    resource_type_id: Optional[int] = None
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from datetime import date
 from pydantic import BaseModel, ConfigDict
 from app.schemas.building import BuildingResponse
 from app.schemas.resource import ResourceResponse
@@ -25,3 +26,11 @@ class RoomResponse(RoomBase):
     resources: list[ResourceResponse]
 
     model_config = ConfigDict(from_attributes=True)
+
+class RoomFilter(BaseModel):
+    building_id: Optional[int] = None
+    min_capacity: Optional[int] = None
+
+class RoomAvailabilityFilter(RoomFilter):
+    date: date
+    resource_type_id: Optional[int] = None
@@ -1,6 +1,11 @@
-from datetime import date
+import argparse
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import Base, SessionLocal, get_engine
 
 from app.models.profile import Profile
 from app.models.user import User
@@ -14,6 +19,9 @@ from app.models.discipline import Discipline
 from app.models.lesson import Lesson
 from app.models.resource import Resource
 from app.models.reservation import Reservation
+from app.models.class_schedule import ClassSchedule, parse_schedule
+from app.models.curriculum import curriculum_discipline_association
+from app.models.room import room_resource_association
 
 
 def populate_profiles_and_user(db: Session):
@@ -179,3 +187,326 @@ def populate_all(db: Session):
         db.commit()
 
     print("Banco de dados populado com sucesso.")
+
+
+# Rows per executemany batch of generate_campus
+GENERATE_CHUNK = 50000
+
+FIRST_NAMES = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Heitor", "Isabel", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Tiago", "Valéria", "Vinícius")
+LAST_NAMES = ("Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima", "Martins", "Oliveira", "Pereira", "Ribeiro", "Rocha", "Santos", "Silva", "Souza")
+STREETS = ("Av. Ipiranga", "Rua da República", "Av. Bento Gonçalves", "Rua Sarmento Leite", "Av. Osvaldo Aranha", "Rua Ramiro Barcelos")
+RESOURCE_TYPES = ("Projector", "Whiteboard", "Computer", "Smart TV", "Microphone", "Document Camera", "Speaker", "Lab Kit")
+SUBJECTS = ("Calculus", "Physics", "Algorithms", "Databases", "Statistics", "Chemistry", "Economics", "Networks", "Linear Algebra", "Operating Systems", "Compilers", "Software Engineering")
+COURSES = ("Computer Science", "Engineering", "Physics", "Mathematics", "Economics", "Chemistry", "Information Systems", "Statistics")
+DAY_PATTERNS = ("Mon-Wed", "Tue-Thu", "Wed-Fri", "Mon", "Tue", "Wed", "Thu", "Fri")
+TIME_SLOTS = ("08:00-10:00", "10:00-12:00", "13:30-15:30", "15:30-17:30", "19:00-21:00")
+CAPACITIES = (20, 30, 40, 40, 50, 60, 80, 120)
+# Name and first Monday of each generated semester
+SEMESTERS = (("2024/1", date(2024, 3, 4)), ("2024/2", date(2024, 8, 5)))
+
+GENERATED_TABLES = (
+    Profile.__table__, User.__table__, Building.__table__, Room.__table__, ResourceType.__table__,
+    Resource.__table__, room_resource_association, Discipline.__table__, Curriculum.__table__,
+    curriculum_discipline_association, Class.__table__, ClassSchedule.__table__, Evaluation.__table__,
+    Lesson.__table__, Reservation.__table__,
+)
+
+
+class _BulkInsert:
+    """
+    executemany of plain tuples into one table, bypassing Core's per-row parameter handling.
+
+    Values still go through the dialect's bind processors (SQLite stores
+    dates and times as strings), but each processor runs once per distinct
+    value: generated data repeats the same dates and times over and over.
+    """
+
+    def __init__(self, connection, table, columns):
+        dialect = connection.dialect
+        self.connection = connection
+        placeholder = "?" if dialect.paramstyle == "qmark" else "%s"
+        preparer = dialect.identifier_preparer
+        self.sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            preparer.format_table(table),
+            ", ".join(preparer.quote(name) for name in columns),
+            ", ".join([placeholder] * len(columns)),
+        )
+        self.processors = []
+        for position, name in enumerate(columns):
+            column_type = table.columns[name].type
+            process = column_type.dialect_impl(dialect).bind_processor(dialect)
+            if process is not None:
+                self.processors.append((position, _memoize(process)))
+        self.columns = columns
+
+    def bind(self, name):
+        """The (memoized) conversion `name`'s values go through, for callers that pre-convert rows."""
+        for position, process in self.processors:
+            if self.columns[position] == name:
+                return process
+        return lambda value: value
+
+    def __call__(self, rows, bound: bool = False):
+        """Insert `rows`, tuples in the order of `columns`; returns how many were written.
+
+        With `bound`, the values were already passed through `bind` and go to the driver as they are.
+        """
+        if self.processors and rows and not bound:
+            # Column by column, so the work per value is one cache lookup
+            columns = list(zip(*rows))
+            for position, process in self.processors:
+                columns[position] = map(process, columns[position])
+            rows = list(zip(*columns))
+        if rows:
+            self.connection.exec_driver_sql(self.sql, rows)
+        return len(rows)
+
+
+def _memoize(process):
+    cache = {None: None}
+
+    def cached(value):
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = process(value)
+            return result
+
+    return cached
+
+
+@contextmanager
+def _fast_load(connection):
+    """
+    On SQLite, keep the rollback journal in memory and skip fsyncs while the block runs.
+
+    A failed load still rolls back, but a crash of the process or machine
+    mid-load can corrupt the file, which is acceptable for a database being
+    generated from scratch. Both settings are per connection and have to
+    change outside a transaction; they are put back afterwards.
+    """
+    if connection.dialect.name != "sqlite":
+        yield
+        return
+    previous = {pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar() for pragma in ("journal_mode", "synchronous")}
+    connection.exec_driver_sql("PRAGMA journal_mode = MEMORY")
+    connection.exec_driver_sql("PRAGMA synchronous = OFF")
+    connection.commit()
+    try:
+        yield
+    finally:
+        for pragma, value in previous.items():
+            connection.exec_driver_sql(f"PRAGMA {pragma} = {value}")
+        connection.commit()
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_campus(
+    engine,
+    buildings: int = 20,
+    rooms: int = 2000,
+    resources_per_room: int = 3,
+    professors: int = 500,
+    disciplines: int = 400,
+    curriculums: int = 20,
+    classes: int = 8000,
+    lessons: int = 1000000,
+    reservations: int = 1000000,
+    seed: int = 0,
+    chunk: int = GENERATE_CHUNK,
+):
+    """
+    Fill an empty database with a synthetic campus and return the rows written per table.
+
+    Rows go in with executemany, `chunk` at a time, and ids are assigned
+    sequentially from 1, so the foreign keys are consistent without reading
+    anything back: classes get a weekly schedule (and its class_schedules
+    rows) in a room that is free at those times, lessons follow the schedule
+    of their class week by week, and reservations book a resource of the
+    lesson's room at the lesson's time. The same arguments and `seed` always
+    produce the same data.
+    """
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    counts = {}
+
+    with engine.connect() as connection, _fast_load(connection), connection.begin():
+        for table in GENERATED_TABLES:
+            if connection.execute(select(func.count()).select_from(table)).scalar():
+                raise ValueError(f"Table {table.name} already has rows; generate_campus needs an empty database")
+
+        def write(table, columns, rows):
+            bulk_insert = _BulkInsert(connection, table, columns)
+            counts[table.name] = sum(bulk_insert(batch) for batch in _chunks(rows, chunk))
+
+        write(Profile.__table__, ("id", "name"), [(1, "Admin"), (2, "Professor"), (3, "Coordinator")])
+        # User 1 is the admin and users 2..professors+1 teach
+        write(User.__table__, ("id", "email", "name", "birth_date", "gender", "profile_id"), (
+            (
+                i, f"user{i}@campus.example.com", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                date(1955, 1, 1) + timedelta(days=rng.randrange(40 * 365)),
+                rng.choice(("Feminino", "Masculino", "Outro")), 1 if i == 1 else 2,
+            )
+            for i in range(1, professors + 2)
+        ))
+        write(Building.__table__, ("id", "name", "building_number", "street", "number", "neighborhood", "city", "state", "postal_code"), (
+            (
+                i, f"Building {i}", i, rng.choice(STREETS), str(rng.randint(1, 9999)), "Campus Centro",
+                "Porto Alegre", "RS", f"90{rng.randrange(1000):03d}-{rng.randrange(1000):03d}",
+            )
+            for i in range(1, buildings + 1)
+        ))
+        # Rooms are spread over the buildings and then over five floors: room 2 of floor 3 is number 302
+        capacities = [rng.choice(CAPACITIES) for _ in range(rooms)]
+        write(Room.__table__, ("id", "room_number", "capacity", "floor", "building_id"), (
+            (i, 100 * floor + (i - 1) // (5 * buildings) + 1, capacities[i - 1], str(floor), 1 + (i - 1) % buildings)
+            for i, floor in ((i, 1 + (i - 1) // buildings % 5) for i in range(1, rooms + 1))
+        ))
+        write(ResourceType.__table__, ("id", "name"), enumerate(RESOURCE_TYPES, 1))
+        # Resource i sits in room 1 + (i - 1) % rooms, so room r holds resources r, r + rooms, ...
+        resources = rooms * resources_per_room
+        write(Resource.__table__, ("id", "description", "status", "version", "resource_type_id"), (
+            (i, f"{RESOURCE_TYPES[type_index]} {i}", "maintenance" if rng.random() < 0.05 else "available", 0, type_index + 1)
+            for i, type_index in ((i, (i - 1) // rooms % len(RESOURCE_TYPES)) for i in range(1, resources + 1))
+        ))
+        write(room_resource_association, ("room_id", "resource_id"), ((1 + (i - 1) % rooms, i) for i in range(1, resources + 1)))
+        write(Discipline.__table__, ("id", "name", "credits", "program", "bibliography"), (
+            (i, f"{subject} {100 + (i - 1) // len(SUBJECTS)}", rng.randint(2, 6), f"Program of {subject}", f"{rng.choice(LAST_NAMES)}, {subject}")
+            for i, subject in ((i, SUBJECTS[(i - 1) % len(SUBJECTS)]) for i in range(1, disciplines + 1))
+        ))
+        write(Curriculum.__table__, ("id", "course_name", "start_date"), (
+            (i, f"{COURSES[(i - 1) % len(COURSES)]} {2015 + (i - 1) // len(COURSES)}", date(2015 + (i - 1) // len(COURSES), 3, 1))
+            for i in range(1, curriculums + 1)
+        ))
+        write(curriculum_discipline_association, ("curriculum_id", "discipline_id"), (
+            (curriculum_id, discipline_id)
+            for curriculum_id in range(1, curriculums + 1)
+            for discipline_id in sorted(rng.sample(range(1, disciplines + 1), min(disciplines, 30)))
+        ))
+
+        # Each class meets in one room, picked among a few random ones for being free at all of its slots
+        taken = set()
+        class_rows, schedule_rows, meetings = [], [], []
+        for i in range(1, classes + 1):
+            schedule = f"{rng.choice(DAY_PATTERNS)} {rng.choice(TIME_SLOTS)}"
+            slots = parse_schedule(schedule)
+            for _ in range(10):
+                room_id = rng.randint(1, rooms)
+                if not any((room_id, weekday, start) in taken for weekday, start, _ in slots):
+                    break
+            taken.update((room_id, weekday, start) for weekday, start, _ in slots)
+            semester, first_monday = SEMESTERS[(i - 1) % len(SEMESTERS)]
+            discipline_id = rng.randint(1, disciplines)
+            vacancies = min(capacities[room_id - 1], rng.choice(CAPACITIES))
+            class_rows.append((i, semester, schedule, vacancies, discipline_id, rng.randint(2, professors + 1)))
+            schedule_rows.extend((i, weekday, start, end) for weekday, start, end in slots)
+            meetings.append((slots, first_monday, room_id, discipline_id))
+        write(Class.__table__, ("id", "semester", "schedule", "vacancies", "discipline_id", "professor_id"), class_rows)
+        write(ClassSchedule.__table__, ("id", "class_id", "weekday", "start_time", "end_time"), ((i, *row) for i, row in enumerate(schedule_rows, 1)))
+        # A midterm and a final for every class
+        write(Evaluation.__table__, ("id", "date", "statement", "type", "class_id"), (
+            (i, meetings[class_id - 1][1] + timedelta(weeks=8 if i % 2 else 16), "Midterm exam" if i % 2 else "Final exam", "Written", class_id)
+            for i, class_id in ((i, 1 + (i - 1) // 2) for i in range(1, 2 * classes + 1))
+        ))
+
+        # Lesson n is meeting n // classes of class n % classes; reservations are spread evenly over the lessons.
+        # Dates and times are converted for the driver up front, once per distinct value
+        insert_lessons = _BulkInsert(connection, Lesson.__table__, ("id", "date", "start_time", "end_time", "class_id", "room_id", "discipline_id"))
+        insert_reservations = _BulkInsert(connection, Reservation.__table__, ("id", "date", "start_time", "end_time", "lesson_id", "resource_id"))
+        bind_date, bind_time = insert_lessons.bind("date"), insert_lessons.bind("start_time")
+        bound_slots = [[(weekday, bind_time(start), bind_time(end)) for weekday, start, end in slots] for slots, *_ in meetings]
+        weeks = {}
+
+        def lessons_and_reservations(start, stop):
+            lesson_rows, reservation_rows = [], []
+            add_lesson, add_reservation = lesson_rows.append, reservation_rows.append
+            for n in range(start, stop):
+                class_index = n % classes
+                slots = bound_slots[class_index]
+                _, first_monday, room_id, discipline_id = meetings[class_index]
+                meeting = n // classes
+                weekday, start_time, end_time = slots[meeting % len(slots)]
+                key = (first_monday, meeting // len(slots), weekday)
+                lesson_date = weeks.get(key)
+                if lesson_date is None:
+                    lesson_date = weeks[key] = bind_date(first_monday + timedelta(weeks=key[1], days=weekday))
+                add_lesson((n + 1, lesson_date, start_time, end_time, class_index + 1, room_id, discipline_id))
+                # Lessons before n hold the reservations up to n * reservations // lessons
+                reservation_id = n * reservations // lessons + 1
+                first = int(rng.random() * resources_per_room)
+                for k in range((n + 1) * reservations // lessons + 1 - reservation_id):
+                    add_reservation((reservation_id + k, lesson_date, start_time, end_time, n + 1, room_id + rooms * ((first + k) % resources_per_room)))
+            return lesson_rows, reservation_rows
+
+        # Building the secondary indexes once at the end is much cheaper than keeping them up to
+        # date row by row. Only where DDL is transactional, though: on MySQL a DROP INDEX commits
+        # on the spot, so a failed load would leave the tables without them. There the indexes
+        # stay, and the load skips the per-row foreign key and uniqueness checks instead (the
+        # generated ids are consistent by construction)
+        mysql = connection.dialect.name == "mysql"
+        indexes = [] if mysql else sorted(Lesson.__table__.indexes | Reservation.__table__.indexes, key=lambda index: index.name)
+        for index in indexes:
+            index.drop(connection)
+        if mysql:
+            connection.exec_driver_sql("SET foreign_key_checks = 0, unique_checks = 0")
+        try:
+            counts[Lesson.__tablename__] = counts[Reservation.__tablename__] = 0
+            for start in range(0, lessons, chunk):
+                lesson_rows, reservation_rows = lessons_and_reservations(start, min(start + chunk, lessons))
+                counts[Lesson.__tablename__] += insert_lessons(lesson_rows, bound=True)
+                counts[Reservation.__tablename__] += insert_reservations(reservation_rows, bound=True)
+        finally:
+            if mysql:
+                # Session variables would otherwise stay off on the pooled connection
+                connection.exec_driver_sql("SET foreign_key_checks = 1, unique_checks = 1")
+        for index in indexes:
+            index.create(connection)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic campus in an empty database.")
+    parser.add_argument("--database-url", help="defaults to the app's configured database")
+    parser.add_argument("--buildings", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--resources-per-room", type=int, default=3)
+    parser.add_argument("--professors", type=int, default=500)
+    parser.add_argument("--disciplines", type=int, default=400)
+    parser.add_argument("--curriculums", type=int, default=20)
+    parser.add_argument("--classes", type=int, default=8000)
+    parser.add_argument("--lessons", type=int, default=1000000)
+    parser.add_argument("--reservations", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=GENERATE_CHUNK, help="rows per executemany batch")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url) if args.database_url else get_engine()
+    started = time.perf_counter()
+    try:
+        counts = generate_campus(
+            engine, buildings=args.buildings, rooms=args.rooms, resources_per_room=args.resources_per_room,
+            professors=args.professors, disciplines=args.disciplines, curriculums=args.curriculums,
+            classes=args.classes, lessons=args.lessons, reservations=args.reservations, seed=args.seed, chunk=args.chunk,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - started
+    for table, rows in counts.items():
+        print(f"{table:<24} {rows:>10}")
+    total = sum(counts.values())
+    print(f"{total} linhas em {elapsed:.1f} s ({total / elapsed:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
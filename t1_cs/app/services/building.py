@@ -1,33 +1,48 @@
 from sqlalchemy.orm import Session
 from app.repositories.building import BuildingRepository
-from app.schemas.building import BuildingCreate, BuildingUpdate
+from app.schemas.building import BuildingCreate, BuildingUpdate, BuildingResponse
+from app.repositories.pagination import Page
+from app.cache import TTLCache
+
+_cache = TTLCache("buildings")
 
 class BuildingService:
     def __init__(self):
         self.repository = BuildingRepository()
     
-    def get_all_buildings(self, db: Session):
-        return self.repository.get_all(db)
+    def get_all_buildings(self, db: Session, limit: int = None, after: int = None):
+        def load():
+            page = self.repository.get_all(db, limit, after)
+            return Page([BuildingResponse.model_validate(building) for building in page], page.next_cursor)
+        return _cache.get_or_load(("all", limit, after), load)
 
     def get_building_by_id(self, db: Session, building_id: int):
-        building = self.repository.get_by_id(db, building_id)
-        if not building:
-            raise ValueError(f"Building with id {building_id} not found")
-        return building
+        def load():
+            building = self.repository.get_by_id(db, building_id)
+            if not building:
+                raise ValueError(f"Building with id {building_id} not found")
+            return BuildingResponse.model_validate(building)
+        return _cache.get_or_load(building_id, load)
 
     def create_building(self, db: Session, building: BuildingCreate):
-        return self.repository.create(db, building)
+        created = self.repository.create(db, building)
+        _cache.invalidate()
+        return created
 
     def update_building(self, db: Session, building_id: int, building_update: BuildingUpdate):
         existing_building = self.repository.get_by_id(db, building_id)
         if not existing_building:
             raise ValueError(f"Building with id {building_id} not found")
         
-        return self.repository.update(building_id, building_update)
+        updated = self.repository.update(db, building_id, building_update)
+        _cache.invalidate()
+        return updated
 
     def delete_building(self, db: Session, building_id: int):
         existing_building = self.repository.get_by_id(db, building_id)
         if not existing_building:
             raise ValueError(f"Building with id {building_id} not found")
         
-        return self.repository.delete(building_id)
+        deleted = self.repository.delete(db, building_id)
+        _cache.invalidate()
+        return deleted
@@ -1,20 +1,36 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.class_repository import ClassRepository
+from app.repositories.lesson import LessonRepository
+from app.models.class_model import Class
+from app.models.room import Room
 from app.schemas.class_schema import ClassCreate, ClassUpdate
+from app.schemas.lesson import LessonMaterialize
 
 class ClassService:
     def __init__(self):
         self.repository = ClassRepository()
 
-    def get_all_classes(self, db: Session):
-        classes = self.repository.get_all(db)
+    def get_all_classes(self, db: Session, limit: int = None, after: int = None, fields: list[str] = None):
+        if fields:
+            try:
+                classes = self.repository.get_fields(db, fields, limit, after)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            classes = self.repository.get_all(db, limit, after)
         if not classes:
             raise HTTPException(status_code=404, detail="No classes found")
         return classes
 
-    def get_class_by_id(self, db: Session, class_id: int):
-        class_obj = self.repository.get_by_id(db, class_id)
+    def get_class_by_id(self, db: Session, class_id: int, fields: list[str] = None):
+        if fields:
+            try:
+                class_obj = self.repository.get_fields_by_id(db, class_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            class_obj = self.repository.get_by_id(db, class_id)
         if not class_obj:
             raise HTTPException(status_code=404, detail="Class not found")
         return class_obj
@@ -22,6 +38,20 @@ class ClassService:
     def create_class(self, db: Session, class_data: ClassCreate):
         return self.repository.create(db, class_data)
 
+    def materialize_lessons(self, db: Session, class_id: int, request: LessonMaterialize):
+        class_obj = db.get(Class, class_id)
+        if not class_obj:
+            raise HTTPException(status_code=404, detail="Class not found")
+        if not class_obj.schedules:
+            # Classes created before class_schedules existed get their slots from the schedule text
+            try:
+                class_obj.rebuild_schedules()
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Class has no weekly schedule: {e}")
+        if not db.get(Room, request.room_id):
+            raise HTTPException(status_code=404, detail="Room not found")
+        return LessonRepository().materialize(db, class_obj, request)
+
     def update_class(self, db: Session, class_id: int, class_update: ClassUpdate):
         class_obj = self.repository.update(db, class_id, class_update)
         if not class_obj:
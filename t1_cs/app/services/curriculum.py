@@ -7,8 +7,8 @@ class CurriculumService:
     def __init__(self):
         self.repository = CurriculumRepository()
 
-    def get_all_curriculums(self, db: Session):
-        return self.repository.get_all(db)
+    def get_all_curriculums(self, db: Session, limit: int = None, after: int = None):
+        return self.repository.get_all(db, limit, after)
 
     def get_curriculum_by_id(self, db: Session, curriculum_id: int):
         curriculum = self.repository.get_by_id(db, curriculum_id)
@@ -7,8 +7,8 @@ class DisciplineService:
     def __init__(self):
         self.repository = DisciplineRepository()
 
-    def get_all_disciplines(self, db: Session):
-        disciplines = self.repository.get_all(db)
+    def get_all_disciplines(self, db: Session, limit: int = None, after: int = None):
+        disciplines = self.repository.get_all(db, limit, after)
         if not disciplines:
             raise HTTPException(status_code=404, detail="No disciplines found")
         return disciplines
@@ -7,8 +7,8 @@ class EvaluationService:
     def __init__(self):
         self.repository = EvaluationRepository()
 
-    def get_all_evaluations(self, db: Session):
-        return self.repository.get_all(db)
+    def get_all_evaluations(self, db: Session, limit: int = None, after: int = None):
+        return self.repository.get_all(db, limit, after)
 
     def get_evaluation_by_id(self, db: Session, evaluation_id: int):
         evaluation = self.repository.get_by_id(db, evaluation_id)
@@ -1,20 +1,37 @@
 from sqlalchemy.orm import Session
 from app.repositories.lesson import LessonRepository
-from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.repositories.reservation import ReservationRepository
+from app.repositories.resource import ResourceRepository
+from app.services.reservation import MAX_RESERVATION_ATTEMPTS
+from app.schemas.lesson import LessonCreate, LessonUpdate, LessonFilter
 from fastapi import HTTPException
 
 class LessonService:
     def __init__(self):
         self.repository = LessonRepository()
+        self.reservation_repository = ReservationRepository()
+        self.resource_repository = ResourceRepository()
 
-    def get_all_lessons(self, db: Session):
-        lessons = self.repository.get_all(db)
+    def get_all_lessons(self, db: Session, limit: int = None, after: int = None, fields: list[str] = None, filters: LessonFilter = None):
+        if fields:
+            try:
+                lessons = self.repository.get_fields(db, fields, limit, after, filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            lessons = self.repository.get_all(db, limit, after, filters)
         if not lessons:
             raise HTTPException(status_code=404, detail="No lessons found")
         return lessons
 
-    def get_lesson_by_id(self, db: Session, lesson_id: int):
-        lesson = self.repository.get_by_id(db, lesson_id)
+    def get_lesson_by_id(self, db: Session, lesson_id: int, fields: list[str] = None):
+        if fields:
+            try:
+                lesson = self.repository.get_fields_by_id(db, lesson_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            lesson = self.repository.get_by_id(db, lesson_id)
         if not lesson:
             raise HTTPException(status_code=404, detail="Lesson not found")
         return lesson
@@ -22,11 +39,36 @@ class LessonService:
     def create_lesson(self, db: Session, lesson_data: LessonCreate):
         return self.repository.create(db, lesson_data)
 
+    def create_lessons_bulk(self, db: Session, lessons: list[LessonCreate]):
+        return self.repository.create_bulk(db, lessons)
+
     def update_lesson(self, db: Session, lesson_id: int, lesson_update: LessonUpdate):
-        lesson = self.repository.update(db, lesson_id, lesson_update)
-        if not lesson:
-            raise HTTPException(status_code=404, detail="Lesson not found")
-        return lesson
+        for _ in range(MAX_RESERVATION_ATTEMPTS):
+            lesson = self.repository.apply_update(db, lesson_id, lesson_update)
+            if not lesson:
+                raise HTTPException(status_code=404, detail="Lesson not found")
+            if not self.repository.is_moved(lesson):
+                return self.repository.save(db, lesson)
+
+            # the lesson's reservations move with it, so its new slot must be free for the room and each resource
+            if self.repository.has_room_conflict(db, lesson):
+                db.rollback()
+                raise HTTPException(status_code=409, detail="Room is already booked for an overlapping lesson")
+            if self.reservation_repository.has_lesson_conflict(db, lesson):
+                db.rollback()
+                raise HTTPException(status_code=409, detail="A reserved resource is already reserved for an overlapping time slot")
+
+            # claimed in id order, as bulk reservations do, so concurrent claims cannot deadlock
+            claimed = all(
+                self.resource_repository.claim(db, resource_id, version)
+                for resource_id, version in self.reservation_repository.get_reserved_resource_versions(db, lesson.id)
+            )
+            if claimed:
+                self.reservation_repository.reschedule_lesson(db, lesson)
+                return self.repository.save(db, lesson)
+            db.rollback()
+
+        raise HTTPException(status_code=409, detail="Resources are being reserved concurrently, please retry")
 
     def delete_lesson(self, db: Session, lesson_id: int):
         lesson = self.repository.delete(db, lesson_id)
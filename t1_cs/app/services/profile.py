@@ -1,32 +1,48 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.profile import ProfileRepository
-from app.schemas.profile import ProfileCreate
+from app.schemas.profile import ProfileCreate, ProfileResponse
+from app.repositories.pagination import Page
+from app.cache import TTLCache
+from app.dependencies.permissions import invalidate_roles
+
+_cache = TTLCache("profiles")
 
 class ProfileService:
     def __init__(self):
         self.repository = ProfileRepository()
         
-    def get_all_profiles(self, db: Session):
-        return self.repository.get_all(db)
+    def get_all_profiles(self, db: Session, limit: int = None, after: int = None):
+        def load():
+            page = self.repository.get_all(db, limit, after)
+            return Page([ProfileResponse.model_validate(profile) for profile in page], page.next_cursor)
+        return _cache.get_or_load(("all", limit, after), load)
 
     def get_profile_by_id(self, db: Session, profile_id: int):
-        profile = self.repository.get_by_id(db, profile_id)
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        return profile
+        def load():
+            profile = self.repository.get_by_id(db, profile_id)
+            if not profile:
+                raise HTTPException(status_code=404, detail="Profile not found")
+            return ProfileResponse.model_validate(profile)
+        return _cache.get_or_load(profile_id, load)
 
     def create_profile(self, db: Session, profile: ProfileCreate):
-        return self.repository.create(db, profile)
+        created = self.repository.create(db, profile)
+        _cache.invalidate()
+        return created
 
     def update_profile(self, db: Session, profile_id: int, profile: ProfileCreate):
         updated_profile = self.repository.update(db, profile_id, profile)
         if not updated_profile:
             raise HTTPException(status_code=404, detail="Profile not found for update")
+        _cache.invalidate()
+        invalidate_roles()
         return updated_profile
 
     def delete_profile(self, db: Session, profile_id: int):
         success = self.repository.delete(db, profile_id)
         if not success:
             raise HTTPException(status_code=404, detail="Profile not found for deletion")
+        _cache.invalidate()
+        invalidate_roles()
         return success
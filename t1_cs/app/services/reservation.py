@@ -1,52 +1,101 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.repositories.reservation import ReservationRepository
+from app.models.lesson import Lesson
+from app.repositories.reservation import ReservationRepository, lesson_time_slot
 from app.repositories.resource import ResourceRepository
+from app.repositories.bulk import bulk_results
+from app.models.resource import Resource
 from app.schemas.reservation import ReservationCreate
 from app.models.resource import ResourceStatus
 
+# Attempts before giving up when concurrent reservations keep changing the resource
+MAX_RESERVATION_ATTEMPTS = 5
+
 class ReservationService:
     def __init__(self):
         self.reservation_repository = ReservationRepository()
         self.resource_repository = ResourceRepository()
 
     def make_reservation(self, db: Session, reservation: ReservationCreate):
-        # checks if resource is available
-        resource = self.resource_repository.get_by_id(db, reservation.resource_id)
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
-        if resource.status != ResourceStatus.available:
-            raise HTTPException(status_code=400, detail="Resource is not available")
+        lesson = db.query(Lesson).filter(Lesson.id == reservation.lesson_id).first()
+        if not lesson:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+        day, start_time, end_time = lesson_time_slot(lesson)
 
-        # create reservation
-        db_reservation = self.reservation_repository.create(db, reservation)
+        for _ in range(MAX_RESERVATION_ATTEMPTS):
+            # checks if resource can be booked at all
+            resource = self.resource_repository.get_by_id(db, reservation.resource_id)
+            if not resource:
+                raise HTTPException(status_code=404, detail="Resource not found")
+            if resource.status == ResourceStatus.maintenance:
+                raise HTTPException(status_code=400, detail="Resource is under maintenance")
 
-        # update resource status to taken
-        resource.status = ResourceStatus.taken
-        db.commit()
+            # checks if resource is free during the lesson's time slot
+            if self.reservation_repository.has_conflict(db, resource.id, day, start_time, end_time):
+                raise HTTPException(status_code=409, detail="Resource is already reserved for an overlapping time slot")
 
-        return db_reservation
+            # the version only matches if nobody reserved the resource since it was read;
+            # the claim and the reservation are committed together
+            if self.resource_repository.claim(db, resource.id, resource.version):
+                return self.reservation_repository.create(db, reservation, lesson)
+            db.rollback()
 
-    def cancel_reservation(self, db: Session, reservation_id: int):
-        # Get reservation
-        reservation = self.reservation_repository.get_by_id(db, reservation_id)
-        if not reservation:
-            raise HTTPException(status_code=404, detail="Reservation not found")
+        raise HTTPException(status_code=409, detail="Resource is being reserved concurrently, please retry")
 
-        # Delete the reservation
-        success = self.reservation_repository.delete(db, reservation_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Failed to cancel reservation")
+    def make_reservations_bulk(self, db: Session, reservations: list[ReservationCreate]):
+        for _ in range(MAX_RESERVATION_ATTEMPTS):
+            lessons = {lesson.id: lesson for lesson in db.query(Lesson).filter(Lesson.id.in_({r.lesson_id for r in reservations}))}
+            resources = {resource.id: resource for resource in db.query(Resource).filter(Resource.id.in_({r.resource_id for r in reservations}))}
+
+            errors = {}
+            slots = {}
+            for index, reservation in enumerate(reservations):
+                resource = resources.get(reservation.resource_id)
+                lesson = lessons.get(reservation.lesson_id)
+                if resource is None:
+                    errors[index] = "Resource not found"
+                elif lesson is None:
+                    errors[index] = "Lesson not found"
+                elif resource.status == ResourceStatus.maintenance:
+                    errors[index] = "Resource is under maintenance"
+                else:
+                    slots[index] = lesson_time_slot(lesson)
 
-        # Update resource status to available
-        resource = self.resource_repository.get_by_id(db, reservation.resource_id)
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
-        
-        resource.status = ResourceStatus.available
-        db.commit()
+            # checks every item against existing reservations and the items before it
+            booked = self.reservation_repository.get_booked_slots(
+                db, [reservations[index].resource_id for index in slots], [slot[0] for slot in slots.values()]
+            )
+            accepted = []
+            for index, (day, start_time, end_time) in slots.items():
+                taken = booked.setdefault((reservations[index].resource_id, day), [])
+                if any(start < end_time and end > start_time for start, end in taken):
+                    errors[index] = "Resource is already reserved for an overlapping time slot"
+                    continue
+                taken.append((start_time, end_time))
+                accepted.append(index)
 
-        return {"message": "Reservation cancelled successfully, and resource status updated to available."}
+            # claimed in id order, so concurrent bulk requests lock the rows in the same order and cannot deadlock
+            claimed = all(
+                self.resource_repository.claim(db, resource_id, resources[resource_id].version)
+                for resource_id in sorted({reservations[index].resource_id for index in accepted})
+            )
+            if not claimed:
+                db.rollback()
+                continue
+
+            ids = self.reservation_repository.create_bulk(
+                db, [reservations[index] for index in accepted], [lessons[reservations[index].lesson_id] for index in accepted]
+            )
+            db.commit()
+            return bulk_results(len(reservations), errors, dict(zip(accepted, ids)))
+
+        raise HTTPException(status_code=409, detail="Resources are being reserved concurrently, please retry")
+
+    def cancel_reservation(self, db: Session, reservation_id: int):
+        success = self.reservation_repository.delete(db, reservation_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Reservation not found")
+        return {"message": "Reservation cancelled successfully."}
 
     def get_reservation_by_id(self, db: Session, reservation_id: int):
         reservation = self.reservation_repository.get_by_id(db, reservation_id)
@@ -54,5 +103,5 @@ class ReservationService:
             raise HTTPException(status_code=404, detail="Reservation not found")
         return reservation
 
-    def get_all_reservations(self, db: Session):
-        return self.reservation_repository.get_all(db)
+    def get_all_reservations(self, db: Session, limit: int = None, after: int = None):
+        return self.reservation_repository.get_all(db, limit, after)
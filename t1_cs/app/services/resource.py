@@ -1,20 +1,32 @@
 from sqlalchemy.orm import Session
 from app.repositories.resource import ResourceRepository
-from app.schemas.resource import ResourceCreate, ResourceUpdate
+from app.schemas.resource import ResourceCreate, ResourceUpdate, ResourceFilter
 from fastapi import HTTPException
 
 class ResourceService:
     def __init__(self):
         self.repository = ResourceRepository()
 
-    def get_all_resources(self, db: Session):
-        resources = self.repository.get_all(db)
+    def get_all_resources(self, db: Session, limit: int = None, after: int = None, fields: list[str] = None, filters: ResourceFilter = None):
+        if fields:
+            try:
+                resources = self.repository.get_fields(db, fields, limit, after, filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            resources = self.repository.get_all(db, limit, after, filters)
         if not resources:
             raise HTTPException(status_code=404, detail="No resources found")
         return resources
 
-    def get_resource_by_id(self, db: Session, resource_id: int):
-        resource = self.repository.get_by_id(db, resource_id)
+    def get_resource_by_id(self, db: Session, resource_id: int, fields: list[str] = None):
+        if fields:
+            try:
+                resource = self.repository.get_fields_by_id(db, resource_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            resource = self.repository.get_by_id(db, resource_id)
         if not resource:
             raise HTTPException(status_code=404, detail="Resource not found")
         return resource
@@ -22,6 +34,9 @@ class ResourceService:
     def create_resource(self, db: Session, resource_data: ResourceCreate):
         return self.repository.create(db, resource_data)
 
+    def create_resources_bulk(self, db: Session, resources: list[ResourceCreate]):
+        return self.repository.create_bulk(db, resources)
+
     def delete_resource(self, db: Session, resource_id: int):
         resource = self.repository.delete(db, resource_id)
         if not resource:
@@ -1,32 +1,46 @@
 from sqlalchemy.orm import Session
 from app.repositories.resource_type import ResourceTypeRepository
 from app.schemas.resource_type import ResourceTypeCreate, ResourceTypeUpdate
+from app.schemas.resource_type import ResourceTypeResponse
+from app.repositories.pagination import Page
+from app.cache import TTLCache
 from fastapi import HTTPException
 
+_cache = TTLCache("resource_types")
+
 class ResourceTypeService:
     def __init__(self):
         self.resource_type_repository = ResourceTypeRepository()
 
-    def get_all_resource_types(self, db: Session):
-        return self.resource_type_repository.get_all(db)
+    def get_all_resource_types(self, db: Session, limit: int = None, after: int = None):
+        def load():
+            page = self.resource_type_repository.get_all(db, limit, after)
+            return Page([ResourceTypeResponse.model_validate(resource_type) for resource_type in page], page.next_cursor)
+        return _cache.get_or_load(("all", limit, after), load)
 
     def get_resource_type_by_id(self, db: Session, resource_type_id: int):
-        resource_type = self.resource_type_repository.get_by_id(db, resource_type_id)
-        if not resource_type:
-            raise HTTPException(status_code=404, detail="ResourceType not found")
-        return resource_type
+        def load():
+            resource_type = self.resource_type_repository.get_by_id(db, resource_type_id)
+            if not resource_type:
+                raise HTTPException(status_code=404, detail="ResourceType not found")
+            return ResourceTypeResponse.model_validate(resource_type)
+        return _cache.get_or_load(resource_type_id, load)
 
     def create_resource_type(self, db: Session, resource_type: ResourceTypeCreate):
-        return self.resource_type_repository.create(db, resource_type)
+        created = self.resource_type_repository.create(db, resource_type)
+        _cache.invalidate()
+        return created
 
     def update_resource_type(self, db: Session, resource_type_id: int, resource_type_update: ResourceTypeUpdate):
         resource_type = self.resource_type_repository.update(db, resource_type_id, resource_type_update)
         if not resource_type:
             raise HTTPException(status_code=404, detail="ResourceType not found")
+        _cache.invalidate()
         return {"message": "ResourceType uptated successfully"}
 
     def delete_resource_type(self, db: Session, resource_type_id: int):
         resource_type = self.resource_type_repository.delete(db, resource_type_id)
         if not resource_type:
             raise HTTPException(status_code=404, detail="ResourceType not found")
+        _cache.invalidate()
         return {"message": "ResourceType deleted successfully"}
@@ -1,21 +1,36 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.room import RoomRepository
-from app.schemas.room import RoomCreate, RoomUpdate
+from app.schemas.room import RoomCreate, RoomUpdate, RoomFilter, RoomAvailabilityFilter
 
 
 class RoomService:
     def __init__(self):
         self.repository = RoomRepository()
 
-    def get_all_rooms(self, db: Session):
-        rooms = self.repository.get_all(db)
+    def get_all_rooms(self, db: Session, limit: int = None, after: int = None, fields: list[str] = None, filters: RoomFilter = None):
+        if fields:
+            try:
+                rooms = self.repository.get_fields(db, fields, limit, after, filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            rooms = self.repository.get_all(db, limit, after, filters)
         if not rooms:
             raise HTTPException(status_code=404, detail="No rooms found")
         return rooms
 
-    def get_room_by_id(self, db: Session, room_id: int):
-        room = self.repository.get_by_id(db, room_id)
+    def get_available_rooms(self, db: Session, filters: RoomAvailabilityFilter, limit: int = None, after: int = None):
+        return self.repository.get_available(db, filters, limit, after)
+
+    def get_room_by_id(self, db: Session, room_id: int, fields: list[str] = None):
+        if fields:
+            try:
+                room = self.repository.get_fields_by_id(db, room_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            room = self.repository.get_by_id(db, room_id)
         if not room:
             raise HTTPException(status_code=404, detail="Room not found")
         return room
@@ -23,6 +38,9 @@ class RoomService:
     def create_room(self, db: Session, room: RoomCreate):
         return self.repository.create(db, room)
 
+    def create_rooms_bulk(self, db: Session, rooms: list[RoomCreate]):
+        return self.repository.create_bulk(db, rooms)
+
     def update_room(self, db: Session, room_id: int, room_update: RoomUpdate):
         updated_room = self.repository.update(db, room_id, room_update)
         if not updated_room:
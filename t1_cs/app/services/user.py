@@ -2,16 +2,28 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreate, UserUpdate
+from app.dependencies.permissions import invalidate_roles
 
 class UserService:
     def __init__(self):
         self.user_repository = UserRepository()
 
-    def get_all_users(self, db: Session):
-        return self.user_repository.get_all(db)
+    def get_all_users(self, db: Session, limit: int = None, after: int = None, fields: list[str] = None):
+        if fields:
+            try:
+                return self.user_repository.get_fields(db, fields, limit, after)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        return self.user_repository.get_all(db, limit, after)
 
-    def get_user_by_id(self, db: Session, user_id: int):
-        user = self.user_repository.get_by_id(db, user_id)
+    def get_user_by_id(self, db: Session, user_id: int, fields: list[str] = None):
+        if fields:
+            try:
+                user = self.user_repository.get_fields_by_id(db, user_id, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            user = self.user_repository.get_by_id(db, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
@@ -23,10 +35,14 @@ class UserService:
         existing_user = self.user_repository.get_by_id(db, user_id)
         if not existing_user:
             raise HTTPException(status_code=404, detail="User not found")
-        return self.user_repository.update(db, user_id, user_update)
+        updated_user = self.user_repository.update(db, user_id, user_update)
+        invalidate_roles(user_id)
+        return updated_user
 
     def delete_user(self, db: Session, user_id: int):
         existing_user = self.user_repository.get_by_id(db, user_id)
         if not existing_user:
             raise HTTPException(status_code=404, detail="User not found")
-        return self.user_repository.delete(db, user_id)
+        deleted_user = self.user_repository.delete(db, user_id)
+        invalidate_roles(user_id)
+        return deleted_user
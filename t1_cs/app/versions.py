@@ -0,0 +1,97 @@
+import os
+import secrets
+import time
+from itertools import chain
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.cache_backends import get_backend
+
+# Random per store: a restarted process (memory backend) or a flushed Redis starts a new
+# epoch instead of reusing small version numbers that old ETags may still carry
+EPOCH_KEY = "versions:epoch"
+
+# A per-process store never sees the writes other workers or Lambda instances commit,
+# so its versions (and the ETags and cached responses built on them) expire after this
+# many seconds; 0 trusts them indefinitely, which is only safe with a single process
+LOCAL_VERSION_TTL = float(os.getenv("LOCAL_VERSION_TTL", "10"))
+
+
+def _key(table):
+    return f"versions:{table}"
+
+
+class VersionStore:
+    """
+    Per-table version counters in a cache backend.
+
+    With a shared backend (CACHE_BACKEND=redis) every worker sees every bump.
+    With a per-process one the epoch also changes every `local_ttl` seconds,
+    which bounds how long a worker can vouch for data another worker changed.
+    """
+
+    def __init__(self, backend, local_ttl: float = LOCAL_VERSION_TTL, clock=time.monotonic):
+        self.backend = backend
+        self.local_ttl = 0 if backend.shared else local_ttl
+        self.clock = clock
+
+    def get_versions(self, tables):
+        """
+        The store's epoch followed by the current version of each table, in the
+        order given, or None when the backend cannot be reached.
+        """
+        keys = [EPOCH_KEY] + [_key(table) for table in tables]
+        versions = self.backend.counters(keys)
+        if versions is not None and versions[0] == 0:
+            self.backend.init_counter(EPOCH_KEY, secrets.randbits(62) + 1)
+            versions = self.backend.counters(keys)
+        if versions is not None and self.local_ttl:
+            versions[0] += int(self.clock() // self.local_ttl)
+        return versions
+
+    def bump(self, tables):
+        for table in tables:
+            self.backend.incr(_key(table))
+
+
+_store = VersionStore(get_backend())
+
+
+def get_versions(tables):
+    """The versions of `tables` in the application's store; see VersionStore.get_versions."""
+    return _store.get_versions(tables)
+
+
+def bump(tables):
+    _store.bump(tables)
+
+
+def _touched(session):
+    return session.info.setdefault("touched_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    touched = _touched(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        mapper = inspect(obj).mapper
+        touched.add(mapper.local_table.name)
+        # Collection changes on many-to-many relationships write to the association table
+        touched.update(rel.secondary.name for rel in mapper.relationships if rel.secondary is not None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed(orm_execute_state):
+    # Bulk inserts and query-level update()/delete() bypass the unit of work
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _touched(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session):
+    # Bumped only once the rows are visible, so a version never labels uncommitted data
+    bump(session.info.pop("touched_tables", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("touched_tables", None)
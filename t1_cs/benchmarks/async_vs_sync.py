@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compare read throughput of the sync (threadpool) and async (AsyncSession) database paths.
+
+Both modes drive the same app in-process through httpx, swapping only the
+session behind the read routes. By default a temporary SQLite file is seeded
+and used; pass --sync-url/--async-url to point both modes at a real MySQL
+database instead (e.g. mysql+pymysql://... and mysql+aiomysql://...).
+
+    python benchmarks/async_vs_sync.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "true")
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.main import app
+from app.database import Base
+from app.dependencies.database import get_read_db
+from app.models.building import Building
+from app.models.resource import Resource
+from app.models.resource_type import ResourceType
+from app.models.room import Room
+
+
+def seed(url, rooms):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        if db.query(Room).count() == 0:
+            resource_type = ResourceType(name="Projector")
+            building = Building(name="Benchmark", building_number=1, street="Main St", number="1", neighborhood="Downtown", city="City", state="RS", postal_code="90000-000")
+            for i in range(rooms):
+                resource = Resource(description=f"Projector {i}", status="available", resource_type=resource_type)
+                db.add(Room(room_number=i, capacity=30, floor="1", building=building, resources=[resource]))
+            db.commit()
+    engine.dispose()
+
+
+def sync_provider(url):
+    engine = create_engine(url, pool_size=5, max_overflow=10)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return get_db, engine.dispose
+
+
+def async_provider(url):
+    engine = create_async_engine(url, pool_size=5, max_overflow=10)
+
+    async def get_db():
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    return get_db, engine.dispose
+
+
+async def run(paths, total, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        async def request(i):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies)
+
+
+def report(mode, elapsed, latencies):
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{mode:<6} {len(latencies) / elapsed:>10.1f} req/s"
+        f"   p50 {statistics.median(latencies) * 1000:>7.2f} ms"
+        f"   p95 {p95 * 1000:>7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--sync-url")
+    parser.add_argument("--async-url")
+    args = parser.parse_args()
+
+    if bool(args.sync_url) != bool(args.async_url):
+        parser.error("--sync-url and --async-url must be given together")
+    if args.sync_url:
+        sync_url, async_url = args.sync_url, args.async_url
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+        sync_url, async_url = f"sqlite:///{path}", f"sqlite+aiosqlite:///{path}"
+    seed(sync_url, args.rooms)
+
+    paths = ["/rooms/?limit=50"] + [f"/rooms/{room_id}" for room_id in range(1, 21)]
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for mode, provider in (("sync", sync_provider(sync_url)), ("async", async_provider(async_url))):
+        get_db, dispose = provider
+        app.dependency_overrides[get_read_db] = get_db
+        try:
+            elapsed, latencies = asyncio.run(run(paths, args.requests, args.concurrency))
+        finally:
+            app.dependency_overrides.clear()
+            result = dispose()
+            if asyncio.iscoroutine(result):
+                asyncio.run(result)
+        report(mode, elapsed, latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark every GET route in routes.json against a seeded database.
+
+The app is called in-process through httpx's ASGI transport with its session
+dependencies pointed at the benchmark database. For each route the script
+records p50/p95/p99 latency and the number of SQL statements per request
+(read from the Server-Timing header), and writes them to a JSON baseline.
+With --compare, the run is checked against an earlier baseline and routes
+that got slower than --threshold, or that run more queries, are flagged.
+
+    python benchmarks/endpoints.py --buildings 50 --rooms 5000 --lessons 200000 \\
+        --reservations 500000 --output benchmarks/baselines/large.json
+    python benchmarks/endpoints.py --compare benchmarks/baselines/large.json
+
+Write routes are not benchmarked: they would change the dataset between runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import the app
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TESTING", "true")
+
+import httpx
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.script import generate_campus
+from app.database import Base
+from app.cache import clear_caches
+from app.dependencies.database import get_db, get_read_db
+from app.instrumentation import InstrumentedQueuePool, instrument_engine
+from app.models.building import Building
+from app.models.class_model import Class
+from app.models.curriculum import Curriculum
+from app.models.discipline import Discipline
+from app.models.evaluation import Evaluation
+from app.models.lesson import Lesson
+from app.models.profile import Profile
+from app.models.reservation import Reservation
+from app.models.resource import Resource
+from app.models.resource_type import ResourceType
+from app.models.room import Room
+from app.models.user import User
+
+ROUTES_FILE = os.path.join(os.path.dirname(ROOT), "routes.json")
+
+# Path parameters filled with the id of an existing row of this table
+PARAM_TABLES = {
+    "building_id": Building, "room_id": Room, "resource_id": Resource, "resource_type_id": ResourceType,
+    "lesson_id": Lesson, "reservation_id": Reservation, "class_id": Class, "discipline_id": Discipline,
+    "curriculum_id": Curriculum, "evaluation_id": Evaluation, "user_id": User, "profile_id": Profile,
+}
+
+# Required query parameters of routes that have them
+QUERY_PARAMS = {
+    "/rooms/available": {"date": "2024-03-04"},
+}
+
+# Routes that measure infrastructure rather than the API
+SKIPPED = {"/metrics", "/openapi.json", "/docs", "/redoc"}
+
+
+def seed(engine, buildings, rooms, lessons, reservations):
+    """Seed a campus of the given size with app.script's generator, unless the database already has one."""
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(Room.__table__)).scalar():
+            return
+    generate_campus(
+        engine, buildings=buildings, rooms=rooms, professors=max(10, rooms // 20), disciplines=max(10, rooms // 50),
+        curriculums=10, classes=max(10, lessons // 40), lessons=lessons, reservations=reservations,
+    )
+
+
+def load_routes(path=ROUTES_FILE):
+    """GET routes from routes.json that the app serves."""
+    with open(path) as f:
+        listed = json.load(f)
+    served = {route.path for route in app.routes if hasattr(route, "methods") and "GET" in route.methods}
+    return [route["path"] for route in listed if "GET" in route["methods"] and route["path"] in served and route["path"] not in SKIPPED]
+
+
+def fill(path, db):
+    """Replace each {param} in `path` with an id from the seeded data, or return None if one is unknown."""
+    def replace(match):
+        model = PARAM_TABLES.get(match.group(1))
+        if model is None:
+            raise KeyError(match.group(1))
+        return str(db.execute(select(func.min(model.id))).scalar())
+
+    try:
+        return re.sub(r"\{(\w+)\}", replace, path)
+    except KeyError:
+        return None
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def measure(paths, requests, warmup, cold):
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        for route, url in paths.items():
+            params = QUERY_PARAMS.get(route)
+            latencies, queries, statuses = [], [], set()
+            for i in range(warmup + requests):
+                if cold:
+                    clear_caches()
+                started = time.perf_counter()
+                response = await client.get(url, params=params)
+                elapsed = time.perf_counter() - started
+                if i < warmup:
+                    continue
+                latencies.append(elapsed)
+                statuses.add(response.status_code)
+                match = re.search(r'desc="(\d+) queries"', response.headers.get("server-timing", ""))
+                queries.append(int(match.group(1)) if match else 0)
+            results[f"GET {route}"] = {
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+                "queries": max(queries),
+                "status": sorted(statuses),
+            }
+            print(f"{route:<40} p50 {results[f'GET {route}']['p50_ms']:>9.2f} ms  p95 {results[f'GET {route}']['p95_ms']:>9.2f} ms  "
+                  f"p99 {results[f'GET {route}']['p99_ms']:>9.2f} ms  {max(queries):>4} queries  {sorted(statuses)}")
+    return results
+
+
+def compare(current, baseline, threshold, min_delta_ms=1.0):
+    """
+    Routes whose p95 grew by more than `threshold` (a fraction) and at least
+    `min_delta_ms`, or that run more queries than in the baseline.
+    """
+    regressions = []
+    for route, result in current["routes"].items():
+        before = baseline["routes"].get(route)
+        if before is None:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + threshold) and result["p95_ms"] - before["p95_ms"] >= min_delta_ms:
+            regressions.append(f"{route}: p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{route}: queries {before['queries']} -> {result['queries']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--buildings", type=int, default=10)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--lessons", type=int, default=10000)
+    parser.add_argument("--reservations", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=50, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--cold", action="store_true", help="clear the caches before every request")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file; an existing dataset is reused")
+    parser.add_argument("--routes", default=ROUTES_FILE)
+    parser.add_argument("--output", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="baseline to compare against; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95 slowdown for --compare (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+    engine = create_engine(url, poolclass=InstrumentedQueuePool)
+    instrument_engine(engine)
+    started = time.perf_counter()
+    seed(engine, args.buildings, args.rooms, args.lessons, args.reservations)
+    print(f"Dataset ready in {time.perf_counter() - started:.1f} s ({url})")
+
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def benchmark_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = benchmark_db
+    app.dependency_overrides[get_read_db] = benchmark_db
+    try:
+        with factory() as db:
+            paths = {route: fill(route, db) for route in load_routes(args.routes)}
+        paths = {route: url for route, url in paths.items() if url is not None}
+        results = asyncio.run(measure(paths, args.requests, args.warmup, args.cold))
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    run = {
+        "meta": {
+            "buildings": args.buildings, "rooms": args.rooms, "lessons": args.lessons, "reservations": args.reservations,
+            "requests": args.requests, "cold": args.cold, "python": platform.python_version(), "database": engine.dialect.name,
+        },
+        "routes": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(run, json.load(f), args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
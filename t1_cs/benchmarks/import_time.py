@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Break down the import time of the app per module, as `python -X importtime` reports it.
+
+Each run uses a fresh interpreter, so the numbers are what a cold Lambda
+container pays before it can serve its first request.
+
+    python benchmarks/import_time.py --lazy --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module="app.main", env=None):
+    """
+    Import `module` in a new interpreter and return {module: (self_us, cumulative_us)}
+    for every module it imported, with `env` added to the environment.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--lazy", action="store_true", help="import with LAZY_ROUTERS=true")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    times = import_times(args.module, {"LAZY_ROUTERS": "true" if args.lazy else "false"})
+    print(f"{args.module}: {times[args.module][1] / 1000:.1f} ms, {len(times)} modules")
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
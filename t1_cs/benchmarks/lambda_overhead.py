@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure the per-invocation overhead of lambda_handler, without the app itself.
+
+The Mangum handler is replaced by a stub that returns a canned response, so
+the timings cover only what lambda_handler does around it (event parsing,
+route lookup, logging). The stage-stripping ASGI layer is timed separately
+around a no-op app.
+
+    python benchmarks/lambda_overhead.py --invocations 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the handler
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "true")
+
+import simple_lambda_handler
+from simple_lambda_handler import StripStagePrefix, lambda_handler
+
+EVENTS = {
+    "rest /Prod/rooms/{id}": {"httpMethod": "GET", "path": "/Prod/rooms/42", "requestContext": {"stage": "Prod"}},
+    "rest /Prod/unknown": {"httpMethod": "GET", "path": "/Prod/unknown/path", "requestContext": {"stage": "Prod"}},
+    "http /rooms/available": {"rawPath": "/rooms/available", "requestContext": {"http": {"method": "GET", "path": "/rooms/available"}}},
+}
+
+
+def time_handler(event, invocations):
+    started = time.perf_counter()
+    for _ in range(invocations):
+        lambda_handler(event, None)
+    return (time.perf_counter() - started) / invocations
+
+
+def time_stage_layer(invocations):
+    async def noop(scope, receive, send):
+        pass
+
+    layer = StripStagePrefix(noop, "Prod")
+    scope = {"type": "http", "path": "/Prod/rooms/42", "raw_path": b"/Prod/rooms/42"}
+
+    async def run():
+        started = time.perf_counter()
+        for _ in range(invocations):
+            await layer(scope, None, None)
+        return (time.perf_counter() - started) / invocations
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invocations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Warnings for unmatched paths would dominate the timings
+    simple_lambda_handler.logger.setLevel("ERROR")
+    simple_lambda_handler.handler = lambda event, context: {"statusCode": 200, "body": "{}"}
+
+    for name, event in EVENTS.items():
+        print(f"{name:<24} {time_handler(event, args.invocations) * 1e6:>8.2f} us/invocation")
+    print(f"{'StripStagePrefix':<24} {time_stage_layer(args.invocations) * 1e6:>8.2f} us/invocation")
+
+
+if __name__ == "__main__":
+    main()
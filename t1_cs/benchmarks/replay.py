@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded request log against the app and report per-route latency and errors.
+
+The log is JSON Lines, one request per line:
+
+    {"method": "GET", "path": "/rooms/12", "query": {"limit": 50}, "body": null}
+
+Lines without "method" and "path" are skipped. Requests are attributed to
+the route templates in routes.json. They are sent in-process, either
+straight to the ASGI app (--target app) or through lambda_handler with API
+Gateway events (--target lambda), at --concurrency in flight and at most
+--rate per second. Without --log, a log of GET requests is generated from
+routes.json. The database is a seeded temporary SQLite file unless
+--database-url points elsewhere.
+
+    python benchmarks/replay.py --log traffic.jsonl --target lambda --concurrency 20 --rate 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import the app
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TESTING", "true")
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.dependencies.database import get_db, get_read_db
+from benchmarks.endpoints import QUERY_PARAMS, ROUTES_FILE, SKIPPED, percentile, seed
+
+
+def read_log(path):
+    """Requests of a JSON Lines log; lines that are not requests are skipped."""
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict) and "method" in entry and "path" in entry:
+                requests.append({"method": entry["method"].upper(), "path": entry["path"], "query": entry.get("query"), "body": entry.get("body")})
+    return requests
+
+
+def generate_log(routes, count, ids, rng):
+    """`count` GET requests spread over the GET routes, with ids drawn from 1..`ids`."""
+    templates = [route["path"] for route in routes if "GET" in route["methods"] and route["path"] not in SKIPPED]
+    requests = []
+    for _ in range(count):
+        template = rng.choice(templates)
+        path = re.sub(r"\{\w+\}", lambda match: str(rng.randint(1, ids)), template)
+        requests.append({"method": "GET", "path": path, "query": QUERY_PARAMS.get(template), "body": None})
+    return requests
+
+
+class RouteMatcher:
+    """Maps a concrete path and method to its route template from routes.json."""
+
+    def __init__(self, routes):
+        self.patterns = []
+        for route in routes:
+            # Literal segments first so /rooms/available wins over /rooms/{room_id}
+            regex = re.compile("^" + re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(route["path"])) + "$")
+            self.patterns.append((route["path"].count("{"), regex, set(route["methods"]), route["path"]))
+        self.patterns.sort(key=lambda pattern: pattern[0])
+
+    def match(self, method, path):
+        for _, regex, methods, template in self.patterns:
+            if method in methods and regex.match(path):
+                return f"{method} {template}"
+        return f"{method} unmatched"
+
+
+def lambda_event(request, stage="Prod"):
+    query = {key: str(value) for key, value in (request["query"] or {}).items()}
+    return {
+        "resource": "/{proxy+}",
+        "path": f"/{stage}{request['path']}",
+        "httpMethod": request["method"],
+        "headers": {"Host": "replay.execute-api.local", "Content-Type": "application/json"},
+        "multiValueHeaders": {},
+        "queryStringParameters": query or None,
+        "multiValueQueryStringParameters": {key: [value] for key, value in query.items()} or None,
+        "requestContext": {"stage": stage, "resourcePath": "/{proxy+}", "httpMethod": request["method"], "path": f"/{stage}{request['path']}"},
+        "body": json.dumps(request["body"]) if request["body"] is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+async def replay(requests, matcher, target, concurrency, rate):
+    """Send every request and return ({route: [(seconds, status)]}, elapsed seconds)."""
+    samples = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    if target == "lambda":
+        from simple_lambda_handler import lambda_handler as handler
+        # Mangum runs the app on the calling thread's event loop, so every worker needs one
+        executor = ThreadPoolExecutor(concurrency, initializer=lambda: asyncio.set_event_loop(asyncio.new_event_loop()))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay") as client:
+        async def send(request):
+            if target == "lambda":
+                response = await loop.run_in_executor(executor, handler, lambda_event(request), None)
+                return int(response["statusCode"])
+            response = await client.request(request["method"], request["path"], params=request["query"], json=request["body"])
+            return response.status_code
+
+        async def run(i, request):
+            if rate:
+                # Paced from the start time, so slow responses do not lower the offered rate
+                delay = started + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            async with semaphore:
+                sent = time.perf_counter()
+                try:
+                    status = await send(request)
+                except Exception:
+                    status = 599
+                samples.setdefault(matcher.match(request["method"], request["path"]), []).append((time.perf_counter() - sent, status))
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(run(i, request) for i, request in enumerate(requests)))
+        finally:
+            if target == "lambda":
+                executor.shutdown()
+        return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    routes = {}
+    for route, results in sorted(samples.items()):
+        latencies = [seconds for seconds, _ in results]
+        routes[route] = {
+            "requests": len(results),
+            "throughput_rps": round(len(results) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "client_error_rate": round(sum(400 <= status < 500 for _, status in results) / len(results), 4),
+            "error_rate": round(sum(status >= 500 for _, status in results) / len(results), 4),
+        }
+    total = sum(len(results) for results in samples.values())
+    return {"requests": total, "elapsed_s": round(elapsed, 3), "throughput_rps": round(total / elapsed, 2), "routes": routes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--log", help="JSON Lines request log; generated from routes.json when omitted")
+    parser.add_argument("--generate", type=int, default=2000, help="requests to generate without --log")
+    parser.add_argument("--routes", default=ROUTES_FILE)
+    parser.add_argument("--target", choices=("app", "lambda"), default="app")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=0, help="requests per second; 0 sends as fast as possible")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the generated log")
+    parser.add_argument("--database-url", help="defaults to a seeded temporary SQLite file")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's per-request logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Replayed traffic is full of 404s; keep the per-request logs out of the report
+        os.environ["LOG_LEVEL"] = "CRITICAL"
+        for name in ("app", "database"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    with open(args.routes) as f:
+        routes = json.load(f)
+    requests = read_log(args.log) if args.log else generate_log(routes, args.generate, 10, random.Random(args.seed))
+    if not requests:
+        parser.error(f"{args.log} contains no requests")
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'replay.db')}"
+    engine = create_engine(url)
+    if not args.database_url:
+        seed(engine, buildings=10, rooms=500, lessons=10000, reservations=20000)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def replay_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = replay_db
+    app.dependency_overrides[get_read_db] = replay_db
+    try:
+        samples, elapsed = asyncio.run(replay(requests, RouteMatcher(routes), args.target, args.concurrency, args.rate))
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    report = summarize(samples, elapsed)
+    print(f"{report['requests']} requests in {report['elapsed_s']:.2f} s ({report['throughput_rps']:.1f} req/s) via {args.target}")
+    for route, stats in report["routes"].items():
+        print(f"{route:<50} {stats['requests']:>6}  p50 {stats['p50_ms']:>8.2f}  p95 {stats['p95_ms']:>8.2f}  "
+              f"p99 {stats['p99_ms']:>8.2f} ms  4xx {stats['client_error_rate']:>6.1%}  5xx {stats['error_rate']:>6.1%}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Build step that writes the OpenAPI schema to app/openapi.json.
+
+The app serves this file as pre-encoded bytes (with the stage's "servers"
+entry patched in) instead of generating the schema on the first /docs or
+/openapi.json request, which in Lambda would happen in a cold container.
+Run it whenever routes or schemas change, e.g. while building the image.
+"""
+
+import os
+import sys
+
+# Add this directory to the path so we can import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.main import app, routers
+from app.openapi import OPENAPI_ARTIFACT, build_openapi_schema, encode_schema
+
+
+def build_openapi(path=OPENAPI_ARTIFACT):
+    """Write the encoded schema to `path` and return the number of bytes written."""
+    # With LAZY_ROUTERS (as in the Lambda image) nothing is registered yet
+    routers.load_all()
+    body = encode_schema(build_openapi_schema(app))
+    with open(path, "wb") as f:
+        f.write(body)
+    return len(body)
+
+
+if __name__ == "__main__":
+    size = build_openapi()
+    print(f"OpenAPI schema ({size} bytes) written to {OPENAPI_ARTIFACT}")
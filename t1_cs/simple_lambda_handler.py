@@ -1,14 +1,14 @@
 import os
+import re
 import sys
 import json
 import logging
 import traceback
 from typing import Dict, Any
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from mangum import Mangum
-from app.main import app
+from app.main import app, routers
 
 test_app = FastAPI()
 
@@ -20,131 +20,131 @@ def lambda_test():
 # Use the original app but add our test endpoint
 app.mount("/test-lambda", test_app)
 
-# Configure logging
+# Configure logging; per-request messages are DEBUG and only formatted when enabled
 logger = logging.getLogger("simple_lambda_handler")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 if not logger.handlers:
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
     logger.addHandler(handler)
 
-# Initialize logging
-logger.info("FastAPI application initialized")
+# API Gateway stage whose prefix is stripped from incoming paths
+api_stage = os.environ.get("API_STAGE", "Prod")
 
-# Log important environment variables
-logger.info("Environment check: Lambda execution environment ready")
 
-# Configure Mangum handler for API Gateway integration
-handler = Mangum(
-    app,
-    lifespan="off",
-    api_gateway_base_path="Prod"
-)
+class StripStagePrefix:
+    """ASGI layer that removes the API Gateway stage prefix (e.g. /Prod) from request paths."""
+
+    def __init__(self, app, stage: str):
+        self.app = app
+        self.prefix = f"/{stage}"
+        self.raw_prefix = self.prefix.encode()
+
+    def strip(self, path: str) -> str:
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return path[len(self.prefix):] or "/"
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = self.strip(scope["path"])
+            if path is not scope["path"]:
+                scope = dict(scope)
+                scope["path"] = path
+                raw_path = scope.get("raw_path")
+                if raw_path and raw_path.startswith(self.raw_prefix):
+                    scope["raw_path"] = raw_path[len(self.raw_prefix):] or b"/"
+        await self.app(scope, receive, send)
+
+
+class RouteIndex:
+    """
+    Matches request paths against every route template with one compiled regex.
+
+    Built from the routes' own path regexes, so templated paths such as
+    /rooms/{room_id} match. Routers that LAZY_ROUTERS has not loaded yet are
+    recognised by their prefix, and the index is rebuilt when they load.
+    """
+
+    def __init__(self, app, registry):
+        self.app = app
+        self.registry = registry
+        self._size = None
+        self._pattern = None
+
+    def _build(self):
+        patterns = [
+            # Named groups would clash between routes sharing a parameter name
+            re.sub(r"\(\?P<\w+>", "(?:", route.path_regex.pattern).lstrip("^").rstrip("$")
+            for route in self.app.routes
+            if isinstance(route, APIRoute)
+        ]
+        self._pattern = re.compile("^(?:%s)$" % "|".join(patterns))
+        self._size = len(self.app.routes)
+
+    def matches(self, path: str) -> bool:
+        if self._size != len(self.app.routes):
+            self._build()
+        if self._pattern.match(path) is not None:
+            return True
+        owner = self.registry.owner(path)
+        return owner is not None and owner not in self.registry.loaded
+
+
+route_index = RouteIndex(app, routers)
+
+# Configure Mangum handler for API Gateway integration; the stage prefix is stripped by StripStagePrefix
+stage_layer = StripStagePrefix(app, api_stage)
+handler = Mangum(stage_layer, lifespan="off")
+
+logger.info("Lambda handler initialized for stage %s", api_stage)
+
+
+def event_route(event: Dict[str, Any]):
+    """(method, path) of an API Gateway REST (v1) or HTTP API (v2) event."""
+    http = event.get("requestContext", {}).get("http")
+    if http is not None:
+        return http.get("method", "UNKNOWN"), http.get("path", event.get("rawPath", "UNKNOWN"))
+    return event.get("httpMethod", "UNKNOWN"), event.get("path", "UNKNOWN")
 
-logger.info("Mangum configured with api_gateway_base_path=Prod")
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler for FastAPI application.
-    
-    Handles API Gateway integration and path normalization.
-    
+
+    Handles API Gateway integration; path normalization happens in StripStagePrefix.
+
     Args:
         event: AWS Lambda event
         context: AWS Lambda context
-        
+
     Returns:
         Response dictionary
     """
-    request_id = context.aws_request_id if hasattr(context, 'aws_request_id') else "unknown"
-    logger.info(f"Request ID: {request_id}")
-    
     try:
-        # Log the event for debugging
-        logger.debug(f"Received event: {json.dumps(event)}")
-        
-        # Extract path for logging with more robust fallbacks
-        path = event.get('path', event.get('rawPath', event.get('requestContext', {}).get('path', 'UNKNOWN')))
-        method = event.get('httpMethod', event.get('requestContext', {}).get('http', {}).get('method',
-                        event.get('requestContext', {}).get('httpMethod', 'UNKNOWN')))
-        
-        # Handle API Gateway v2 format (HTTP API)
-        if 'requestContext' in event and 'http' in event['requestContext']:
-            path = event['requestContext']['http'].get('path', path)
-            method = event['requestContext']['http'].get('method', method)
-        
-        logger.info(f"Processing request: {method} {path}")
-        
-        # Log essential request details
-        logger.debug(f"Path: {path}, Method: {method}")
-        
-        # Extract API stage from the path and set it as an environment variable
-        # This helps FastAPI configure the correct OpenAPI URL
-        if 'requestContext' in event and 'stage' in event['requestContext']:
-            stage = event['requestContext']['stage']
-            os.environ['API_STAGE'] = stage
-            logger.info(f"Setting API_STAGE environment variable to: {stage}")
-        elif path.startswith('/Prod/'):
-            os.environ['API_STAGE'] = 'Prod'
-            logger.info("Setting API_STAGE environment variable to: Prod (from path)")
-        
-        # Quick route validation
-        request_path = path[5:] if path.startswith('/Prod') else path
-        if request_path == '':
-            request_path = '/'
-            
-        path_exists = any(
-            isinstance(route, APIRoute) and route.path == request_path
-            for route in app.routes
-        )
-        
-        if not path_exists:
-            logger.warning(f"No matching route found for path: {path}")
-        
-        # Handle API Gateway stage prefix in path
-        if path.startswith('/Prod'):
-            modified_event = event.copy()
-            
-            clean_path = path[5:] if path.startswith('/Prod') else path
-            if clean_path == '':
-                clean_path = '/'
-                
-            logger.info(f"Modifying path from '{path}' to '{clean_path}'")
-            
-            if 'path' in modified_event:
-                modified_event['path'] = clean_path
-            
-            if 'rawPath' in modified_event:
-                modified_event['rawPath'] = clean_path
-                
-            if 'requestContext' in modified_event:
-                if 'path' in modified_event['requestContext']:
-                    modified_event['requestContext']['path'] = clean_path
-                
-                if 'http' in modified_event['requestContext'] and 'path' in modified_event['requestContext']['http']:
-                    modified_event['requestContext']['http']['path'] = clean_path
-            
-            logger.info(f"Using modified path: {clean_path}")
-            response = handler(modified_event, context)
-        else:
-            logger.info(f"Using original path: {path}")
-            response = handler(event, context)
-        
-        # Log the response status code
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request ID: %s", getattr(context, "aws_request_id", "unknown"))
+            logger.debug("Received event: %s", json.dumps(event))
+
+        method, path = event_route(event)
+        logger.debug("Processing request: %s %s", method, path)
+
+        if not route_index.matches(stage_layer.strip(path)):
+            logger.warning("No matching route found for path: %s", path)
+
+        response = handler(event, context)
+
         status_code = response.get('statusCode', 'unknown')
-        logger.info(f"Response status code: {status_code}")
-        
-        # Log the response body if it's a 404
+        logger.debug("Response status code: %s", status_code)
         if status_code == 404 or status_code == '404':
-            body = response.get('body', '{}')
-            logger.warning(f"404 Not Found response: {body}")
-        
+            logger.warning("404 Not Found response: %s", response.get('body', '{}'))
+
         return response
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
+        logger.error("Error processing request: %s", e)
         logger.error(traceback.format_exc())
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)}),
             'headers': {'Content-Type': 'application/json'}
-        }
\ No newline at end of file
+        }
@@ -1,7 +1,9 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.database import Base
+from sqlalchemy.pool import StaticPool
+from app.database import Base, DB_EXPIRE_ON_COMMIT
+from app.cache import clear_caches
 from app.main import app
 from fastapi.testclient import TestClient
 import os
@@ -12,8 +14,9 @@ TEST_DATABASE_URL = "sqlite:///:memory:"
 @pytest.fixture(scope="session")
 def test_engine():
     """Create a test database engine."""
-    # Use in-memory SQLite for testing
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+    # Use in-memory SQLite for testing; StaticPool shares the single in-memory
+    # connection with the threadpool that runs sync routes under TestClient
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
     yield engine
 
 @pytest.fixture(scope="function")
@@ -23,7 +26,7 @@ def test_db(test_engine):
     Base.metadata.create_all(bind=test_engine)
     
     # Create a new session
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=DB_EXPIRE_ON_COMMIT, bind=test_engine)
     db = TestingSessionLocal()
     
     try:
@@ -34,9 +37,128 @@ def test_db(test_engine):
         db.close()
         # Drop all tables to ensure a clean state for the next test
         Base.metadata.drop_all(bind=test_engine)
+        clear_caches()
 
 @pytest.fixture(scope="module")
 def client():
     """Create a test client for the FastAPI app."""
     with TestClient(app) as c:
-        yield c
\ No newline at end of file
+        yield c
+
+@pytest.fixture(scope="function")
+def api_client(test_db):
+    """Create a test client whose database dependency uses the test session."""
+    from app.dependencies.database import get_db, get_read_db
+
+    def override_get_db():
+        yield test_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def seed_reservations(test_db):
+    """Seed `count` reservations, each with its own lesson, class, room, building and resource."""
+    from datetime import date, time
+    from app.models.building import Building
+    from app.models.class_model import Class
+    from app.models.discipline import Discipline
+    from app.models.evaluation import Evaluation
+    from app.models.lesson import Lesson
+    from app.models.profile import Profile
+    from app.models.reservation import Reservation
+    from app.models.resource import Resource
+    from app.models.resource_type import ResourceType
+    from app.models.room import Room
+    from app.models.user import User
+
+    def seed(count):
+        profile = Profile(name="Professor")
+        resource_type = ResourceType(name="Projector")
+        test_db.add_all([profile, resource_type])
+        test_db.commit()
+
+        for i in range(count):
+            professor = User(email=f"prof{i}@example.com", name=f"Prof {i}", birth_date=date(1980, 1, 1), gender="Female", profile_id=profile.id)
+            building = Building(name=f"Building {i}", building_number=i, street="Main St", number="1", neighborhood="Downtown", city="City", state="RS", postal_code="90000-000")
+            discipline = Discipline(name=f"Discipline {i}", credits=4, program="Program", bibliography="Book")
+            resource = Resource(description=f"Projector {i}", status="available", resource_type=resource_type)
+            room = Room(room_number=100 + i, capacity=30, floor="1", building=building, resources=[resource])
+            class_instance = Class(semester="2024/1", schedule="Mon 10:00-12:00", vacancies=30, discipline=discipline, professor=professor)
+            evaluation = Evaluation(date=date(2024, 5, 1), statement="Exam", type="Written", class_instance=class_instance)
+            lesson = Lesson(date=date(2024, 3, 1), start_time=time(10, 0), end_time=time(12, 0), class_instance=class_instance, room=room, discipline=discipline)
+            test_db.add_all([professor, building, discipline, resource, room, class_instance, evaluation, lesson])
+            test_db.add(Reservation(lesson=lesson, resource=resource, date=lesson.date, start_time=lesson.start_time, end_time=lesson.end_time))
+        test_db.commit()
+        test_db.expunge_all()
+
+    return seed
+
+
+@pytest.fixture(scope="function")
+def fake_redis():
+    """Run a minimal in-memory server speaking the Redis protocol; yields its URL."""
+    import socketserver
+    import threading
+    import time
+
+    store = {}
+    lock = threading.Lock()
+
+    def run(command, args):
+        if command == b"GET":
+            entry = store.get(args[0])
+            return entry[0] if entry and (entry[1] is None or entry[1] > time.monotonic()) else None
+        if command == b"MGET":
+            return [run(b"GET", [key]) for key in args]
+        if command == b"SET":
+            key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+            if b"NX" in options and run(b"GET", [key]) is not None:
+                return None
+            expires = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000 if b"PX" in options else None
+            store[key] = (value, expires)
+            return "OK"
+        if command == b"DEL":
+            return sum(store.pop(key, None) is not None for key in args)
+        if command == b"INCR":
+            value = int(run(b"GET", args) or 0) + 1
+            store[args[0]] = (str(value).encode(), None)
+            return value
+        raise ValueError(command)
+
+    def encode(reply):
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, str):
+            return b"+%s\r\n" % reply.encode()
+        if isinstance(reply, list):
+            return b"*%d\r\n" % len(reply) + b"".join(encode(item) for item in reply)
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while line := self.rfile.readline():
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                with lock:
+                    reply = run(args[0].upper(), args[1:])
+                self.wfile.write(encode(reply))
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
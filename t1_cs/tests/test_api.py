@@ -1,4 +1,5 @@
 import pytest
+import json
 from fastapi.testclient import TestClient
 
 def test_read_root(client):
@@ -17,4 +18,390 @@ def test_db_status(client):
     """Test the database status endpoint."""
     response = client.get("/db-status")
     assert response.status_code == 200
-    assert "status" in response.json()
\ No newline at end of file
+    assert "status" in response.json()
+
+def test_list_endpoints_use_keyset_pagination(api_client, test_db):
+    """Test that list routes page by id and advertise the next cursor."""
+    from datetime import date
+    from app.models.profile import Profile
+    from app.models.user import User
+
+    profile = Profile(name="Professor")
+    test_db.add(profile)
+    test_db.commit()
+    test_db.add_all([
+        User(email=f"user{i}@example.com", name=f"User {i}", birth_date=date(1990, 1, 1), gender="Female", profile_id=profile.id)
+        for i in range(5)
+    ])
+    test_db.commit()
+
+    response = api_client.get("/users/", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [user["name"] for user in first_page] == ["User 0", "User 1"]
+    cursor = response.headers["X-Next-Cursor"]
+    assert cursor == str(first_page[-1]["id"])
+    assert 'rel="next"' in response.headers["Link"]
+
+    response = api_client.get("/users/", params={"limit": 2, "after": cursor})
+    assert [user["name"] for user in response.json()] == ["User 2", "User 3"]
+
+    response = api_client.get("/users/", params={"limit": 2, "after": response.headers["X-Next-Cursor"]})
+    assert [user["name"] for user in response.json()] == ["User 4"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = api_client.get("/users/", params={"limit": 10_000})
+    assert response.status_code == 422
+
+
+def test_sparse_fieldsets_return_only_requested_columns(api_client, test_db):
+    """Test that ?fields= returns flat rows with just the requested columns."""
+    from datetime import date
+    from app.models.profile import Profile
+    from app.models.user import User
+
+    profile = Profile(name="Admin")
+    test_db.add(profile)
+    test_db.commit()
+    user = User(email="ada@example.com", name="Ada", birth_date=date(1990, 1, 1), gender="Female", profile_id=profile.id)
+    test_db.add(user)
+    test_db.commit()
+
+    response = api_client.get("/users/", params={"fields": "name,email"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": user.id, "name": "Ada", "email": "ada@example.com"}]
+
+    response = api_client.get(f"/users/{user.id}", params={"fields": "birth_date"})
+    assert response.json() == {"id": user.id, "birth_date": "1990-01-01"}
+
+    response = api_client.get("/users/", params={"fields": "name,profile"})
+    assert response.status_code == 400
+
+
+def test_bulk_endpoints_report_per_item_results(api_client, test_db, seed_reservations):
+    """Test that bulk creates insert the valid items and report errors for the rest."""
+    from datetime import time
+    from app.models.lesson import Lesson
+    from app.models.reservation import Reservation
+    from app.models.resource import Resource
+    from app.models.user import User
+
+    seed_reservations(1)
+    professor = test_db.query(User).one()
+    seeded = test_db.query(Lesson).one()
+    resource = test_db.query(Resource).one()
+    lesson = {"date": "2024-03-01", "class_id": seeded.class_id, "room_id": seeded.room_id, "discipline_id": seeded.discipline_id}
+
+    response = api_client.post(f"/lessons/bulk/{professor.id}", json=[
+        {**lesson, "start_time": "08:00:00", "end_time": "10:00:00"},
+        {**lesson, "room_id": 999},
+        {**lesson, "start_time": "11:00:00", "end_time": "13:00:00"},
+    ])
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert result["items"][1] == {"index": 1, "id": None, "error": "room_id 999 does not exist"}
+    early, late = result["items"][0]["id"], result["items"][2]["id"]
+    assert test_db.get(Lesson, late).start_time == time(11, 0)
+
+    response = api_client.post(f"/reservations/bulk/{professor.id}", json=[
+        {"lesson_id": early, "resource_id": resource.id},
+        {"lesson_id": late, "resource_id": resource.id},
+        {"lesson_id": early, "resource_id": 999},
+    ])
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert "overlapping" in result["items"][1]["error"]
+    assert result["items"][2]["error"] == "Resource not found"
+    assert test_db.query(Reservation).count() == 2
+
+
+def test_read_routes_run_on_async_session(api_client, test_db, seed_reservations, tmp_path):
+    """Test that every read route serves the same responses through an AsyncSession."""
+    import inspect
+    import re
+    from datetime import date
+    from fastapi.routing import APIRoute
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.cache import clear_caches
+    from app.database import Base
+    from app.dependencies.database import ReadSession, get_read_db
+    from app.models.curriculum import Curriculum
+    from app.models.discipline import Discipline
+
+    seed_reservations(2)
+    test_db.add(Curriculum(course_name="Physics", start_date=date(2024, 1, 1), disciplines=test_db.query(Discipline).all()))
+    test_db.commit()
+    test_db.expunge_all()
+
+    # Every route taking a ReadSession, with its path parameters pointing at the first seeded rows
+    def reads(route):
+        return any(parameter.annotation == ReadSession for parameter in inspect.signature(route.endpoint).parameters.values())
+
+    required_queries = {"/rooms/available": "?date=2024-03-02"}
+    paths = sorted(
+        re.sub(r"\{\w+\}", "1", route.path) + required_queries.get(route.path, "")
+        for route in api_client.app.routes
+        if isinstance(route, APIRoute) and reads(route)
+    )
+    assert "/curriculums/1" in paths and "/users/1" in paths
+    expected = {path: api_client.get(path).json() for path in paths}
+
+    # Copy the seeded rows into a file database the async driver can open
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            rows = [dict(row._mapping) for row in test_db.execute(table.select())]
+            if rows:
+                connection.execute(table.insert(), rows)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    sessions = []
+
+    async def override_get_read_db():
+        async with AsyncSession(async_engine) as db:
+            sessions.append(db)
+            yield db
+
+    api_client.app.dependency_overrides[get_read_db] = override_get_read_db
+    # Nothing may come from the caches filled by the sync pass: every response is loaded again
+    clear_caches()
+    for path in paths:
+        response = api_client.get(path)
+        # A relationship the loader plans missed would lazy-load outside the greenlet and fail here
+        assert response.status_code == 200, (path, response.json())
+        assert response.json() == expected[path], path
+    assert api_client.get("/reservations/999").status_code == 404
+    assert len(sessions) == len(paths) + 1
+
+
+def test_permission_checks_use_cached_roles(api_client, test_db, seed_reservations):
+    """Test that the requester's role is cached and refreshed when the user changes."""
+    from app.models.profile import Profile
+    from app.models.reservation import Reservation
+    from app.models.user import User
+    from app.schemas.user import UserUpdate
+    from app.services.user import UserService
+
+    seed_reservations(2)
+    professor = test_db.query(User).first()
+    first, second = [reservation.id for reservation in test_db.query(Reservation).order_by(Reservation.id)]
+    admin = Profile(name="Admin")
+    test_db.add(admin)
+    test_db.commit()
+
+    assert api_client.delete(f"/reservations/cancel_reservation/{first}/{professor.id}").status_code == 200
+    # A change made behind the services' back is not seen until the cached role expires
+    test_db.query(User).filter(User.id == professor.id).update({"profile_id": admin.id})
+    test_db.commit()
+    assert api_client.delete(f"/reservations/cancel_reservation/{first}/{professor.id}").status_code == 404
+
+    UserService().update_user(test_db, professor.id, UserUpdate(
+        email=professor.email, name=professor.name, birth_date=professor.birth_date, gender=professor.gender, profile_id=admin.id,
+    ))
+    response = api_client.delete(f"/reservations/cancel_reservation/{second}/{professor.id}")
+    assert response.status_code == 403
+    assert api_client.delete(f"/reservations/cancel_reservation/{second}/999").status_code == 404
+
+
+def test_permission_check_and_route_share_one_session(api_client, test_db, seed_reservations):
+    """Test that a write resolves the requester's role and runs the service on the same request session."""
+    from app.dependencies.database import get_db
+    from app.dependencies.permissions import invalidate_roles
+    from app.main import app
+    from app.models.reservation import Reservation
+    from app.models.user import User
+
+    seed_reservations(1)
+    professor = test_db.query(User).one()
+    reservation = test_db.query(Reservation).one()
+    invalidate_roles()
+    sessions = []
+
+    def counting_get_db():
+        sessions.append(test_db)
+        yield test_db
+
+    app.dependency_overrides[get_db] = counting_get_db
+    assert api_client.delete(f"/reservations/cancel_reservation/{reservation.id}/{professor.id}").status_code == 200
+    assert len(sessions) == 1
+
+
+def test_conditional_get_returns_304_until_table_changes(api_client, test_db, seed_reservations, test_engine):
+    """Test that list and detail routes honour If-None-Match until a table they read is written."""
+    from sqlalchemy import event
+    from app.models.building import Building
+    from app.models.resource import Resource
+
+    seed_reservations(1)
+    room_id = test_db.query(Building).one().rooms[0].id
+
+    response = api_client.get("/rooms/")
+    tag = response.headers["ETag"]
+    assert api_client.get("/rooms/", params={"limit": 5}).headers["ETag"] != tag
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine, "before_cursor_execute", record)
+    response = api_client.get("/rooms/", headers={"If-None-Match": tag})
+    event.remove(test_engine, "before_cursor_execute", record)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == tag
+    assert statements == []
+
+    detail_tag = api_client.get(f"/rooms/{room_id}").headers["ETag"]
+    # Rooms embed their resources, so writing a resource changes the rooms' tags
+    resource = test_db.query(Resource).one()
+    resource.description = "Old projector"
+    test_db.commit()
+    assert api_client.get("/rooms/", headers={"If-None-Match": tag}).status_code == 200
+    response = api_client.get(f"/rooms/{room_id}", headers={"If-None-Match": detail_tag})
+    assert response.status_code == 200
+    assert response.json()["resources"][0]["description"] == "Old projector"
+
+    # Tables a response does not read leave its tag alone
+    tag = api_client.get("/buildings/").headers["ETag"]
+    resource.description = "Projector"
+    test_db.commit()
+    assert api_client.get("/buildings/", headers={"If-None-Match": tag}).status_code == 304
+
+
+def test_list_responses_are_served_from_serialized_cache(api_client, test_db, seed_reservations, test_engine):
+    """Test that hot list routes replay cached JSON bytes until one of their tables changes."""
+    from sqlalchemy import event
+    from app.cache import cache_stats
+    from app.models.building import Building
+
+    seed_reservations(3)
+    first = api_client.get("/rooms/", params={"limit": 2})
+    before = cache_stats()["responses"]
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine, "before_cursor_execute", record)
+    second = api_client.get("/rooms/", params={"limit": 2})
+    event.remove(test_engine, "before_cursor_execute", record)
+    assert statements == []
+    assert second.content == first.content
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert cache_stats()["responses"]["hits"] == before["hits"] + 1
+
+    building = test_db.query(Building).first()
+    building.name = "Renamed"
+    test_db.commit()
+    third = api_client.get("/rooms/", params={"limit": 2})
+    assert third.json()[0]["building"]["name"] == "Renamed"
+    assert cache_stats()["responses"]["invalidations"] == before["invalidations"] + 1
+
+
+def test_openapi_schema_is_served_from_build_artifact(client, tmp_path, monkeypatch):
+    """Test that /openapi.json serves the prebuilt artifact with the servers entry patched in."""
+    from app import main, openapi
+
+    schema = openapi.build_openapi_schema(main.app)
+    schema["info"]["title"] = "Prebuilt"
+    artifact = tmp_path / "openapi.json"
+    artifact.write_bytes(openapi.encode_schema(schema))
+    monkeypatch.setattr(openapi, "OPENAPI_ARTIFACT", str(artifact))
+    main.openapi_bytes.cache_clear()
+    main.app.openapi_schema = None
+    try:
+        response = client.get("/openapi.json")
+        assert response.status_code == 200
+        served = response.json()
+        assert served["servers"] == [{"url": ""}]
+        assert served["info"]["title"] == "Prebuilt"
+        assert served["paths"] == json.loads(json.dumps(schema["paths"]))
+        assert "/rooms/available" in served["paths"]
+        assert client.get("/docs").status_code == 200
+    finally:
+        main.openapi_bytes.cache_clear()
+        main.app.openapi_schema = None
+
+
+def test_server_timing_counts_queries_and_flags_repeated_statements(caplog):
+    """Test that each request reports its SQL in Server-Timing and repeated statement shapes are logged."""
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine, text
+    from app.instrumentation import InstrumentedQueuePool, SQLTimingMiddleware, instrument_engine
+
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool)
+    instrument_engine(engine)
+    timed_app = FastAPI()
+    timed_app.add_middleware(SQLTimingMiddleware, threshold=3)
+
+    @timed_app.get("/items/{count}")
+    def list_items(count: int):
+        with engine.connect() as connection:
+            for i in range(count):
+                connection.execute(text("SELECT :i"), {"i": i})
+        return {"count": count}
+
+    with TestClient(timed_app) as timed_client:
+        response = timed_client.get("/items/2")
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert 'desc="2 queries"' in response.headers["Server-Timing"]
+        assert "db-pool;dur=" in response.headers["Server-Timing"]
+        assert "Possible N+1" not in caplog.text
+
+        response = timed_client.get("/items/5")
+        assert 'desc="5 queries"' in response.headers["Server-Timing"]
+        assert "Possible N+1 in GET /items/5 (route list_items): statement ran 5 times" in caplog.text
+    engine.dispose()
+
+
+def test_failed_statements_do_not_skew_query_timing():
+    """Test that a statement that raises leaves no start time behind for the next one to pick up."""
+    import time
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.exc import OperationalError
+    from app.instrumentation import RequestStats, _current, instrument_engine
+
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM no_such_table"))
+            time.sleep(0.05)
+            connection.execute(text("SELECT 1"))
+            assert "query_start" not in connection.info
+    finally:
+        _current.reset(token)
+        engine.dispose()
+    assert stats.statements == 1
+    assert stats.db_time < 0.05
+
+
+def test_metrics_endpoint_exposes_route_histograms_and_pool_gauges(api_client, test_db):
+    """Test that /metrics reports per-route latency and status counts in the Prometheus text format."""
+    from app import metrics
+    from app.database import get_engine
+
+    get_engine()
+    # Process-wide counter that earlier tests may already have moved
+    retries = metrics.db_retries.value
+    api_client.get("/buildings/")
+    api_client.get("/rooms/999")
+    api_client.get("/no-such-route")
+
+    response = api_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/buildings/",le="+Inf"}' in body
+    assert 'http_responses_total{method="GET",route="/rooms/{room_id}",status="404"}' in body
+    assert 'http_responses_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'db_pool_size{engine="sync"}' in body
+    assert f"db_connection_retries_total {retries}\n" in body
+    assert 'cache_hits_total{cache="buildings"}' in body
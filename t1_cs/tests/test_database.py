@@ -11,4 +11,161 @@ def test_database_connection(test_engine):
 def test_database_session(test_db):
     """Test that the database session works."""
     result = test_db.execute(text("SELECT 1")).scalar()
-    assert result == 1
\ No newline at end of file
+    assert result == 1
+
+def test_connection_health_pings_only_idle_or_failed_connections(tmp_path, monkeypatch):
+    """Test that pooled connections are pinged only after idling or failing, and replaced when the ping fails."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError
+    from app.connection_health import ConnectionHealth
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}", pool_size=1)
+    health = ConnectionHealth(idle_seconds=60)
+    health.attach(engine)
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    assert health.stats() == {"pings": 0, "pings_avoided": 3, "ping_failures": 0}
+
+    # A failed statement makes the next checkout ping the connection
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert health.stats()["pings"] == 1
+
+    # An idle connection whose ping fails is discarded and a fresh one is used
+    health.idle_seconds = 0
+    failures = iter([True])
+    original_ping = engine.dialect.do_ping
+
+    def do_ping(dbapi_connection):
+        if next(failures, False):
+            raise OSError("gone away")
+        return original_ping(dbapi_connection)
+
+    monkeypatch.setattr(engine.dialect, "do_ping", do_ping)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    assert health.stats() == {"pings": 2, "pings_avoided": 5, "ping_failures": 1}
+    engine.dispose()
+
+def test_request_session_connects_lazily_and_retries_first_checkout(tmp_path, monkeypatch):
+    """Test that get_db checks out nothing up front and that the first statement retries a failed connect."""
+    import sqlite3
+    from sqlalchemy import create_engine
+    from app import database
+    from app.dependencies.database import get_db
+
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("server has gone away")
+        return sqlite3.connect(str(tmp_path / "retry.db"), check_same_thread=False)
+
+    engine = create_engine("sqlite://", creator=connect)
+    monkeypatch.setattr(database, "TESTING", False)
+    monkeypatch.setattr(database, "RETRY_DELAY", 0)
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+
+    provider = get_db()
+    db = next(provider)
+    assert attempts == []
+
+    assert db.execute(text("SELECT 1")).scalar() == 1
+    assert db.execute(text("SELECT 2")).scalar() == 2
+    assert len(attempts) == 2
+    provider.close()
+    engine.dispose()
+
+def test_generate_campus_is_deterministic_and_consistent(tmp_path):
+    """Test that the campus generator writes the requested sizes, repeatably, with valid foreign keys."""
+    from sqlalchemy import create_engine
+    from app.script import generate_campus
+
+    def generate(name, seed):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        counts = generate_campus(
+            engine, buildings=3, rooms=30, professors=5, disciplines=8, curriculums=2,
+            classes=12, lessons=500, reservations=700, seed=seed, chunk=64,
+        )
+        with engine.connect() as connection:
+            lessons = connection.execute(text("SELECT * FROM lessons ORDER BY id")).all()
+            orphans = connection.execute(text(
+                "SELECT COUNT(*) FROM reservations r JOIN lessons l ON l.id = r.lesson_id "
+                "LEFT JOIN room_resource rr ON rr.resource_id = r.resource_id AND rr.room_id = l.room_id "
+                "WHERE rr.room_id IS NULL OR r.date != l.date OR r.start_time != l.start_time"
+            )).scalar()
+            schedules = connection.execute(text("SELECT COUNT(DISTINCT class_id) FROM class_schedules")).scalar()
+        engine.dispose()
+        return counts, lessons, orphans, schedules
+
+    counts, lessons, orphans, schedules = generate("a.db", seed=1)
+    assert counts["rooms"] == 30 and counts["resources"] == 90 and counts["classes"] == 12
+    assert counts["lessons"] == 500 and counts["reservations"] == 700
+    assert orphans == 0
+    assert schedules == 12
+
+    assert generate("b.db", seed=1)[1] == lessons
+    assert generate("c.db", seed=2)[1] != lessons
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'a.db'}")
+    with pytest.raises(ValueError):
+        generate_campus(engine, lessons=1, reservations=1)
+    engine.dispose()
+
+def test_upgrade_schema_adds_columns_to_tables_from_older_releases(tmp_path):
+    """Test that init-db's upgrade step brings tables created by older models up to date."""
+    from datetime import date, time
+    from sqlalchemy import create_engine, inspect, select
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.models.reservation import Reservation
+    from app.models.resource import Resource
+    from app.repositories.resource import ResourceRepository
+    from app.schema_upgrade import upgrade_schema
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # lessons and reservations as the first release created them
+        connection.exec_driver_sql(
+            "CREATE TABLE lessons (id INTEGER PRIMARY KEY, date DATE NOT NULL, attendance VARCHAR(255), "
+            "class_id INTEGER NOT NULL, room_id INTEGER NOT NULL, discipline_id INTEGER NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE reservations (id INTEGER PRIMARY KEY, observation VARCHAR(255), "
+            "lesson_id INTEGER NOT NULL, resource_id INTEGER NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE resources (id INTEGER PRIMARY KEY, description VARCHAR(255) NOT NULL, "
+            "status VARCHAR(11) NOT NULL, resource_type_id INTEGER NOT NULL)"
+        )
+        connection.exec_driver_sql("INSERT INTO resources VALUES (1, 'Projector', 'available', 1)")
+        connection.exec_driver_sql("INSERT INTO lessons VALUES (1, '2024-03-04', NULL, 1, 1, 1)")
+        connection.exec_driver_sql("INSERT INTO reservations VALUES (1, NULL, 1, 1)")
+
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("lessons")}
+    assert {"start_time", "end_time"} <= columns
+    indexes = {index["name"] for table in ("lessons", "reservations", "resources") for index in inspect(engine).get_indexes(table)}
+    assert {"ix_lessons_room_id_date", "ix_reservations_resource_id_date_slot", "ix_resources_resource_type_id_status"} <= indexes
+    with engine.connect() as connection:
+        slot = connection.execute(select(Reservation.date, Reservation.start_time, Reservation.end_time)).one()
+    # The lesson has no time slot, so its reservation takes the whole day
+    assert tuple(slot) == (date(2024, 3, 4), time(0, 0), time(23, 59, 59))
+
+    # The optimistic claim works on resources that predate the version column
+    with Session(engine) as db:
+        assert db.get(Resource, 1).version == 0
+        assert ResourceRepository().claim(db, 1, 0)
+        db.commit()
+        db.expire_all()
+        assert db.get(Resource, 1).version == 1
+    engine.dispose()
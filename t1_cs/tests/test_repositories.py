@@ -81,4 +81,117 @@ def test_create(test_db):
     # Check that the user was added to the database
     db_user = test_db.query(User).filter(User.email == "new@example.com").first()
     assert db_user is not None
-    assert db_user.name == "New User"
\ No newline at end of file
+    assert db_user.name == "New User"
+
+
+def _count_queries(engine, func):
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+@pytest.mark.parametrize("rows", [1, 10])
+def test_reservation_get_all_uses_fixed_number_of_queries(test_db, test_engine, seed_reservations, rows):
+    """Test that listing reservations does not lazy-load the response graph per row."""
+    from app.repositories.reservation import ReservationRepository
+    from app.schemas.reservation import ReservationResponse
+
+    seed_reservations(rows)
+    repo = ReservationRepository()
+
+    def list_and_serialize():
+        result = repo.get_all(test_db)
+        assert len(result) == rows
+        for reservation in result:
+            ReservationResponse.model_validate(reservation)
+
+    # One query for the joined graph plus one per collection (evaluations, room resources)
+    assert _count_queries(test_engine, list_and_serialize) == 3
+
+
+def test_room_and_lesson_filters_are_applied_in_sql(test_db, seed_reservations):
+    """Test that the room and lesson list filters narrow the query results."""
+    from app.models.lesson import Lesson
+    from app.models.room import Room
+    from app.repositories.lesson import LessonRepository
+    from app.repositories.room import RoomRepository
+    from app.schemas.lesson import LessonFilter
+    from app.schemas.room import RoomFilter
+
+    seed_reservations(3)
+    rooms = test_db.query(Room).order_by(Room.id).all()
+    rooms[0].capacity = 80
+    lessons = test_db.query(Lesson).order_by(Lesson.id).all()
+    lessons[1].date = date(2024, 4, 15)
+    test_db.commit()
+
+    result = RoomRepository().get_all(test_db, filters=RoomFilter(min_capacity=50))
+    assert [room.id for room in result] == [rooms[0].id]
+    result = RoomRepository().get_all(test_db, filters=RoomFilter(building_id=rooms[2].building_id, min_capacity=10))
+    assert [room.id for room in result] == [rooms[2].id]
+
+    result = LessonRepository().get_all(test_db, filters=LessonFilter(date_from=date(2024, 4, 1), date_to=date(2024, 4, 30)))
+    assert [lesson.id for lesson in result] == [lessons[1].id]
+    result = LessonRepository().get_fields(test_db, ["date"], filters=LessonFilter(room_id=lessons[2].room_id))
+    assert result == [{"id": lessons[2].id, "date": date(2024, 3, 1)}]
+
+
+def test_room_availability_search(test_db, seed_reservations):
+    """Test that available rooms exclude booked, too small or unequipped rooms."""
+    from app.models.lesson import Lesson
+    from app.models.resource import Resource
+    from app.models.resource_type import ResourceType
+    from app.models.room import Room
+    from app.repositories.room import RoomRepository
+    from app.schemas.room import RoomAvailabilityFilter
+
+    seed_reservations(4)
+    rooms = test_db.query(Room).order_by(Room.id).all()
+    projector = test_db.query(ResourceType).filter_by(name="Projector").one()
+    whiteboard = ResourceType(name="Whiteboard")
+    test_db.add(whiteboard)
+    test_db.flush()
+    rooms[3].resources = [Resource(description="Whiteboard", status="available", resource_type_id=whiteboard.id)]
+    rooms[2].capacity = 10
+    for lesson in test_db.query(Lesson).filter(Lesson.room_id != rooms[0].id):
+        lesson.date = date(2024, 3, 8)
+    test_db.commit()
+    booked_day = date(2024, 3, 1)
+
+    repo = RoomRepository()
+    result = repo.get_available(test_db, RoomAvailabilityFilter(date=booked_day, min_capacity=20, resource_type_id=projector.id))
+    assert [room.id for room in result] == [rooms[1].id]
+
+    result = repo.get_available(test_db, RoomAvailabilityFilter(date=date(2024, 3, 2)))
+    assert [room.id for room in result] == [room.id for room in rooms]
+
+
+def test_bulk_insert_without_returning_maps_ids_to_rows(test_db, monkeypatch):
+    """Test that the multi-row INSERT path returns each row's id, and falls back when the id range does not hold."""
+    from app.models.resource_type import ResourceType
+    from app.repositories import bulk
+
+    dialect = test_db.get_bind().dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    monkeypatch.setattr(bulk, "BULK_INSERT_CHUNK", 3)
+
+    rows = [{"name": f"Type {i}"} for i in range(7)]
+    ids = bulk.bulk_insert(test_db, ResourceType, rows)
+    assert [test_db.get(ResourceType, id).name for id in ids] == [row["name"] for row in rows]
+
+    # Reading lastrowid as the first id (MySQL's convention) is wrong on SQLite, so the check must catch it
+    monkeypatch.setattr(dialect, "name", "mysql")
+    rows = [{"name": f"Other {i}"} for i in range(4)]
+    ids = bulk.bulk_insert(test_db, ResourceType, rows)
+    assert [test_db.get(ResourceType, id).name for id in ids] == [row["name"] for row in rows]
+    assert test_db.query(ResourceType).count() == 11
@@ -52,4 +52,341 @@ def test_get_user_by_id(test_db):
     # Test with non-existent ID
     with pytest.raises(HTTPException) as excinfo:
         service.get_user_by_id(test_db, 999)
-    assert excinfo.value.status_code == 404
\ No newline at end of file
+    assert excinfo.value.status_code == 404
+
+def test_make_reservation_books_resource_per_time_slot(test_db, seed_reservations):
+    """Test that a resource can be reserved by lessons whose time slots do not overlap."""
+    from datetime import time
+    from app.models.lesson import Lesson
+    from app.models.resource import Resource, ResourceStatus
+    from app.schemas.reservation import ReservationCreate
+    from app.services.reservation import ReservationService
+
+    seed_reservations(1)
+    seeded = test_db.query(Lesson).one()
+    resource = test_db.query(Resource).one()
+    slots = [(time(8, 0), time(10, 0)), (time(11, 0), time(13, 0)), (time(13, 0), time(14, 0))]
+    lessons = [
+        Lesson(date=seeded.date, start_time=start, end_time=end, class_id=seeded.class_id, room_id=seeded.room_id, discipline_id=seeded.discipline_id)
+        for start, end in slots
+    ]
+    test_db.add_all(lessons)
+    test_db.commit()
+
+    service = ReservationService()
+    # 08:00-10:00 ends exactly when the seeded 10:00-12:00 reservation starts
+    reservation = service.make_reservation(test_db, ReservationCreate(lesson_id=lessons[0].id, resource_id=resource.id))
+    assert (reservation.date, reservation.start_time, reservation.end_time) == (seeded.date, time(8, 0), time(10, 0))
+
+    with pytest.raises(HTTPException) as excinfo:
+        service.make_reservation(test_db, ReservationCreate(lesson_id=lessons[1].id, resource_id=resource.id))
+    assert excinfo.value.status_code == 409
+
+    service.make_reservation(test_db, ReservationCreate(lesson_id=lessons[2].id, resource_id=resource.id))
+    test_db.refresh(resource)
+    assert resource.status == ResourceStatus.available
+
+    service.cancel_reservation(test_db, reservation.id)
+    service.make_reservation(test_db, ReservationCreate(lesson_id=lessons[0].id, resource_id=resource.id))
+
+
+def test_rescheduling_a_lesson_never_double_books(test_db, seed_reservations):
+    """Test that moving a lesson is refused when its room or reserved resources are taken at the new slot."""
+    from datetime import time
+    from app.models.lesson import Lesson
+    from app.models.reservation import Reservation
+    from app.models.resource import Resource
+    from app.schemas.lesson import LessonUpdate
+    from app.schemas.reservation import ReservationCreate
+    from app.services.lesson import LessonService
+    from app.services.reservation import ReservationService
+
+    seed_reservations(2)
+    first, second = test_db.query(Lesson).order_by(Lesson.id).all()
+    projector = test_db.query(Reservation).filter(Reservation.lesson_id == first.id).one().resource_id
+    # An afternoon lesson in the second room borrows the first lesson's projector
+    afternoon = Lesson(date=first.date, start_time=time(14, 0), end_time=time(16, 0), class_id=second.class_id, room_id=second.room_id, discipline_id=second.discipline_id)
+    test_db.add(afternoon)
+    test_db.commit()
+    ReservationService().make_reservation(test_db, ReservationCreate(lesson_id=afternoon.id, resource_id=projector))
+
+    service = LessonService()
+    version = test_db.query(Resource.version).filter(Resource.id == projector).scalar()
+    with pytest.raises(HTTPException) as excinfo:
+        service.update_lesson(test_db, first.id, LessonUpdate(date=first.date, start_time=time(15, 0), end_time=time(17, 0)))
+    assert excinfo.value.status_code == 409
+    with pytest.raises(HTTPException) as excinfo:
+        service.update_lesson(test_db, second.id, LessonUpdate(date=second.date, start_time=time(13, 0), end_time=time(15, 0)))
+    assert excinfo.value.status_code == 409
+    assert test_db.get(Lesson, first.id).start_time == time(10, 0)
+
+    moved = service.update_lesson(test_db, first.id, LessonUpdate(date=first.date, start_time=time(16, 0), end_time=time(18, 0)))
+    assert moved.start_time == time(16, 0)
+    reservation = test_db.query(Reservation).filter(Reservation.lesson_id == first.id).one()
+    assert (reservation.start_time, reservation.end_time) == (time(16, 0), time(18, 0))
+    assert test_db.query(Resource.version).filter(Resource.id == projector).scalar() == version + 1
+
+    # Changes that keep the slot need no claim
+    service.update_lesson(test_db, first.id, LessonUpdate(date=first.date, start_time=time(16, 0), end_time=time(18, 0), attendance="30"))
+    assert test_db.query(Resource.version).filter(Resource.id == projector).scalar() == version + 1
+
+
+def test_concurrent_reservations_never_double_book(tmp_path):
+    """Stress make_reservation from many threads and check that no slot is booked twice."""
+    import threading
+    from datetime import time
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.models.building import Building
+    from app.models.class_model import Class
+    from app.models.discipline import Discipline
+    from app.models.lesson import Lesson
+    from app.models.reservation import Reservation
+    from app.models.resource import Resource
+    from app.models.resource_type import ResourceType
+    from app.models.room import Room
+    from app.schemas.reservation import ReservationCreate
+    from app.services.reservation import ReservationService
+
+    # A file database, so every thread gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'stress.db'}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    slots = [(time(8, 0), time(10, 0)), (time(10, 0), time(12, 0)), (time(13, 0), time(15, 0)), (time(15, 0), time(17, 0))]
+    lessons_per_slot = 6
+    with SessionLocal() as db:
+        profile = Profile(name="Professor")
+        professor = User(email="prof@example.com", name="Prof", birth_date=date(1980, 1, 1), gender="Female", profile=profile)
+        building = Building(name="Building", building_number=1, street="Main St", number="1", neighborhood="Downtown", city="City", state="RS", postal_code="90000-000")
+        room = Room(room_number=101, capacity=30, floor="1", building=building)
+        discipline = Discipline(name="Discipline", credits=4, program="Program", bibliography="Book")
+        class_instance = Class(semester="2024/1", schedule="Mon 08:00-17:00", vacancies=30, discipline=discipline, professor=professor)
+        resource = Resource(description="Projector", status="available", resource_type=ResourceType(name="Projector"))
+        lessons = [
+            Lesson(date=date(2024, 3, 4), start_time=start, end_time=end, class_instance=class_instance, room=room, discipline=discipline)
+            for start, end in slots
+            for _ in range(lessons_per_slot)
+        ]
+        db.add_all([professor, room, class_instance, resource, *lessons])
+        db.commit()
+        resource_id = resource.id
+        lesson_ids = [lesson.id for lesson in lessons]
+
+    service = ReservationService()
+    barrier = threading.Barrier(len(lesson_ids))
+    outcomes = []
+
+    def reserve(lesson_id):
+        with SessionLocal() as db:
+            barrier.wait()
+            try:
+                service.make_reservation(db, ReservationCreate(lesson_id=lesson_id, resource_id=resource_id))
+                outcomes.append(201)
+            except HTTPException as e:
+                outcomes.append(e.status_code)
+
+    threads = [threading.Thread(target=reserve, args=(lesson_id,)) for lesson_id in lesson_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == [201] * len(slots) + [409] * (len(lesson_ids) - len(slots))
+    with SessionLocal() as db:
+        booked = sorted((r.start_time, r.end_time) for r in db.query(Reservation).all())
+        assert booked == slots
+        assert db.query(Resource).one().version == len(slots)
+    engine.dispose()
+
+def test_materialize_lessons_from_class_schedule(test_db, seed_reservations):
+    """Test that a class schedule is stored as weekly slots and expanded into lessons."""
+    from datetime import time
+    from app.models.class_model import Class
+    from app.models.class_schedule import parse_schedule
+    from app.models.lesson import Lesson
+    from app.schemas.lesson import LessonMaterialize
+    from app.services.class_service import ClassService
+
+    assert parse_schedule("Mon-Wed 10:00-12:00") == [(0, time(10), time(12)), (2, time(10), time(12))]
+    assert parse_schedule("seg 08:00-10:00; Thu 14:00-16:00") == [(0, time(8), time(10)), (3, time(14), time(16))]
+    for invalid in ["Mon", "Mon 12:00-10:00", "Funday 10:00-12:00"]:
+        with pytest.raises(ValueError):
+            parse_schedule(invalid)
+
+    seed_reservations(1)
+    class_instance = test_db.query(Class).one()
+    class_instance.schedule = "Mon-Fri 10:00-12:00"
+    test_db.commit()
+    assert sorted(slot.weekday for slot in class_instance.schedules) == [0, 4]
+
+    # 2024-03-01 is a Friday that already has the seeded 10:00 lesson
+    request = LessonMaterialize(start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), room_id=test_db.query(Lesson).one().room_id, holidays=[date(2024, 3, 29)])
+    result = ClassService().materialize_lessons(test_db, class_instance.id, request)
+    assert (result.created, result.skipped_holidays, result.skipped_existing) == (7, 1, 1)
+    lessons = test_db.query(Lesson).filter(Lesson.class_id == class_instance.id).order_by(Lesson.date).all()
+    assert [lesson.date.weekday() for lesson in lessons] == [4, 0, 4, 0, 4, 0, 4, 0]
+    assert all(lesson.start_time == time(10) for lesson in lessons)
+
+    result = ClassService().materialize_lessons(test_db, class_instance.id, request)
+    assert (result.created, result.skipped_existing) == (0, 8)
+
+def test_class_schedule_rejects_null_and_backfills_legacy_rows(test_db, seed_reservations):
+    """Test that a null schedule update is refused and classes without weekly slots derive them from the text."""
+    from pydantic import ValidationError
+    from app.models.class_model import Class
+    from app.models.class_schedule import ClassSchedule
+    from app.models.lesson import Lesson
+    from app.schemas.class_schema import ClassUpdate
+    from app.schemas.lesson import LessonMaterialize
+    from app.services.class_service import ClassService
+
+    with pytest.raises(ValidationError):
+        ClassUpdate.model_validate({"schedule": None})
+    assert "schedule" not in ClassUpdate.model_validate({"vacancies": 10}).model_dump(exclude_unset=True)
+
+    seed_reservations(1)
+    class_instance = test_db.query(Class).one()
+    class_instance.schedule = "Mon 10:00-12:00"
+    test_db.commit()
+    # Simulate a class created before class_schedules existed
+    test_db.query(ClassSchedule).delete()
+    test_db.commit()
+    test_db.expire_all()
+    assert class_instance.schedules == []
+
+    request = LessonMaterialize(start_date=date(2024, 3, 4), end_date=date(2024, 3, 11), room_id=test_db.query(Lesson).first().room_id)
+    result = ClassService().materialize_lessons(test_db, class_instance.id, request)
+    assert result.created == 2
+    assert [slot.weekday for slot in test_db.query(ClassSchedule).all()] == [0]
+
+def test_reference_data_is_served_from_cache_until_changed(test_db):
+    """Test that profile reads hit the cache and that mutations invalidate it."""
+    from app.cache import cache_stats
+    from app.schemas.profile import ProfileCreate
+    from app.services.profile import ProfileService
+
+    service = ProfileService()
+    admin = service.create_profile(test_db, ProfileCreate(name="Admin"))
+    before = cache_stats()["profiles"]
+
+    assert [profile.name for profile in service.get_all_profiles(test_db)] == ["Admin"]
+    assert service.get_profile_by_id(test_db, admin.id).name == "Admin"
+    # Rows changed behind the service's back are not seen until it invalidates
+    test_db.query(Profile).filter(Profile.id == admin.id).update({"name": "Root"})
+    test_db.commit()
+    assert service.get_profile_by_id(test_db, admin.id).name == "Admin"
+    assert [profile.name for profile in service.get_all_profiles(test_db)] == ["Admin"]
+
+    stats = cache_stats()["profiles"]
+    assert (stats["hits"] - before["hits"], stats["misses"] - before["misses"]) == (2, 2)
+
+    service.update_profile(test_db, admin.id, ProfileCreate(name="Administrator"))
+    assert service.get_profile_by_id(test_db, admin.id).name == "Administrator"
+    with pytest.raises(HTTPException):
+        service.get_profile_by_id(test_db, admin.id + 1)
+
+    # Writes that 404 leave the cached entries alone
+    with pytest.raises(HTTPException):
+        service.update_profile(test_db, admin.id + 1, ProfileCreate(name="Ghost"))
+    with pytest.raises(HTTPException):
+        service.delete_profile(test_db, admin.id + 1)
+    hits = cache_stats()["profiles"]["hits"]
+    assert service.get_profile_by_id(test_db, admin.id).name == "Administrator"
+    assert cache_stats()["profiles"]["hits"] == hits + 1
+
+def test_per_process_versions_expire_writes_they_did_not_see(fake_redis):
+    """Test that per-process version stores and caches cannot vouch for each other's writes beyond the local TTL."""
+    import time
+    from app.cache import TTLCache
+    from app.cache_backends import MemoryBackend, RedisBackend
+    from app.versions import VersionStore
+
+    now = [1000.0]
+    worker_a = VersionStore(MemoryBackend(), local_ttl=10, clock=lambda: now[0])
+    worker_b = VersionStore(MemoryBackend(), local_ttl=10, clock=lambda: now[0])
+    seen_by_b = worker_b.get_versions(["rooms"])
+
+    # A write handled by worker A never reaches worker B's counters...
+    worker_a.bump(["rooms"])
+    assert worker_b.get_versions(["rooms"]) == seen_by_b
+    # ...so B's versions, and every tag and cached response built on them, expire
+    now[0] += 10
+    assert worker_b.get_versions(["rooms"]) != seen_by_b
+
+    # A shared store sees the bump right away and never expires
+    shared_a = VersionStore(RedisBackend(fake_redis), local_ttl=10, clock=lambda: now[0])
+    shared_b = VersionStore(RedisBackend(fake_redis), local_ttl=10, clock=lambda: now[0])
+    before = shared_b.get_versions(["rooms"])
+    now[0] += 100
+    assert shared_b.get_versions(["rooms"]) == before
+    shared_a.bump(["rooms"])
+    assert shared_b.get_versions(["rooms"]) != before
+
+    # Private reference caches are bounded the same way: B serves its copy for local_ttl at most
+    cache_a = TTLCache("private_reference", ttl=300, backend=MemoryBackend(), local_ttl=0.05)
+    cache_b = TTLCache("private_reference", ttl=300, backend=MemoryBackend(), local_ttl=0.05)
+    cache_b.set(1, "old")
+    cache_a.invalidate()
+    assert cache_b.get(1) == "old"
+    time.sleep(0.06)
+    assert cache_b.get(1) is None
+    assert TTLCache("shared_reference", ttl=300, backend=RedisBackend(fake_redis), local_ttl=0.05).ttl == 300
+
+def test_shared_cache_backend_propagates_invalidation(fake_redis):
+    """Test that caches on separate Redis connections (separate workers) share entries and invalidations."""
+    from app.cache import TTLCache, _caches
+    from app.cache_backends import RedisBackend
+    from app.schemas.profile import ProfileResponse
+
+    worker_a = TTLCache("shared_a", ttl=60, backend=RedisBackend(fake_redis))
+    worker_b = TTLCache("shared_a", ttl=60, backend=RedisBackend(fake_redis))
+    loads = []
+
+    def load():
+        loads.append(1)
+        return ProfileResponse(id=1, name="Admin")
+
+    assert worker_a.get_or_load(1, load).name == "Admin"
+    assert worker_b.get_or_load(1, load).name == "Admin"
+    assert len(loads) == 1
+
+    worker_a.invalidate()
+    assert worker_b.get(1) is None
+    worker_b.get_or_load(1, load)
+    assert len(loads) == 2
+
+    # An unreachable store degrades to misses instead of failing requests
+    offline = TTLCache("offline", backend=RedisBackend("redis://127.0.0.1:1/0", timeout=0.1))
+    offline.set(1, "value")
+    assert offline.get(1) is None
+    assert offline.get_or_load(1, lambda: "loaded") == "loaded"
+    assert offline.backend.counters(["versions:epoch"]) is None
+
+    # Entries are JSON: pages of schemas round-trip, and a pickle planted in the store is never loaded
+    import pickle
+    from app import cache_backends
+    from app.repositories.pagination import Page
+
+    page = cache_backends.loads(cache_backends.dumps(Page([ProfileResponse(id=1, name="Admin")], next_cursor=1)))
+    assert isinstance(page, Page) and page.next_cursor == 1
+    assert page[0] == ProfileResponse(id=1, name="Admin")
+    backend = RedisBackend(fake_redis)
+    backend.execute("SET", "planted", pickle.dumps(ProfileResponse(id=1, name="Admin")))
+    assert backend.get("planted") is None
+    with pytest.raises(ValueError):
+        cache_backends.loads(b'{"model": "os:system", "data": {}}')
+
+    # Backends have to implement the whole interface to be instantiated
+    from app.cache_backends import CacheBackend
+
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+    for name in ("shared_a", "offline"):
+        _caches.pop(name)
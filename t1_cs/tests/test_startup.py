@@ -0,0 +1,111 @@
+import json
+import os
+import subprocess
+import sys
+from benchmarks.import_time import import_times
+
+# Cold-start budget for `import app.main` with lazy routers; generous enough for slow CI machines
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "2000"))
+
+
+def test_lazy_startup_stays_within_import_budget():
+    """Test that a lazy cold start imports no router stack or driver and stays within the budget."""
+    times = import_times("app.main", {"LAZY_ROUTERS": "true", "TESTING": "false"})
+
+    deferred = [
+        name for name in times
+        if name.startswith(("app.routers.", "app.services.", "app.repositories.", "app.schemas.", "app.models."))
+        or name in ("pymysql", "app.script")
+    ]
+    assert deferred == []
+    assert times["app.main"][1] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_openapi_artifact_lists_router_paths_under_lazy_routers(tmp_path):
+    """Test that build_openapi.py registers every router before building, as the Lambda image runs it lazily."""
+    artifact = tmp_path / "openapi.json"
+    subprocess.run(
+        [sys.executable, "-c", f"import build_openapi; build_openapi.build_openapi({str(artifact)!r})"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "LAZY_ROUTERS": "true", "TESTING": "true"},
+        check=True,
+        capture_output=True,
+    )
+    paths = json.loads(artifact.read_bytes())["paths"]
+    assert "/buildings/" in paths
+    assert "/rooms/available" in paths
+    assert "/reservations/{reservation_id}" in paths
+
+
+def test_lazy_routers_load_on_first_request():
+    """Test that the registry includes a router only when a request under its prefix arrives."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.lazy_routers import RouterRegistry, LazyRouterMiddleware
+
+    app = FastAPI()
+    registry = RouterRegistry(app)
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    client = TestClient(app)
+
+    assert client.get("/").status_code == 404
+    assert registry.loaded == {}
+
+    client.get("/buildings/does-not-parse")
+    assert list(registry.loaded) == ["building"]
+    assert any(getattr(route, "path", None) == "/buildings/" for route in app.routes)
+    assert registry.owner("/rooms/available") == "room"
+    assert registry.owner("/unknown") is None
+
+
+def test_lambda_handler_strips_stage_and_matches_templated_routes():
+    """Test that the handler serves stage-prefixed paths and its route index matches templated paths."""
+    import simple_lambda_handler
+    from simple_lambda_handler import lambda_handler, route_index
+
+    event = {
+        "resource": "/{proxy+}",
+        "path": "/Prod/health",
+        "httpMethod": "GET",
+        "headers": {"Host": "example.execute-api.us-east-1.amazonaws.com"},
+        "multiValueHeaders": {},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "requestContext": {"stage": "Prod", "resourcePath": "/{proxy+}", "httpMethod": "GET", "path": "/Prod/health"},
+        "body": None,
+        "isBase64Encoded": False,
+    }
+    response = lambda_handler(event, None)
+    assert response["statusCode"] == 200
+    assert response["body"] == '{"status":"healthy"}'
+
+    assert simple_lambda_handler.stage_layer.strip("/Prod") == "/"
+    assert simple_lambda_handler.stage_layer.strip("/Products") == "/Products"
+    assert route_index.matches("/rooms/42")
+    assert route_index.matches("/rooms/available")
+    assert not route_index.matches("/rooms/42/1/unknown")
+    assert not route_index.matches("/unknown")
+
+
+def test_replay_attributes_logged_requests_to_route_templates(tmp_path):
+    """Test that the replay harness reads request logs and groups requests by route template."""
+    from benchmarks.replay import RouteMatcher, read_log
+
+    log = tmp_path / "traffic.jsonl"
+    log.write_text(
+        '{"method": "get", "path": "/rooms/available", "query": {"date": "2024-03-04"}}\n'
+        '{"note": "not a request"}\n'
+        '\n'
+        '{"method": "GET", "path": "/rooms/42"}\n'
+    )
+    requests = read_log(log)
+    assert [request["path"] for request in requests] == ["/rooms/available", "/rooms/42"]
+    assert requests[0]["method"] == "GET"
+
+    matcher = RouteMatcher([
+        {"path": "/rooms/{room_id}", "methods": ["GET"]},
+        {"path": "/rooms/available", "methods": ["GET"]},
+    ])
+    assert matcher.match("GET", "/rooms/available") == "GET /rooms/available"
+    assert matcher.match("GET", "/rooms/42") == "GET /rooms/{room_id}"
+    assert matcher.match("DELETE", "/rooms/42") == "DELETE unmatched"